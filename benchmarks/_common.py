@@ -0,0 +1,40 @@
+"""
+Helper bersama untuk script benchmark CAT
+Import cat_api lewat cat_loader (item bank CSV dari repo, log performa ke devnull sebelum import)
+"""
+
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from cat_loader import load_cat_api, synthetic_bank  # noqa: E402,F401  (re-export untuk script benchmark)
+
+
+def time_call(func, *args, repeat=20, **kwargs):
+    """Rata-rata waktu satu panggilan dalam detik (dan hasil panggilan terakhir)"""
+    result = func(*args, **kwargs)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args, **kwargs)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def random_responses(item_bank, n, rng):
+    """n respons acak (format API) dari item bank, tanpa item berulang"""
+    indices = rng.choice(len(item_bank), size=min(n, len(item_bank)), replace=False)
+    return [
+        {
+            'id': item_bank.ids[idx],
+            'a': float(item_bank.a[idx]),
+            'b': float(item_bank.b[idx]),
+            'g': float(item_bank.g[idx]),
+            'u': float(item_bank.u[idx]),
+            'answer': int(rng.integers(0, 2)),
+        }
+        for idx in indices
+    ]
+
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark semua route cat_api lewat Flask test client, dengan baseline JSON dan regression gate
+
+Payload dibangun dari item bank (Parameter_Item_IST.csv): riwayat 1-30 respons acak, diputar dari
+pool riwayat berbeda supaya tidak semua request mengenai cache yang sama. Untuk tiap endpoint
+dilaporkan latency p50/p95/p99, requests/s dan alokasi (peak tracemalloc per request, diukur
+di pass terpisah supaya tidak mempengaruhi latency).
+
+--save-baseline menyimpan hasil ke JSON; --baseline membandingkan dengan file tersebut dan keluar
+dengan status 1 jika metrik --gate suatu endpoint lebih lambat dari --max-regression persen.
+
+Usage:
+    python benchmarks/bench_endpoints.py [--requests 300] [--save-baseline baseline.json]
+    python benchmarks/bench_endpoints.py --baseline baseline.json [--max-regression 20] [--gate p50 p95]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from _common import load_cat_api, random_responses
+
+cat_api = load_cat_api()
+
+HISTORY_POOL = 200  # Riwayat respons berbeda per endpoint
+
+
+class Endpoint:
+    """Satu skenario request: prepare() menyiapkan (method, url, body) di luar pengukuran, after() membaca respons"""
+
+    def __init__(self, name, method, url, body=None, after=None, expected_status=200):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.body = body
+        self.after = after
+        self.expected_status = expected_status
+
+    def prepare(self, k):
+        url = self.url(k) if callable(self.url) else self.url
+        body = self.body(k) if callable(self.body) else self.body
+        return self.method, url, body
+
+
+class SessionDriver:
+    """State sesi untuk route /api/session/*: sesi dibuat ulang setelah selesai"""
+
+    def __init__(self, client, rng):
+        self.client = client
+        self.rng = rng
+        self.session_id = None
+        self.item_id = None
+
+    def create(self):
+        payload = self.client.post('/api/session', json={}).get_json()
+        self.session_id, self.item_id = payload['session_id'], payload['item']['id']
+
+    def current(self):
+        if self.session_id is None:
+            self.create()
+        return self.session_id
+
+    def answer_body(self, k):
+        self.current()
+        return {'item_id': self.item_id, 'answer': int(self.rng.integers(0, 2))}
+
+    def after_answer(self, response):
+        payload = response.get_json()
+        if payload.get('test_completed'):
+            self.session_id = None
+        else:
+            self.item_id = payload['item']['id']
+
+    def answered_session(self, k):
+        """Sesi baru dengan beberapa jawaban, untuk diukur di /finish"""
+        self.create()
+        for _ in range(int(self.rng.integers(1, 6))):
+            payload = self.client.post(f'/api/session/{self.session_id}/response',
+                                       json=self.answer_body(k)).get_json()
+            if payload.get('test_completed'):
+                break
+            self.item_id = payload['item']['id']
+        session_id, self.session_id = self.session_id, None
+        return f'/api/session/{session_id}/finish'
+
+
+def build_endpoints(client, rng):
+    bank = cat_api.ITEM_BANK
+    histories = [random_responses(bank, 1 + k % 30, rng) for k in range(HISTORY_POOL)]
+
+    def history(k):
+        return histories[k % len(histories)]
+
+    def used(k):
+        return [resp['id'] for resp in history(k)]
+
+    thetas = rng.normal(0.0, 1.0, HISTORY_POOL)
+    batch = [{'id': f'S{k}', 'responses': history(k)} for k in range(100)]
+    sessions = SessionDriver(client, rng)
+    next_item_sessions = SessionDriver(client, rng)
+
+    return [
+        Endpoint('health', 'GET', '/health'),
+        Endpoint('metrics', 'GET', '/metrics'),
+        Endpoint('item-bank', 'GET', '/api/item-bank'),
+        Endpoint('estimate-theta', 'POST', '/api/estimate-theta',
+                 lambda k: {'responses': history(k), 'theta_old': float(thetas[k % HISTORY_POOL])}),
+        Endpoint('estimate-theta newton', 'POST', '/api/estimate-theta',
+                 lambda k: {'responses': history(k), 'theta_old': float(thetas[k % HISTORY_POOL]),
+                            'method': 'newton'}),
+        Endpoint('select-item', 'POST', '/api/select-item',
+                 lambda k: {'theta': float(thetas[k % HISTORY_POOL]), 'used_item_ids': used(k),
+                            'responses': history(k)}),
+        Endpoint('select-item EFI', 'POST', '/api/select-item',
+                 lambda k: {'theta': float(thetas[k % HISTORY_POOL]), 'used_item_ids': used(k),
+                            'responses': history(k), 'criterion': 'EFI'}),
+        Endpoint('expected-information', 'POST', '/api/expected-information',
+                 lambda k: {'responses': history(k), 'used_item_ids': used(k), 'top': 20}),
+        Endpoint('calculate-score', 'POST', '/api/calculate-score',
+                 lambda k: {'theta': float(thetas[k % HISTORY_POOL])}),
+        Endpoint('stopping-criteria', 'POST', '/api/stopping-criteria',
+                 lambda k: {'responses': history(k), 'se_eap': 0.3, 'used_item_ids': used(k)}),
+        Endpoint('debug-stopping', 'POST', '/api/debug-stopping',
+                 lambda k: {'responses': history(k), 'se_eap': 0.3, 'used_item_ids': used(k)}),
+        Endpoint('final-score', 'POST', '/api/final-score', lambda k: {'responses': history(k)}),
+        Endpoint('final-score batch x100', 'POST', '/api/final-score/batch', {'examinees': batch}),
+        Endpoint('test-calculation', 'POST', '/api/test-calculation', {}),
+        Endpoint('step', 'POST', '/api/step',
+                 lambda k: {'responses': history(k), 'used_item_ids': used(k),
+                            'theta_old': float(thetas[k % HISTORY_POOL])}),
+        Endpoint('session create', 'POST', '/api/session', {}),
+        Endpoint('session response', 'POST', lambda k: f'/api/session/{sessions.current()}/response',
+                 sessions.answer_body, after=sessions.after_answer),
+        Endpoint('session next-item', 'GET', lambda k: f'/api/session/{next_item_sessions.current()}/next-item'),
+        Endpoint('session finish', 'POST', sessions.answered_session, {}),
+    ]
+
+
+def run(client, endpoint, n_requests, warmup):
+    """Latency per request (detik) dan jumlah status tidak sesuai"""
+    latencies = np.empty(n_requests)
+    errors = 0
+    for k in range(-warmup, n_requests):
+        method, url, body = endpoint.prepare(k + warmup)
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        elapsed = time.perf_counter() - start
+        if response.status_code != endpoint.expected_status:
+            errors += 1
+        elif endpoint.after is not None:
+            endpoint.after(response)
+        if k >= 0:
+            latencies[k] = elapsed
+    return latencies, errors
+
+
+def allocations(client, endpoint, n_requests):
+    """Rata-rata peak memori Python (KB) yang dialokasikan selama satu request"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for k in range(n_requests):
+            method, url, body = endpoint.prepare(k)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            response = client.open(url, method=method, json=body)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            if endpoint.after is not None and response.status_code == endpoint.expected_status:
+                endpoint.after(response)
+    finally:
+        tracemalloc.stop()
+    return float(np.mean(peaks)) / 1024
+
+
+def compare(results, baseline, gates, max_regression):
+    """Daftar regresi (endpoint, metrik, baseline, sekarang, persen) yang melewati batas"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline['endpoints'].get(name)
+        if reference is None:
+            continue
+        for metric in gates:
+            before, after = reference[f'{metric}_ms'], result[f'{metric}_ms']
+            change = (after - before) / before * 100 if before > 0 else 0.0
+            if change > max_regression:
+                regressions.append((name, metric, before, after, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300, help='request terukur per endpoint')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--alloc-requests', type=int, default=20, help='request per endpoint untuk pass tracemalloc')
+    parser.add_argument('--only', nargs='*', help='hanya endpoint dengan nama ini')
+    parser.add_argument('--seed', type=int, default=21)
+    parser.add_argument('--save-baseline', help='simpan hasil ke file JSON')
+    parser.add_argument('--baseline', help='bandingkan dengan baseline JSON, status 1 jika ada regresi')
+    parser.add_argument('--max-regression', type=float, default=20.0, help='batas perlambatan (persen)')
+    parser.add_argument('--gate', nargs='+', choices=['p50', 'p95', 'p99'], default=['p50', 'p95'])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    client = cat_api.app.test_client()
+    endpoints = build_endpoints(client, rng)
+    if args.only:
+        endpoints = [endpoint for endpoint in endpoints if endpoint.name in args.only]
+
+    print(f"Item bank: {len(cat_api.ITEM_BANK)} items, {args.requests} requests per endpoint")
+    print(f"{'endpoint':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'alloc KB':>9} {'errors':>7}")
+    results = {}
+    for endpoint in endpoints:
+        latencies, errors = run(client, endpoint, args.requests, args.warmup)
+        alloc_kb = allocations(client, endpoint, args.alloc_requests) if args.alloc_requests > 0 else None
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1e3
+        results[endpoint.name] = {
+            'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99,
+            'requests_per_s': len(latencies) / latencies.sum(),
+            'alloc_peak_kb': alloc_kb,
+            'errors': errors
+        }
+        alloc = f"{alloc_kb:>9.1f}" if alloc_kb is not None else f"{'-':>9}"
+        print(f"{endpoint.name:<24} {p50:>8.3f} {p95:>8.3f} {p99:>8.3f} "
+              f"{results[endpoint.name]['requests_per_s']:>8.0f} {alloc} {errors:>7}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as stream:
+            json.dump({
+                'meta': {
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python': platform.python_version(),
+                    'numpy': np.__version__,
+                    'platform': platform.platform(),
+                    'items': len(cat_api.ITEM_BANK),
+                    'requests': args.requests
+                },
+                'endpoints': results
+            }, stream, indent=2)
+        print(f"\nBaseline disimpan ke {args.save_baseline}")
+
+    status = 1 if any(result['errors'] for result in results.values()) else 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as stream:
+            baseline = json.load(stream)
+        regressions = compare(results, baseline, args.gate, args.max_regression)
+        print(f"\nBaseline {args.baseline} ({baseline['meta']['timestamp']}), batas {args.max_regression:g}% "
+              f"untuk {', '.join(args.gate)}")
+        for name, metric, before, after, change in regressions:
+            print(f"  REGRESI {name:<24} {metric}: {before:.3f}ms -> {after:.3f}ms (+{change:.1f}%)")
+        if regressions:
+            status = 1
+        else:
+            print("  Tidak ada regresi")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark final scoring EAP batch (estimate_theta_eap_batch) vs estimate_theta_eap per peserta
+
+Respons acak dengan panjang 1-30 per peserta. Laporan berisi waktu total kedua cara dan selisih
+maksimum theta/SE. Prefix cache dikosongkan sebelum loop supaya yang diukur kernel posterior.
+
+Usage:
+    python benchmarks/bench_final_score_batch.py [--examinees 100 1000 5000] [--chunk-rows 4096]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from _common import load_cat_api, random_responses
+
+cat_api = load_cat_api()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--examinees', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--chunk-rows', type=int, default=cat_api.BATCH_CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bank = cat_api.ITEM_BANK
+
+    print(f"Item bank: {len(bank)} items, quadrature: {cat_api.QUADRATURE}, chunk rows: {args.chunk_rows}")
+    print(f"{'examinees':>9} {'loop s':>8} {'batch s':>8} {'speedup':>8} {'max |dEAP|':>11} {'max |dSE|':>10}")
+    for n in args.examinees:
+        examinees = [random_responses(bank, int(rng.integers(1, 31)), rng) for _ in range(n)]
+
+        cat_api.PREFIX_CACHE.clear()
+        start = time.perf_counter()
+        single = np.array([cat_api.estimate_theta_eap(responses) for responses in examinees])
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indices, answers, params = cat_api.response_matrix([resp for responses in examinees for resp in responses])
+        theta, se = cat_api.estimate_theta_eap_batch(indices, answers, params, [len(r) for r in examinees],
+                                                     chunk_rows=args.chunk_rows)
+        batch_time = time.perf_counter() - start
+
+        print(f"{n:>9} {loop_time:>8.3f} {batch_time:>8.3f} {loop_time / batch_time:>7.1f}x "
+              f"{np.abs(theta - single[:, 0]).max():>11.2e} {np.abs(se - single[:, 1]).max():>10.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark fungsi IRT per panggilan: waktu dan memori vs jumlah respons, ukuran grid dan ukuran bank
+
+Sweep:
+  - probability_3pl, information_3pl, likelihood_3pl (skalar) dan probability_3pl/information_3pl_array
+    pada seluruh grid, vs jumlah respons dan ukuran grid
+  - estimate_theta_map, estimate_theta_eap, expected_fisher_information vs jumlah respons dan ukuran grid
+    (quadrature uniform n titik, bank CSV; prefix cache dikosongkan tiap panggilan supaya yang diukur kernel)
+  - select_next_item_mi dan check_stopping_criteria vs ukuran bank sintetis dan jumlah item terpakai
+
+Waktu = rata-rata per panggilan (diulang sampai --min-time detik), memori = peak tracemalloc satu
+panggilan (alokasi Python dan NumPy). --csv menyimpan semua baris untuk dibuat grafik.
+
+Usage:
+    python benchmarks/bench_kernels.py [--responses 1 5 10 30 100] [--grids 61 201 1001 2001]
+                                       [--banks 160 1000 10000 100000] [--csv kernels.csv]
+"""
+
+import argparse
+import csv
+import time
+import tracemalloc
+
+import numpy as np
+
+from _common import load_cat_api, random_responses, synthetic_bank
+
+cat_api = load_cat_api()
+
+FIELDS = ['kernel', 'items', 'grid', 'responses', 'us_per_call', 'peak_kb']
+
+
+def measure(func, min_time):
+    """(mikrodetik per panggilan, peak KB satu panggilan)"""
+    func()  # warm-up (tabel grid, index, cache quadrature)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        func()
+        peak_kb = (tracemalloc.get_traced_memory()[1] - base) / 1024
+    finally:
+        tracemalloc.stop()
+
+    calls, start = 0, time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls * 1e6, peak_kb
+
+
+class Report:
+    def __init__(self, min_time):
+        self.min_time = min_time
+        self.rows = []
+
+    def header(self, title):
+        print(f"\n{title}")
+        print(f"{'kernel':<30} {'items':>7} {'grid':>6} {'resp':>5} {'us/call':>10} {'peak KB':>9}")
+
+    def add(self, kernel, func, items='', grid='', responses=''):
+        us, peak_kb = measure(func, self.min_time)
+        self.rows.append(dict(zip(FIELDS, [kernel, items, grid, responses, us, peak_kb])))
+        print(f"{kernel:<30} {items:>7} {grid:>6} {responses:>5} {us:>10.2f} {peak_kb:>9.1f}")
+
+
+def uncached(func):
+    """Panggil func dengan prefix cache kosong"""
+    def call():
+        cat_api.PREFIX_CACHE.clear()
+        return func()
+    return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--responses', type=int, nargs='+', default=[1, 5, 10, 30, 100])
+    parser.add_argument('--grids', type=int, nargs='+', default=[61, 201, 1001, 2001])
+    parser.add_argument('--banks', type=int, nargs='+', default=[160, 1000, 10000, 100000])
+    parser.add_argument('--min-time', type=float, default=0.1, help='detik pengukuran per baris')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--csv', help='simpan semua baris ke CSV')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bank = cat_api.ITEM_BANK
+    item = bank.item(0)
+    report = Report(args.min_time)
+    print(f"Item bank CSV: {len(bank)} items, grid referensi {len(cat_api.THETA_GRID)} titik")
+
+    report.header("Fungsi 3PL dasar")
+    report.add('probability_3pl', lambda: cat_api.probability_3pl(0.5, item['a'], item['b'], item['g'], item['u']))
+    report.add('information_3pl', lambda: cat_api.information_3pl(0.5, item['a'], item['b'], item['g'], item['u']))
+    for n_nodes in args.grids:
+        grid = np.linspace(-6, 6, n_nodes)
+        report.add('probability_3pl (grid)',
+                   lambda: cat_api.probability_3pl(grid, item['a'], item['b'], item['g'], item['u']), grid=n_nodes)
+        report.add('information_3pl_array (grid)',
+                   lambda: cat_api.information_3pl_array(grid, item['a'], item['b'], item['g'], item['u']),
+                   grid=n_nodes)
+    for n in args.responses:
+        responses = random_responses(bank, n, rng)
+        report.add('likelihood_3pl', lambda: cat_api.likelihood_3pl(0.5, responses), responses=len(responses))
+
+    report.header("Estimasi dan EFI (bank CSV)")
+    for n_nodes in args.grids:
+        quadrature = cat_api.prior_quadrature('uniform', n_nodes)
+        for n in args.responses:
+            responses = random_responses(bank, n, rng)
+            n = len(responses)
+            report.add('estimate_theta_map', uncached(
+                lambda: cat_api.estimate_theta_map(responses, quadrature=quadrature)), len(bank), n_nodes, n)
+            report.add('estimate_theta_eap', uncached(
+                lambda: cat_api.estimate_theta_eap(responses, quadrature=quadrature)), len(bank), n_nodes, n)
+            report.add('expected_fisher_information', uncached(
+                lambda: cat_api.expected_fisher_information(item['a'], item['b'], item['g'], item['u'], responses,
+                                                            quadrature=quadrature)), len(bank), n_nodes, n)
+
+    report.header("Pemilihan item dan stopping (bank sintetis)")
+    for n_items in args.banks:
+        synthetic = bank if n_items == len(bank) else synthetic_bank(cat_api, n_items, rng)
+        for n in args.responses:
+            responses = random_responses(synthetic, n, rng)
+            used = [resp['id'] for resp in responses]
+            theta = float(rng.normal())
+            report.add('select_next_item_mi',
+                       lambda: cat_api.select_next_item_mi(theta, used, synthetic), len(synthetic), '', len(used))
+            report.add('check_stopping_criteria',
+                       lambda: cat_api.check_stopping_criteria(responses, 0.3, used, item_bank=synthetic),
+                       len(synthetic), '', len(used))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as stream:
+            writer = csv.DictWriter(stream, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(report.rows)
+        print(f"\n{len(report.rows)} baris disimpan ke {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark kernel log-posterior (MAP grid, MAP Newton, EAP, EFI) vs implementasi lama
+
+Implementasi lama menghitung probability_3pl per titik grid dalam list comprehension
+dan mengalikan likelihood mentah; implementasi sekarang memakai tabel precompute
+dan log-sum-exp. Script ini melaporkan waktu per panggilan, speedup, dan selisih hasil.
+
+Usage:
+    python benchmarks/bench_likelihood.py [--lengths 1 5 10 20 30 60] [--repeat 20]
+"""
+
+import argparse
+
+import numpy as np
+
+from _common import load_cat_api, time_call, random_responses
+
+cat_api = load_cat_api()
+
+
+# Implementasi lama (sebelum kernel log-space), tanpa logging performa
+def legacy_posterior(responses, theta_range):
+    weights = np.exp(-0.5 * (theta_range / 2)**2)
+    weights = weights / np.sum(weights)
+    likelihood = np.ones_like(theta_range)
+    for resp in responses:
+        a, b, g = resp['a'], resp['b'], resp['g']
+        u = resp.get('u', 1.0)
+        p = np.array([cat_api.probability_3pl(theta_val, a, b, g, u) for theta_val in theta_range])
+        p = np.clip(p, 1e-10, 1 - 1e-10)
+        if resp['answer'] == 1:
+            likelihood *= p
+        else:
+            likelihood *= (1 - p)
+    posterior = likelihood * weights
+    posterior_sum = np.sum(posterior)
+    return posterior / posterior_sum if posterior_sum > 0 else weights
+
+
+def legacy_map(responses):
+    theta_range = np.linspace(-6, 6, 1001)
+    posterior = legacy_posterior(responses, theta_range)
+    return theta_range[np.argmax(posterior)]
+
+
+def legacy_eap(responses):
+    theta_range = np.linspace(-6, 6, 1001)
+    posterior = legacy_posterior(responses, theta_range)
+    return np.sum(theta_range * posterior)
+
+
+def legacy_efi(item, responses):
+    theta_grid = np.linspace(-6, 6, 1001)
+    posterior = legacy_posterior(responses, theta_grid)
+    efi = 0
+    for theta_val, weight in zip(theta_grid, posterior):
+        efi += cat_api.information_3pl(theta_val, item['a'], item['b'], item['g'], item['u']) * weight
+    return efi
+
+
+def current_map(responses):
+    # Prefix cache dikosongkan agar yang diukur kernel, bukan cache hit dari repeat sebelumnya
+    cat_api.PREFIX_CACHE.clear()
+    return cat_api.estimate_theta_map(responses)[0]
+
+
+def current_map_uncapped(responses):
+    # Argmax posterior tanpa max_allowed_change, untuk dibandingkan dengan legacy_map
+    indices, answers, params = cat_api.response_matrix(responses)
+    return cat_api.THETA_GRID[np.argmax(cat_api.posterior_grid(indices, answers, params))]
+
+
+def current_map_newton(responses):
+    return cat_api.estimate_theta_map(responses, method='newton')[0]
+
+
+def current_map_newton_uncapped(responses):
+    # Mode posterior Newton tanpa max_allowed_change
+    _, answers, params = cat_api.response_matrix(responses)
+    return cat_api.map_newton(answers, params)[0]
+
+
+def current_eap(responses):
+    cat_api.PREFIX_CACHE.clear()
+    return cat_api.estimate_theta_eap(responses)[0]
+
+
+def current_efi(item, responses):
+    cat_api.PREFIX_CACHE.clear()
+    return cat_api.expected_fisher_information(item['a'], item['b'], item['g'], item['u'], responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1, 5, 10, 20, 30, 60])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bank = cat_api.ITEM_BANK
+    item = bank.item(0)
+
+    print(f"Item bank: {len(bank)} items, grid: {len(cat_api.THETA_GRID)} points")
+    print(f"{'n':>4}  {'kernel':<6} {'legacy ms':>10} {'current ms':>11} {'speedup':>8} {'max |diff|':>11}")
+    for n in args.lengths:
+        responses = random_responses(bank, n, rng)
+        cases = [
+            ('MAP', lambda: legacy_map(responses), lambda: current_map(responses),
+             lambda: current_map_uncapped(responses)),
+            ('MAP-N', lambda: legacy_map(responses), lambda: current_map_newton(responses),
+             lambda: current_map_newton_uncapped(responses)),
+            ('EAP', lambda: legacy_eap(responses), lambda: current_eap(responses), None),
+            ('EFI', lambda: legacy_efi(item, responses), lambda: current_efi(item, responses), None),
+        ]
+        for name, legacy, current, compare in cases:
+            legacy_time, legacy_value = time_call(legacy, repeat=max(1, args.repeat // 10))
+            current_time, current_value = time_call(current, repeat=args.repeat)
+            if compare is not None:
+                current_value = compare()
+            diff = abs(float(legacy_value) - float(current_value))
+            print(f"{n:>4}  {name:<6} {legacy_time * 1e3:>10.3f} {current_time * 1e3:>11.3f} "
+                  f"{legacy_time / current_time:>7.1f}x {diff:>11.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Laporan akurasi dan waktu quadrature EAP/EFI vs grid referensi uniform 1001 titik
+
+Respons disimulasikan dari model 3PL untuk theta acak ~ N(0, 1) (item dipilih acak dari bank),
+lalu EAP, SE dan EFI item acak dihitung dengan tiap konfigurasi quadrature. Laporan berisi
+selisih maksimum terhadap referensi dan waktu EAP + EFI per respons set.
+
+Usage:
+    python benchmarks/bench_quadrature.py [--lengths 1 5 10 20 30] [--trials 200]
+"""
+
+import argparse
+
+import numpy as np
+
+from _common import load_cat_api, time_call
+
+cat_api = load_cat_api()
+
+CONFIGS = [
+    ('uniform', 1001),
+    ('uniform', 201),
+    ('uniform', 81),
+    ('gauss-hermite', 41),
+    ('gauss-hermite', 61),
+    ('gauss-hermite', 81),
+    ('adaptive', 21),
+    ('adaptive', 41),
+    ('adaptive', 61),
+    ('adaptive', 81),
+]
+
+
+def simulated_responses(bank, n, theta, rng):
+    """n respons 3PL untuk theta dari item acak tanpa pengulangan"""
+    indices = rng.choice(len(bank), size=min(n, len(bank)), replace=False)
+    p = cat_api.probability_3pl(theta, bank.a[indices], bank.b[indices], bank.g[indices], bank.u[indices])
+    answers = rng.random(len(indices)) < p
+    return [dict(bank.item(int(idx)), answer=int(answer)) for idx, answer in zip(indices, answers)]
+
+
+def eap_and_efi(responses, item, method, n_nodes):
+    indices, answers, params = cat_api.response_matrix(responses)
+    quad = cat_api.quadrature_for(answers, params, method, n_nodes)
+    posterior = quad.posterior(indices, answers, params)
+    theta, se = quad.eap(posterior)
+    efi = float(quad.information_row(item['a'], item['b'], item['g'], item['u']) @ posterior)
+    return theta, se, efi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1, 5, 10, 20, 30])
+    parser.add_argument('--trials', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bank = cat_api.ITEM_BANK
+
+    print(f"Item bank: {len(bank)} items, referensi: uniform {len(cat_api.THETA_GRID)} titik")
+    print(f"{'n':>4}  {'quadrature':<14} {'nodes':>5} {'max |dEAP|':>11} {'max |dSE|':>10} "
+          f"{'max rel dEFI':>13} {'EAP+EFI ms':>10}")
+    for n in args.lengths:
+        cases = []
+        for _ in range(args.trials):
+            responses = simulated_responses(bank, n, rng.normal(0.0, 1.0), rng)
+            cases.append((responses, bank.item(int(rng.integers(len(bank))))))
+        reference = [eap_and_efi(responses, item, 'uniform', len(cat_api.THETA_GRID)) for responses, item in cases]
+
+        for method, n_nodes in CONFIGS:
+            values = np.array([eap_and_efi(responses, item, method, n_nodes) for responses, item in cases])
+            diff = np.abs(values - np.array(reference))
+            rel_efi = diff[:, 2] / np.maximum(np.array(reference)[:, 2], 1e-12)
+            elapsed, _ = time_call(eap_and_efi, *cases[0], method, n_nodes, repeat=args.repeat)
+            print(f"{n:>4}  {method:<14} {n_nodes:>5} {diff[:, 0].max():>11.2e} {diff[:, 1].max():>10.2e} "
+                  f"{rel_efi.max():>13.2e} {elapsed * 1e3:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
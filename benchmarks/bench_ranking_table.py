@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Laporan akurasi dan waktu mode pemilihan 'ranked' (tabel ranking per bin theta) vs MI exact
+
+Untuk tiap bank (bank CSV dan bank sintetis) dan tiap nilai top-k, laporkan persentase item
+yang sama dengan MI exact, rasio information item terpilih terhadap item optimal, serta
+waktu lookup dibanding pemilihan exact.
+
+Usage:
+    python benchmarks/bench_ranking_table.py [--sizes 10000 100000] [--top-k 0 1 5 20] [--budget-mb 64]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from _common import load_cat_api, synthetic_bank
+
+cat_api = load_cat_api()
+
+
+def exact_argmax(theta, available_mask, bank):
+    if len(bank) >= cat_api.SELECTION_INDEX_MIN_ITEMS:
+        return bank.selection_index().argmax_information(theta, available_mask)
+    info = cat_api.information_3pl_array(theta, bank.a, bank.b, bank.g, bank.u)
+    info = np.where(available_mask, info, -np.inf)
+    best_idx = int(np.argmax(info))
+    return best_idx, info[best_idx]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10000, 100000])
+    parser.add_argument('--top-k', type=int, nargs='+', default=[0, 1, 5, 20])
+    parser.add_argument('--budget-mb', type=float, default=cat_api.RANKING_MEMORY_BUDGET_MB)
+    parser.add_argument('--trials', type=int, default=500)
+    parser.add_argument('--used', type=int, default=30, help='jumlah item terpakai maksimal per trial')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    banks = [cat_api.ITEM_BANK] + [synthetic_bank(cat_api, n, rng) for n in args.sizes]
+
+    print(f"bin width: {cat_api.RANKING_BIN_WIDTH}, memory budget: {args.budget_mb}MB")
+    print(f"{'items':>8} {'depth':>7} {'MB':>6} {'build s':>8} {'top-k':>6} {'same':>7} "
+          f"{'min ratio':>10} {'mean ratio':>11} {'exact us':>9} {'ranked us':>10}")
+    for bank in banks:
+        n = len(bank)
+        start = time.perf_counter()
+        table = cat_api.ItemRankingTable(bank.a, bank.b, bank.g, bank.u, memory_budget_mb=args.budget_mb)
+        build_time = time.perf_counter() - start
+
+        thetas = rng.uniform(-4, 4, args.trials)
+        masks = []
+        for _ in range(args.trials):
+            mask = np.ones(n, dtype=bool)
+            mask[rng.choice(n, size=rng.integers(0, min(args.used, n - 1) + 1), replace=False)] = False
+            masks.append(mask)
+
+        start = time.perf_counter()
+        expected = [exact_argmax(theta, mask, bank) for theta, mask in zip(thetas, masks)]
+        exact_time = (time.perf_counter() - start) / args.trials
+
+        for top_k in args.top_k:
+            start = time.perf_counter()
+            actual = [table.lookup(theta, mask, top_k=top_k) for theta, mask in zip(thetas, masks)]
+            ranked_time = (time.perf_counter() - start) / args.trials
+
+            same = sum(e[0] == r[0] for e, r in zip(expected, actual)) / args.trials
+            # Ranking habis (-1) dihitung rasio 1 karena pemanggil kembali ke MI exact
+            ratios = np.array([r[1] / e[1] if r[0] >= 0 and e[1] > 0 else 1.0 for e, r in zip(expected, actual)])
+            print(f"{n:>8} {table.depth:>7} {table.nbytes / 1024 / 1024:>6.1f} {build_time:>8.2f} {top_k:>6} "
+                  f"{same:>7.1%} {ratios.min():>10.6f} {ratios.mean():>11.6f} "
+                  f"{exact_time * 1e6:>9.1f} {ranked_time * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark pemilihan item MI: scan penuh vs index branch-and-bound per bucket b
+
+Untuk tiap ukuran bank sintetis, bandingkan item yang dipilih (harus identik) dan waktu
+per pemilihan pada theta dan himpunan item terpakai acak.
+
+Usage:
+    python benchmarks/bench_selection_index.py [--sizes 1000 10000 100000 1000000] [--trials 50]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from _common import load_cat_api, synthetic_bank
+
+cat_api = load_cat_api()
+
+
+def exhaustive_argmax(theta, available_mask, bank):
+    info = cat_api.information_3pl_array(theta, bank.a, bank.b, bank.g, bank.u)
+    info = np.where(available_mask, info, -np.inf)
+    best_idx = int(np.argmax(info))
+    return best_idx, info[best_idx]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--trials', type=int, default=50)
+    parser.add_argument('--used', type=int, default=30, help='jumlah item terpakai maksimal per trial')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"bucket size: {cat_api.SELECTION_INDEX_BUCKET_SIZE}")
+    print(f"{'items':>9} {'buckets':>8} {'build ms':>9} {'scan ms':>9} {'index ms':>9} {'speedup':>8} {'identical':>10}")
+    for n in args.sizes:
+        bank = synthetic_bank(cat_api, n, rng)
+
+        start = time.perf_counter()
+        index = bank.selection_index()
+        build_time = time.perf_counter() - start
+
+        thetas = rng.uniform(-3, 3, args.trials)
+        masks = []
+        for _ in range(args.trials):
+            mask = np.ones(n, dtype=bool)
+            mask[rng.choice(n, size=rng.integers(0, args.used + 1), replace=False)] = False
+            masks.append(mask)
+
+        start = time.perf_counter()
+        expected = [exhaustive_argmax(theta, mask, bank) for theta, mask in zip(thetas, masks)]
+        scan_time = (time.perf_counter() - start) / args.trials
+
+        start = time.perf_counter()
+        actual = [index.argmax_information(theta, mask) for theta, mask in zip(thetas, masks)]
+        index_time = (time.perf_counter() - start) / args.trials
+
+        identical = sum(e[0] == a[0] for e, a in zip(expected, actual))
+        print(f"{n:>9} {len(index):>8} {build_time * 1e3:>9.1f} {scan_time * 1e3:>9.3f} {index_time * 1e3:>9.3f} "
+              f"{scan_time / index_time:>7.1f}x {identical:>5}/{args.trials}")
+
+
+if __name__ == '__main__':
+    main()
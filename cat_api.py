@@ -4,16 +4,26 @@ Flask API Server for CAT System
 IRT 3PL Calculations dengan EAP theta estimation dan EFI item selection
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, json as flask_json
 from flask_cors import CORS
 import numpy as np
 import math
 import logging
 import os
 import psutil
+import queue
+import threading
+import time
+import atexit
+import bisect
+import contextvars
+import functools
+import uuid
 from datetime import datetime
 import json
-from scipy.stats import norm
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -37,36 +47,161 @@ def get_memory_usage():
         return "0.0"
 
 def get_cpu_load():
-    """Mendapatkan CPU load average"""
+    """Mendapatkan CPU load average (non-blocking, sejak sampling sebelumnya)"""
     try:
-        # Untuk sistem yang mendukung psutil
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        # interval=None tidak sleep; nilai dihitung relatif terhadap pemanggilan sebelumnya
+        cpu_percent = psutil.cpu_percent(interval=None)
         return f"{cpu_percent/100:.2f}"
     except:
         # Fallback sederhana
-        import time
         import random
         # Estimasi berdasarkan waktu dan random untuk simulasi
         base_load = 0.5 + (random.randint(-20, 20) / 100)
         return f"{max(0.1, min(2.0, base_load)):.2f}"
 
+# Performance log configuration
+PERF_LOG_FILE = os.environ.get('CAT_PERF_LOG_FILE', 'cat_api.log')
+PERF_QUEUE_MAXSIZE = 10000      # Event maksimal yang menunggu ditulis
+PERF_BATCH_SIZE = 500           # Event maksimal per sekali tulis ke file
+PERF_FLUSH_INTERVAL = 0.5       # Detik, jeda maksimal sebelum batch ditulis
+PERF_SAMPLE_INTERVAL = 1.0      # Detik, cadence sampling CPU/RSS
+
+class PerformanceLogger:
+    """Background performance logger: hot path hanya enqueue event, thread terpisah yang sampling dan menulis log"""
+
+    def __init__(self, log_file=PERF_LOG_FILE, maxsize=PERF_QUEUE_MAXSIZE, batch_size=PERF_BATCH_SIZE,
+                 flush_interval=PERF_FLUSH_INTERVAL, sample_interval=PERF_SAMPLE_INTERVAL):
+        self.log_file = log_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_interval = sample_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        # Counters: dropped diubah di hot path (jarang), sisanya hanya oleh writer thread
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        self._reported_dropped = 0
+        self._memory_usage = "0.0"
+        self._cpu_load = "0.00"
+        self._last_sample = 0.0
+
+    def log(self, process_name):
+        """Enqueue event tanpa blocking; event di-drop jika queue penuh"""
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((time.time(), process_name))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def start(self):
+        """Start writer thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='cat-perf-logger', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stop writer thread dan flush event yang tersisa"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout)
+
+    def stats(self):
+        """Counter untuk monitoring subsystem logging"""
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'write_errors': self.write_errors,
+            'queue_maxsize': self._queue.maxsize
+        }
+
+    def _sample(self, now):
+        """Sampling CPU/RSS pada cadence sendiri, bukan per event"""
+        if now - self._last_sample >= self.sample_interval:
+            self._memory_usage = get_memory_usage()
+            self._cpu_load = get_cpu_load()
+            self._last_sample = now
+
+    def _drain(self):
+        """Ambil satu batch event; menunggu paling lama flush_interval"""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval))
+        except queue.Empty:
+            return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """Tulis satu batch ke file log dengan sekali open/append"""
+        self._sample(time.time())
+        lines = []
+        for event_time, process_name in batch:
+            timestamp = datetime.fromtimestamp(event_time).strftime('%Y-%m-%d %H:%M:%S')
+            lines.append(f"[{timestamp}] process: {process_name} | memory: {self._memory_usage}MB | cpu_load: {self._cpu_load}")
+        try:
+            with open(self.log_file, 'a', encoding='utf-8', buffering=65536) as f:
+                f.write('\n'.join(lines) + '\n')
+            self.written += len(lines)
+            self.batches += 1
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"Error logging performance: {str(e)}")
+            return
+
+        # Log ke console juga
+        for line in lines:
+            logger.info(f"PERFORMANCE: {line}")
+
+        dropped = self.dropped
+        if dropped > self._reported_dropped:
+            logger.warning(f"PERFORMANCE: {dropped - self._reported_dropped} log events dropped (queue full)")
+            self._reported_dropped = dropped
+
+    def _run(self):
+        """Loop writer thread"""
+        while not self._stop_event.is_set():
+            batch = self._drain()
+            if batch:
+                self._write(batch)
+
+        # Flush sisa event sebelum berhenti
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                break
+            self._write(batch)
+
+PERFORMANCE_LOGGER = PerformanceLogger()
+atexit.register(PERFORMANCE_LOGGER.stop)
+
 def log_process_performance(process_name):
-    """Log proses dengan monitoring memory dan CPU usage"""
+    """Log proses dengan monitoring memory dan CPU usage (async via PERFORMANCE_LOGGER)"""
     try:
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        memory_usage = get_memory_usage()
-        cpu_load = get_cpu_load()
-        
-        log_message = f"[{timestamp}] process: {process_name} | memory: {memory_usage}MB | cpu_load: {cpu_load}"
-        
-        # Log ke file cat.log
-        log_file = 'cat_api.log'
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(log_message + '\n')
-        
-        # Log ke console juga
-        logger.info(f"PERFORMANCE: {log_message}")
-        
+        PERFORMANCE_LOGGER.log(process_name)
     except Exception as e:
         logger.error(f"Error logging performance: {str(e)}")
 
@@ -110,6 +245,213 @@ def log_final_scoring():
     """Log proses final scoring"""
     log_process_performance('final_scoring')
 
+# Metrics in-process (format teks Prometheus di /metrics)
+METRICS_ENABLED = os.environ.get('CAT_METRICS', '1') == '1'
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+def format_labels(label_names, labels, extra=()):
+    pairs = list(zip(label_names, labels)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class MetricCounter:
+    """Counter per kombinasi label; increment hanya memegang lock sebentar"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, lines):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} counter")
+        for labels, value in values:
+            lines.append(f"{self.name}{format_labels(self.label_names, labels)} {value}")
+
+class MetricHistogram:
+    """Histogram per kombinasi label; bucket dicari di luar lock, di dalam lock hanya dua penjumlahan"""
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [hitungan per bucket (+Inf terakhir), jumlah nilai]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bucket] += 1
+            series[1] += value
+
+    def render(self, lines):
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names, labels, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {cumulative}")
+
+class MetricsRegistry:
+    """Metric yang di-update di hot path, plus collector yang dibaca saat scrape (cache, bank, proses)"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name, help_text, label_names=()):
+        metric = MetricCounter(name, help_text, label_names)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        metric = MetricHistogram(name, help_text, label_names, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def collector(self, func):
+        """func() -> iterable (nama, tipe, help, nilai); dipanggil setiap scrape"""
+        self.collectors.append(func)
+        return func
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            metric.render(lines)
+        for collect in self.collectors:
+            try:
+                samples = list(collect())
+            except Exception as e:
+                logger.error(f"Error collecting metrics: {str(e)}")
+                continue
+            for name, metric_type, help_text, value in samples:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+HTTP_REQUESTS = METRICS.counter('cat_http_requests_total', 'HTTP requests by route, method and status',
+                                ('route', 'method', 'status'))
+HTTP_LATENCY = METRICS.histogram('cat_http_request_duration_seconds', 'HTTP request latency by route',
+                                 ('route', 'method'))
+KERNEL_LATENCY = METRICS.histogram('cat_kernel_duration_seconds', 'IRT kernel latency (MAP, EAP, EFI, selection)',
+                                   ('kernel',))
+
+# Server-Timing: durasi fase per request (json, parse, posterior, forcing, mi, kernel) di header response
+SERVER_TIMING_ENABLED = os.environ.get('CAT_SERVER_TIMING', '1') == '1'
+REQUEST_TIMINGS = contextvars.ContextVar('cat_request_timings', default=None)
+
+class RequestTimings:
+    """Akumulasi durasi per fase untuk satu request; fase yang sedang berjalan tidak dihitung ulang jika bersarang"""
+
+    __slots__ = ('start', 'phases', 'active')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}  # nama -> [detik, jumlah panggilan], urut sesuai pertama kali muncul
+        self.active = set()
+
+    def enter(self, name):
+        if name in self.active:
+            return False
+        self.active.add(name)
+        return True
+
+    def leave(self, name, elapsed):
+        self.active.discard(name)
+        phase = self.phases.get(name)
+        if phase is None:
+            self.phases[name] = [elapsed, 1]
+        else:
+            phase[0] += elapsed
+            phase[1] += 1
+
+    def header(self):
+        entries = []
+        for name, (elapsed, calls) in self.phases.items():
+            entry = f"{name};dur={elapsed * 1e3:.3f}"
+            if calls > 1:
+                entry += f';desc="{calls} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1e3:.3f}")
+        return ', '.join(entries)
+
+    def as_dict(self):
+        return {
+            'phases': {name: {'ms': elapsed * 1e3, 'calls': calls} for name, (elapsed, calls) in self.phases.items()},
+            'total_ms': (time.perf_counter() - self.start) * 1e3
+        }
+
+@contextmanager
+def request_phase(name):
+    """Catat blok sebagai fase request (no-op di luar request, mis. thread spekulasi atau CLI)"""
+    timings = REQUEST_TIMINGS.get()
+    if timings is None or not timings.enter(name):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.leave(name, time.perf_counter() - start)
+
+def timed_phase(name):
+    """Decorator: seluruh fungsi dicatat sebagai fase request"""
+    def decorator(func):
+        if not SERVER_TIMING_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with request_phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def timed_kernel(kernel):
+    """Decorator: catat durasi fungsi ke histogram cat_kernel_duration_seconds{kernel=...} dan sebagai fase request"""
+    def decorator(func):
+        if not METRICS_ENABLED and not SERVER_TIMING_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = REQUEST_TIMINGS.get()
+            if timings is not None and not timings.enter(kernel):
+                timings = None
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if METRICS_ENABLED:
+                    KERNEL_LATENCY.observe(elapsed, kernel)
+                if timings is not None:
+                    timings.leave(kernel, elapsed)
+        return wrapper
+    return decorator
+
 app = Flask(__name__)
 
 # CORS Configuration dengan filterisasi untuk keamanan
@@ -122,47 +464,105 @@ CORS(app,
          'https://www.yourapp.com'    # Production www domain
      ],
      methods=['GET', 'POST', 'OPTIONS'],
-     allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
+     allow_headers=['Content-Type', 'Authorization', 'X-Requested-With', 'X-CAT-Timings'],
+     expose_headers=['Server-Timing'],  # Supaya fetch() di browser bisa membaca breakdown fase
      supports_credentials=False,  # Set True jika butuh cookies/auth
      max_age=3600  # Cache preflight response for 1 hour
 )
 
+if METRICS_ENABLED:
+    @app.before_request
+    def start_request_timer():
+        request.environ['cat.start_time'] = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = request.environ.get('cat.start_time')
+        if start is not None:
+            # Label route memakai rule (bukan path) supaya session_id tidak menambah series
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            HTTP_LATENCY.observe(time.perf_counter() - start, route, request.method)
+            HTTP_REQUESTS.inc(route, request.method, str(response.status_code))
+        return response
+
+if SERVER_TIMING_ENABLED:
+    @app.before_request
+    def start_request_timings():
+        timings = RequestTimings()
+        request.environ['cat.timings_token'] = REQUEST_TIMINGS.set(timings)
+        if request.is_json:
+            # Body di-parse di sini (Flask menyimpan hasilnya) supaya waktu decode JSON punya fase sendiri
+            with request_phase('json'):
+                request.get_json(silent=True)
+
+    @app.after_request
+    def add_server_timing(response):
+        timings = REQUEST_TIMINGS.get()
+        if timings is None:
+            return response
+        # Blok 'timings' di body JSON hanya jika diminta (?timings=1 atau header X-CAT-Timings: 1)
+        if request.args.get('timings') == '1' or request.headers.get('X-CAT-Timings') == '1':
+            data = response.get_json(silent=True) if response.is_json else None
+            if isinstance(data, dict):
+                data['timings'] = timings.as_dict()
+                response.set_data(flask_json.dumps(data))
+        response.headers['Server-Timing'] = timings.header()
+        return response
+
+    @app.teardown_request
+    def reset_request_timings(exception=None):
+        token = request.environ.pop('cat.timings_token', None)
+        if token is not None:
+            REQUEST_TIMINGS.reset(token)
+
 # Configuration
 API_VERSION = "1.0.0"
 PORT = 5000
 HOST = "127.0.0.1"
 
-# Load item parameters from CSV file
-import pandas as pd
-
-try:
-    # Load from CSV file
-    item_df = pd.read_csv('Parameter_Item_IST.csv')
-    
-    # Ensure required columns exist
-    if 'ID' in item_df.columns:
-        item_df = item_df.rename(columns={'ID': 'id'})
-    
-    # Convert to list of dictionaries
-    ITEM_BANK = []
-    for _, row in item_df.iterrows():
-        ITEM_BANK.append({
-            'id': str(row['id']),  # Keep as string for consistency
-            'a': float(row['a']),
-            'b': float(row['b']),
-            'g': float(row['g']),
-            'u': float(row.get('u', 1.0))  # Default u=1 if not in CSV
-        })
-    
-    logger.info(f"✓ Loaded {len(ITEM_BANK)} items from Parameter_Item_IST.csv")
-    
-except FileNotFoundError:
-    logger.error("✗ Parameter_Item_IST.csv not found! Please ensure the file exists.")
-    ITEM_BANK = []
-    exit(1)
-except Exception as e:
-    logger.error(f"✗ Error loading item parameters: {str(e)}")
-    ITEM_BANK = []
+ITEM_BANK_CSV = os.environ.get('CAT_ITEM_BANK_CSV', 'Parameter_Item_IST.csv')
+B_VALID_MIN = -6.0   # Rentang b yang dipakai untuk deteksi b_max/b_min
+B_VALID_MAX = 6.0
+
+# Quadrature grid theta (dipakai MAP, EAP dan EFI)
+THETA_GRID = np.linspace(-6, 6, 1001)
+SELECTION_INDEX_MIN_ITEMS = 5000   # Bank sebesar ini atau lebih memakai index branch-and-bound untuk MI
+SELECTION_INDEX_BUCKET_SIZE = 256  # Item per bucket b
+# Mode pemilihan MI: 'exact' (information dihitung di theta) atau 'ranked' (tabel ranking per bin theta)
+SELECTION_MODE = os.environ.get('CAT_SELECTION_MODE', 'exact')
+SELECTION_CRITERIA = ('MI', 'EFI')  # MI: information di theta MAP, EFI: information diboboti posterior
+RANKING_BIN_WIDTH = 0.01           # Lebar bin theta tabel ranking
+RANKING_TOP_K = int(os.environ.get('CAT_RANKING_TOP_K', '5'))  # Kandidat teratas yang di-rank ulang secara exact (0 = tanpa)
+RANKING_MEMORY_BUDGET_MB = float(os.environ.get('CAT_RANKING_MEMORY_MB', '64'))  # Batas memori tabel ranking
+ITEM_TABLES_MAX_GRIDS = 4  # Jumlah grid berbeda yang tabelnya disimpan per bank
+P_CLIP = 1e-10       # Batas clipping probabilitas di likelihood
+MAP_METHODS = ('grid', 'newton')  # Engine MAP: argmax posterior grid atau Newton-Raphson/Fisher scoring
+MAP_NEWTON_MAX_ITER = 20   # Iterasi maksimal sebelum fallback ke grid
+MAP_NEWTON_TOL = 1e-6      # Konvergen jika |langkah theta| di bawah ini
+MAP_NEWTON_MAX_STEP = 1.0  # Batas langkah per iterasi
+MAP_NEWTON_START_GRID = np.linspace(-6, 6, 61)  # Grid kasar untuk titik awal Newton
+PARAM_ATOL = 1e-6    # Toleransi parameter respons vs bank (presisi kolom decimal(8,6) Laravel)
+# Quadrature EAP/EFI: 'uniform' (grid rata di [-6, 6]), 'adaptive' (grid rata di wilayah massa posterior,
+# menyempit seiring respons bertambah) atau 'gauss-hermite' (adaptive GH: node di mode posterior, skala dari
+# kelengkungannya)
+QUADRATURE_METHODS = ('uniform', 'gauss-hermite', 'adaptive')
+# Metode yang boleh dipakai lewat CAT_QUADRATURE (skor akhir tidak boleh bergeser dari grid referensi).
+# Gauss-Hermite belum mencapai 1e-4 untuk tes pendek (posterior 3PL miring dan terpotong di +-6, selisih
+# EAP sampai ~1e-2, lihat benchmarks/bench_quadrature.py) sehingga hanya tersedia per panggilan
+QUADRATURE_CONFIG_METHODS = ('uniform', 'adaptive')
+# Berlaku untuk skor akhir EAP dan EFI item tunggal di semua jalur (stateless, session_id, /api/step, API sesi,
+# batch); MAP dan pemilihan EFI atas seluruh pool tetap di grid referensi (butuh node tetap)
+QUADRATURE = os.environ.get('CAT_QUADRATURE', 'uniform')
+QUADRATURE_DEFAULT_NODES = {'uniform': len(THETA_GRID), 'gauss-hermite': 81, 'adaptive': 61}
+QUADRATURE_NODES = int(os.environ.get('CAT_QUADRATURE_NODES', '0'))  # 0 = default per metode
+QUADRATURE_ADAPTIVE_COARSE_NODES = 49  # Grid kasar untuk mencari wilayah posterior (step 0.25)
+QUADRATURE_ADAPTIVE_TAIL = 1e-8        # Node kasar dengan posterior < TAIL * maksimum dianggap di luar wilayah
+# Batch final scoring: jumlah baris respons per chunk (chunk x grid float64, 4096 x 1001 ~ 31MB)
+BATCH_CHUNK_ROWS = int(os.environ.get('CAT_BATCH_CHUNK_ROWS', '4096'))
+BATCH_CHUNK_EXAMINEES = 512  # Batas peserta per chunk (matriks hitungan peserta x kolom <= 512 x 4096)
+if QUADRATURE not in QUADRATURE_CONFIG_METHODS:
+    logger.error(f"✗ CAT_QUADRATURE='{QUADRATURE}' tidak didukung, pilih salah satu dari {list(QUADRATURE_CONFIG_METHODS)}"
+                 + (" (gauss-hermite belum akurat 1e-4 terhadap grid referensi)" if QUADRATURE == 'gauss-hermite' else ""))
     exit(1)
 
 # IRT 3PL Functions
@@ -189,6 +589,17 @@ def information_3pl(theta, a, b, g, u=1.0):
     except (OverflowError, ValueError, ZeroDivisionError):
         return 0.0
 
+def information_3pl_array(theta, a, b, g, u=1.0):
+    """Vectorized Fisher Information 3PL (broadcasting theta x item), semantik sama dengan information_3pl"""
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        p = probability_3pl(theta, a, b, g, u)
+        q = 1 - p
+        numerator = (a**2) * (p - g)**2 * q
+        denominator = p * (u - g)**2
+        info = numerator / denominator
+    valid = (p > g) & (p < u) & (q > 0) & (denominator > 0)
+    return np.where(valid, info, 0.0)
+
 def likelihood_3pl(theta, responses):
     """Calculate likelihood for given theta and responses"""
     try:
@@ -209,253 +620,1315 @@ def likelihood_3pl(theta, responses):
     except (OverflowError, ValueError):
         return 0.0
 
-def estimate_theta_map(responses, prior_mean=0.0, prior_sd=2.0, theta_old=0.0):
-    """Estimate theta using MAP (Maximum A Posteriori) method for real-time estimation"""
-    log_estimate_theta_map()  # Log performance
-    try:
-        if not responses:
-            return prior_mean, prior_sd
+# Load item parameters from CSV file
+import pandas as pd
 
-        # Determine max allowed change based on number of responses
-        if len(responses) <= 5:
-            max_allowed_change = 1.0
-        else:
-            max_allowed_change = 0.25
+class ItemBank:
+    """Item bank 3PL dalam array NumPy contiguous (a, b, g, u) dengan index id -> posisi
+
+    Isi bank tidak berubah selama proses berjalan (bank baru = objek ItemBank baru), sehingga tabel
+    precompute, index dan pohon awal tes cukup dibangun sekali per objek.
+    """
+
+    def __init__(self, ids, a, b, g, u=None, source=None):
+        self.source = source
+        self._tables = {}
+        self._tables_lock = threading.Lock()
+        self._selection_index = None
+        self._ranking_table = None
+        self._opening_trees = {}
+        self._opening_trees_lock = threading.Lock()
+
+        self.ids = [str(item_id) for item_id in ids]  # Keep as string for consistency
+        self.a = self._readonly_array(a)
+        self.b = self._readonly_array(b)
+        self.g = self._readonly_array(g)
+        if u is None:
+            u = np.ones(len(self.ids))
+        self.u = self._readonly_array(u)
+
+        if not (len(self.ids) == len(self.a) == len(self.b) == len(self.g) == len(self.u)):
+            raise ValueError("Item parameter arrays must have the same length")
+
+        self.id_to_index = {item_id: idx for idx, item_id in enumerate(self.ids)}
+        if len(self.id_to_index) != len(self.ids):
+            raise ValueError("Duplicate item ids in item bank")
+
+        # Representasi dict per item untuk response JSON
+        self.records = [
+            {'id': item_id, 'a': float(a_i), 'b': float(b_i), 'g': float(g_i), 'u': float(u_i)}
+            for item_id, a_i, b_i, g_i, u_i in zip(self.ids, self.a, self.b, self.g, self.u)
+        ]
+        # Lookup (a, b, g, u) -> posisi untuk respons yang tidak membawa id
+        self.param_to_index = {}
+        for idx, item in enumerate(self.records):
+            self.param_to_index.setdefault((item['a'], item['b'], item['g'], item['u']), idx)
+
+        self._compute_statistics()
+
+    @staticmethod
+    def _readonly_array(values):
+        # Read-only supaya tabel precompute tidak basi karena perubahan in-place
+        array = np.array(values, dtype=np.float64)
+        array.flags.writeable = False
+        return array
+
+    @classmethod
+    def from_csv(cls, path):
+        """Load item bank dari CSV (kolom: ID/id, a, b, g, u opsional)"""
+        item_df = pd.read_csv(path)
+
+        # Ensure required columns exist
+        if 'ID' in item_df.columns:
+            item_df = item_df.rename(columns={'ID': 'id'})
+
+        u = item_df['u'].to_numpy(dtype=np.float64) if 'u' in item_df.columns else None  # Default u=1 if not in CSV
+        return cls(
+            item_df['id'].astype(str).tolist(),
+            item_df['a'].to_numpy(dtype=np.float64),
+            item_df['b'].to_numpy(dtype=np.float64),
+            item_df['g'].to_numpy(dtype=np.float64),
+            u,
+            source=os.path.basename(path)
+        )
 
-        # Quadrature points and weights (expanded range and resolution)
-        theta_range = np.linspace(-6, 6, 1001)
-        # Prior distribution: N(0,2)
-        weights = norm.pdf(theta_range, 0, 2)
-        weights = weights / np.sum(weights)
+    @classmethod
+    def from_records(cls, records, source=None):
+        """Buat item bank dari list of dicts (format lama ITEM_BANK)"""
+        return cls(
+            [item['id'] for item in records],
+            [item['a'] for item in records],
+            [item['b'] for item in records],
+            [item['g'] for item in records],
+            [item.get('u', 1.0) for item in records],
+            source=source
+        )
 
-        # Calculate likelihood for each theta
-        likelihood = np.ones_like(theta_range)
-        for resp in responses:
-            a, b, g = resp['a'], resp['b'], resp['g']
-            u = resp.get('u', 1.0)
-            answer = resp['answer']
-            p = np.array([probability_3pl(theta_val, a, b, g, u) for theta_val in theta_range])
-            p = np.clip(p, 1e-10, 1 - 1e-10)
-            if answer == 1:
-                likelihood *= p
+    def _compute_statistics(self):
+        """Precompute statistik bank untuk forcing rule dan stopping criteria"""
+        self.b_valid_mask = (self.b >= B_VALID_MIN) & (self.b <= B_VALID_MAX)
+        b_values_valid = self.b[self.b_valid_mask]
+        self.b_max = float(np.max(b_values_valid)) if len(b_values_valid) > 0 else B_VALID_MAX
+        self.b_min = float(np.min(b_values_valid)) if len(b_values_valid) > 0 else B_VALID_MIN
+        self.margin = max(0.5, 0.1 * (self.b_max - self.b_min))
+
+        # Item yang dianggap "b_max"/"b_min" (toleransi 0.001, urut sesuai bank)
+        self.b_max_indices = np.flatnonzero(self.b_valid_mask & np.isclose(self.b, self.b_max, atol=0.001))
+        self.b_min_indices = np.flatnonzero(self.b_valid_mask & np.isclose(self.b, self.b_min, atol=0.001))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, idx):
+        return self.records[idx]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def item(self, idx):
+        """Item dict pada posisi idx"""
+        return self.records[idx]
+
+    def index_of(self, item_id):
+        """Posisi item di bank, None jika id tidak dikenal"""
+        return self.id_to_index.get(str(item_id))
+
+    def indices_of(self, item_ids):
+        """Array posisi untuk item_ids yang dikenal (id tidak dikenal diabaikan)"""
+        lookup = self.id_to_index
+        indices = [lookup.get(str(item_id)) for item_id in item_ids]
+        return np.array([idx for idx in indices if idx is not None], dtype=np.intp)
+
+    def available_mask(self, used_item_ids):
+        """Bitmask item yang belum dipakai (True = tersedia)"""
+        mask = np.ones(len(self.ids), dtype=bool)
+        mask[self.indices_of(used_item_ids)] = False
+        return mask
+
+    def selection_index(self):
+        """Index bucket-b untuk MI branch-and-bound, dibangun sekali per bank"""
+        if self._selection_index is None:
+            self._selection_index = ItemSelectionIndex(self.a, self.b, self.g, self.u)
+        return self._selection_index
+
+    def ranking_table(self):
+        """Tabel ranking information per bin theta, dibangun sekali per bank"""
+        if self._ranking_table is None:
+            self._ranking_table = ItemRankingTable(self.a, self.b, self.g, self.u)
+        return self._ranking_table
+
+    def opening_tree(self, criterion='MI', build=True):
+        """Pohon keputusan awal tes untuk kriteria ini, dibangun ulang jika setting algoritma berubah
+
+        build=False: hanya pohon yang sudah dibangun dan masih berlaku (None jika belum ada)
+        """
+        key = opening_tree_settings()
+        with self._opening_trees_lock:
+            tree = self._opening_trees.get(criterion)
+            if tree is None or tree.key != key:
+                if not build:
+                    return None
+                tree = OpeningTree(self, OPENING_TREE_DEPTH, criterion, key)
+                self._opening_trees[criterion] = tree
+        return tree
+
+    def tables(self, grid=None):
+        """Tabel item x grid (P, log P, log Q, information), dibangun sekali per grid"""
+        if grid is None:
+            grid = THETA_GRID
+        key = grid.tobytes()
+        tables = self._tables.get(key)
+        if tables is None:
+            with self._tables_lock:
+                tables = self._tables.get(key)
+                if tables is None:
+                    tables = ItemGridTables(self.a, self.b, self.g, self.u, grid)
+                    if len(self._tables) >= ITEM_TABLES_MAX_GRIDS:
+                        self._tables.pop(next(iter(self._tables)))
+                    self._tables[key] = tables
+        return tables
+
+    def match_indices(self, item_ids, a, b, g, u):
+        """Posisi bank untuk tiap respons (-1 jika item tidak dikenal atau parameternya berbeda)"""
+        indices = np.full(len(a), -1, dtype=np.intp)
+        for k, item_id in enumerate(item_ids):
+            if item_id is not None:
+                idx = self.id_to_index.get(str(item_id))
             else:
-                likelihood *= (1 - p)
+                idx = self.param_to_index.get((a[k], b[k], g[k], u[k]))
+            if idx is not None:
+                indices[k] = idx
+
+        # Pastikan parameter yang dikirim klien memang parameter item di bank
+        known = np.flatnonzero(indices >= 0)
+        if len(known) > 0:
+            rows = indices[known]
+            same = (
+                (np.abs(self.a[rows] - a[known]) <= PARAM_ATOL)
+                & (np.abs(self.b[rows] - b[known]) <= PARAM_ATOL)
+                & (np.abs(self.g[rows] - g[known]) <= PARAM_ATOL)
+                & (np.abs(self.u[rows] - u[known]) <= PARAM_ATOL)
+            )
+            indices[known[~same]] = -1
+        return indices
+
+class ItemGridTables:
+    """Precompute P(theta), log P, log Q dan Fisher information (n_items x n_grid) untuk satu grid theta"""
+
+    def __init__(self, a, b, g, u, grid):
+        self.grid = grid
+        a, b, g, u = a[:, None], b[:, None], g[:, None], u[:, None]
+        with np.errstate(over='ignore'):
+            p = probability_3pl(grid[None, :], a, b, g, u)
+        self.p = np.clip(p, P_CLIP, 1 - P_CLIP)
+        self.q = 1 - self.p
+        self.log_p = np.log(self.p)
+        self.log_q = np.log(self.q)
+        self.info = information_3pl_array(grid[None, :], a, b, g, u)
+        for table in (self.p, self.q, self.log_p, self.log_q, self.info):
+            table.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        return self.p.nbytes + self.q.nbytes + self.log_p.nbytes + self.log_q.nbytes + self.info.nbytes
+
+class ItemSelectionIndex:
+    """Index item per bucket b (urut) dengan batas atas Fisher information per bucket untuk branch-and-bound MI"""
+
+    def __init__(self, a, b, g, u, bucket_size=None):
+        self.bucket_size = SELECTION_INDEX_BUCKET_SIZE if bucket_size is None else bucket_size
+        self.order = np.argsort(b, kind='stable')
+        self.a, self.b, self.g, self.u = (np.ascontiguousarray(param[self.order]) for param in (a, b, g, u))
+
+        n = len(self.order)
+        self.starts = np.arange(0, n, self.bucket_size)
+        self.ends = np.minimum(self.starts + self.bucket_size, n)
+
+        # Statistik per bucket untuk batas atas information
+        self.b_lo = np.minimum.reduceat(self.b, self.starts)
+        self.b_hi = np.maximum.reduceat(self.b, self.starts)
+        self.a_lo = np.minimum.reduceat(self.a, self.starts)
+        self.a_hi = np.maximum.reduceat(self.a, self.starts)
+        self.a_sq_max = np.maximum(self.a_lo**2, self.a_hi**2)
+        self.g_min = np.minimum.reduceat(self.g, self.starts)
+        self.u_min = np.minimum.reduceat(self.u, self.starts)
+
+        # Puncak h(L) per bucket (lihat upper_bounds); bucket dengan g < 0 atau u <= g tidak dipangkas
+        self.c_min = self.u_min - self.g_min
+        self.prunable = (self.g_min >= 0) & (self.c_min > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g, c = self.g_min, self.c_min
+            k = (1 - g) - 3 * g
+            self.l_peak = np.where(self.prunable, (k + np.sqrt(k**2 + 16 * (1 - g) * g)) / (4 * c), 0.5)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def upper_bounds(self, theta):
+        """Batas atas information tiap bucket pada theta
+
+        I = a^2 * h(L) dengan L = logistic(a(theta - b)), p = g + (u - g)L dan h(L) = L^2 (1 - p) / p.
+        h turun terhadap g dan u, dan unimodal terhadap L dengan puncak
+        L* = ((1 - 3g) - g + sqrt(((1 - g) - 3g)^2 + 16(1 - g)g)) / (4(u - g)) (dipakai g_min, u_min),
+        sehingga I <= max(a^2) * h(clip(L*, L_lo, L_hi)) untuk rentang a dan b di bucket.
+        """
+        d_lo, d_hi = theta - self.b_hi, theta - self.b_lo
+        corners = (self.a_lo * d_lo, self.a_lo * d_hi, self.a_hi * d_lo, self.a_hi * d_hi)
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            l_lo = 1 / (1 + np.exp(-np.minimum.reduce(corners)))
+            l_hi = 1 / (1 + np.exp(-np.maximum.reduce(corners)))
+            l_peak = np.clip(self.l_peak, l_lo, l_hi)
+            p = self.g_min + self.c_min * l_peak
+            bound = self.a_sq_max * l_peak**2 * (1 - p) / p
+        bound = np.where(self.prunable, np.maximum(bound, 0.0), np.inf)
+        # Slack kecil supaya pembulatan floating point tidak memangkas bucket yang seri
+        return np.where(np.isnan(bound), np.inf, bound * (1 + 1e-9) + 1e-12)
+
+    def argmax_information(self, theta, available_mask):
+        """(posisi bank, information) item tersedia dengan MI terbesar; hasil sama dengan scan penuh"""
+        bounds = self.upper_bounds(theta)
+        best_idx, best_info = -1, -np.inf
+        for k in np.argsort(-bounds, kind='stable').tolist():
+            if bounds[k] < best_info:
+                break  # Bucket berikutnya tidak mungkin mengalahkan item terbaik
+            start, end = self.starts[k], self.ends[k]
+            items = self.order[start:end]
+            available = available_mask[items]
+            if not available.any():
+                continue
+            info = information_3pl_array(theta, self.a[start:end], self.b[start:end], self.g[start:end], self.u[start:end])
+            info = np.where(available, info, -np.inf)
+            bucket_best = info.max()
+            if bucket_best > best_info or bucket_best == best_info:
+                # Seri diputuskan ke posisi bank terkecil, sama seperti argmax pada scan penuh
+                candidate = int(items[info == bucket_best].min())
+                if bucket_best > best_info or candidate < best_idx:
+                    best_idx, best_info = candidate, bucket_best
+        return best_idx, best_info
+
+class ItemRankingTable:
+    """Ranking item per bin theta (information menurun) untuk pemilihan MI tanpa menghitung information per request
+
+    Kedalaman ranking per bin dibatasi memory budget; jika semua item di ranking sudah terpakai,
+    lookup mengembalikan -1 dan pemanggil kembali ke pemilihan exact.
+    """
+
+    def __init__(self, a, b, g, u, bin_width=None, memory_budget_mb=None, theta_min=-6.0, theta_max=6.0):
+        self.bin_width = RANKING_BIN_WIDTH if bin_width is None else bin_width
+        memory_budget_mb = RANKING_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+        self.a, self.b, self.g, self.u = a, b, g, u
+        self.theta_min = theta_min
+        self.bins = theta_min + self.bin_width * np.arange(int(round((theta_max - theta_min) / self.bin_width)) + 1)
+
+        n = len(a)
+        dtype = np.int32 if n > np.iinfo(np.int16).max else np.int16
+        budget_depth = int(memory_budget_mb * 1024 * 1024) // (len(self.bins) * np.dtype(dtype).itemsize)
+        self.depth = max(1, min(n, budget_depth))
+
+        self.ranked = np.empty((len(self.bins), self.depth), dtype=dtype)
+        # Per blok bin supaya matriks information sementara tetap kecil untuk bank besar
+        block = max(1, (1 << 22) // max(n, 1))
+        for start in range(0, len(self.bins), block):
+            theta = self.bins[start:start + block, None]
+            info = information_3pl_array(theta, a[None, :], b[None, :], g[None, :], u[None, :])
+            if self.depth < n:
+                top = np.argpartition(-info, self.depth - 1, axis=1)[:, :self.depth]
+                # Urutkan kandidat berdasarkan information lalu posisi bank (seri ke posisi terkecil)
+                top.sort(axis=1)
+                order = np.argsort(-np.take_along_axis(info, top, axis=1), axis=1, kind='stable')
+                self.ranked[start:start + block] = np.take_along_axis(top, order, axis=1)
+            else:
+                self.ranked[start:start + block] = np.argsort(-info, axis=1, kind='stable')
+        self.ranked.flags.writeable = False
+
+    def __len__(self):
+        return len(self.bins)
+
+    @property
+    def nbytes(self):
+        return self.ranked.nbytes
+
+    def bin_of(self, theta):
+        """Posisi bin terdekat untuk theta (di-clip ke rentang tabel)"""
+        k = int(round((theta - self.theta_min) / self.bin_width))
+        return min(max(k, 0), len(self.bins) - 1)
+
+    def lookup(self, theta, available_mask, top_k=None):
+        """(posisi bank, information di theta) item tersedia teratas di bin theta, (-1, -inf) jika ranking habis
+
+        top_k > 0: k kandidat tersedia teratas di-rank ulang dengan information exact di theta.
+        """
+        top_k = RANKING_TOP_K if top_k is None else top_k
+        ranked = self.ranked[self.bin_of(theta)]
+        wanted = max(1, top_k)
+        # Item terpakai biasanya sedikit, cukup periksa awal ranking dan perbesar bila perlu
+        chunk = wanted + 32
+        while True:
+            head = ranked[:chunk]
+            candidates = head[available_mask[head]][:wanted].astype(np.intp)
+            if len(candidates) == wanted or chunk >= len(ranked):
+                break
+            chunk *= 4
+        if len(candidates) == 0:
+            return -1, -np.inf
+
+        info = information_3pl_array(theta, self.a[candidates], self.b[candidates], self.g[candidates], self.u[candidates])
+        if top_k <= 0:
+            return int(candidates[0]), info[0]
+        best_info = info.max()
+        return int(candidates[info == best_info].min()), best_info
 
-        # Calculate posterior
-        posterior = likelihood * weights
-        posterior_sum = np.sum(posterior)
-        if posterior_sum > 0:
-            posterior = posterior / posterior_sum
-        else:
-            # Fallback jika posterior sum = 0
-            posterior = weights / np.sum(weights)
+try:
+    ITEM_BANK = ItemBank.from_csv(ITEM_BANK_CSV)
+    logger.info(f"✓ Loaded {len(ITEM_BANK)} items from {ITEM_BANK.source}")
+
+    # Precompute tabel item x grid sekali saat startup
+    item_tables = ITEM_BANK.tables()
+    logger.info(f"✓ Precomputed item x grid tables {item_tables.p.shape} ({item_tables.nbytes / 1024 / 1024:.1f}MB)")
 
-        # MAP estimate: argmax of posterior distribution
-        theta_map_idx = np.argmax(posterior)
-        theta_map = theta_range[theta_map_idx]
+except FileNotFoundError:
+    logger.error(f"✗ {ITEM_BANK_CSV} not found! Please ensure the file exists.")
+    exit(1)
+except Exception as e:
+    logger.error(f"✗ Error loading item parameters: {str(e)}")
+    exit(1)
 
-        # Apply max allowed change constraint
-        total_change = theta_map - theta_old
-        if abs(total_change) > max_allowed_change:
-            direction = 1 if total_change > 0 else -1
-            theta_map = theta_old + direction * max_allowed_change
+def response_arrays(responses):
+    """Ekstrak id, parameter (a, b, g, u) dan jawaban dari list responses ke array NumPy"""
+    n = len(responses)
+    item_ids = [resp.get('id') for resp in responses]
+    a = np.fromiter((resp['a'] for resp in responses), dtype=np.float64, count=n)
+    b = np.fromiter((resp['b'] for resp in responses), dtype=np.float64, count=n)
+    g = np.fromiter((resp['g'] for resp in responses), dtype=np.float64, count=n)
+    u = np.fromiter((resp.get('u', 1.0) for resp in responses), dtype=np.float64, count=n)
+    answers = np.fromiter((resp['answer'] == 1 for resp in responses), dtype=bool, count=n)
+    return item_ids, a, b, g, u, answers
+
+def response_matrix(responses, item_bank=None):
+    """Response matrix: posisi bank tiap respons (-1 jika di luar bank), jawaban benar/salah, dan parameter (a, b, g, u)"""
+    if item_bank is None:
+        item_bank = ITEM_BANK
+    item_ids, a, b, g, u, answers = response_arrays(responses)
+    indices = item_bank.match_indices(item_ids, a, b, g, u)
+    return indices, answers, (a, b, g, u)
+
+def log_likelihood_grid(indices, answers, params=None, grid=None, item_bank=None, use_tables=True):
+    """Log-likelihood seluruh respons pada grid: jumlah baris log P (benar) dan log Q (salah) dari tabel bank
+
+    use_tables=False menghitung langsung dari parameter (grid sekali pakai, misal quadrature adaptif).
+    """
+    if grid is None:
+        grid = THETA_GRID
+    if item_bank is None:
+        item_bank = ITEM_BANK
 
-        # Absolute theta bounds
-        theta_map = max(-6, min(6, theta_map))
+    known = (indices >= 0) if use_tables else np.zeros(len(indices), dtype=bool)
+    log_lik = np.zeros(len(grid))
+    if known.any():
+        tables = item_bank.tables(grid)
+        log_lik += tables.log_p[indices[known & answers]].sum(axis=0)
+        log_lik += tables.log_q[indices[known & ~answers]].sum(axis=0)
+
+    # Item di luar bank: hitung langsung dari parameter yang dikirim
+    unknown = ~known
+    if unknown.any():
+        a, b, g, u = (param[unknown, None] for param in params)
+        with np.errstate(over='ignore'):
+            p = np.clip(probability_3pl(grid[None, :], a, b, g, u), P_CLIP, 1 - P_CLIP)
+        log_lik += np.where(answers[unknown, None], np.log(p), np.log(1 - p)).sum(axis=0)
+
+    return log_lik
+
+def prior_log_weights(grid=None, prior_mean=0.0, prior_sd=2.0):
+    """Log prior normal pada grid (konstanta normalisasi tidak diperlukan)"""
+    if grid is None:
+        grid = THETA_GRID
+    return -0.5 * ((grid - prior_mean) / prior_sd)**2
+
+def posterior_grid(indices, answers, params=None, grid=None, log_prior=None, item_bank=None, use_tables=True):
+    """Posterior ternormalisasi pada grid, dihitung di log-space dan dinormalisasi dengan log-sum-exp"""
+    if grid is None:
+        grid = THETA_GRID
+    if log_prior is None:
+        log_prior = prior_log_weights(grid)
+
+    log_posterior = log_prior + log_likelihood_grid(indices, answers, params, grid, item_bank, use_tables)
+    log_posterior -= np.max(log_posterior)
+    posterior = np.exp(log_posterior)
+    return posterior / np.sum(posterior)
+
+def item_information_row(a, b, g, u, grid=None, item_bank=None, use_tables=True):
+    """Fisher information satu item pada seluruh grid (dari tabel bank jika item dikenal)"""
+    if grid is None:
+        grid = THETA_GRID
+    if item_bank is None:
+        item_bank = ITEM_BANK
 
-        # Calculate approximate SE using curvature around MAP estimate
-        # Find the closest index to the constrained theta_map
-        closest_idx = np.argmin(np.abs(theta_range - theta_map))
-        
-        # Calculate SE as inverse of Fisher Information at MAP
-        se_map = 1.0  # Default SE
-        try:
-            # Calculate Fisher Information at MAP estimate
-            fisher_info = 0.0
-            for resp in responses:
-                a, b, g = resp['a'], resp['b'], resp['g']
-                u = resp.get('u', 1.0)
-                info = information_3pl(theta_map, a, b, g, u)
-                fisher_info += info
-            
-            if fisher_info > 0:
-                se_map = 1.0 / np.sqrt(fisher_info)
-            else:
-                se_map = 1.0
-        except:
+    idx = item_bank.param_to_index.get((float(a), float(b), float(g), float(u))) if use_tables else None
+    if idx is not None:
+        return item_bank.tables(grid).info[idx]
+    return information_3pl_array(grid, a, b, g, u)
+
+def map_from_posterior(posterior, params, n_responses, theta_old=0.0, grid=None):
+    """MAP theta (argmax posterior + batas perubahan) dan SE dari Fisher Information di MAP"""
+    if grid is None:
+        grid = THETA_GRID
+
+    # MAP estimate: argmax of posterior distribution
+    theta_map_idx = np.argmax(posterior)
+    theta_map = grid[theta_map_idx]
+
+    return constrain_map(theta_map, params, n_responses, theta_old)
+
+def constrain_map(theta_map, params, n_responses, theta_old=0.0):
+    """Terapkan batas perubahan dan batas absolut ke mode posterior, lalu SE dari Fisher Information di MAP"""
+    # Determine max allowed change based on number of responses
+    if n_responses <= 5:
+        max_allowed_change = 1.0
+    else:
+        max_allowed_change = 0.25
+
+    # Apply max allowed change constraint
+    total_change = theta_map - theta_old
+    if abs(total_change) > max_allowed_change:
+        direction = 1 if total_change > 0 else -1
+        theta_map = theta_old + direction * max_allowed_change
+
+    # Absolute theta bounds
+    theta_map = max(-6, min(6, theta_map))
+
+    # Calculate SE as inverse of Fisher Information at MAP
+    se_map = 1.0  # Default SE
+    try:
+        # Calculate Fisher Information at MAP estimate
+        fisher_info = float(np.sum(information_3pl_array(theta_map, *params)))
+
+        if fisher_info > 0:
+            se_map = 1.0 / np.sqrt(fisher_info)
+        else:
             se_map = 1.0
+    except:
+        se_map = 1.0
+
+    return theta_map, se_map
+
+def map_newton(answers, params, theta_start=None, prior_mean=0.0, prior_sd=2.0, max_iter=None, tol=None):
+    """Mode posterior 3PL + prior normal dengan Newton-Raphson (turunan analitik), None jika tidak konvergen
+
+    Hanya item yang sudah dijawab yang dihitung, tidak bergantung pada resolusi THETA_GRID.
+    Tanpa theta_start, titik awal adalah argmax log-posterior pada grid kasar MAP_NEWTON_START_GRID
+    supaya iterasi tidak terjebak di mode lokal (posterior 3PL bisa multimodal). Jika turunan kedua
+    tidak negatif, langkah memakai Fisher scoring (-information) supaya arah tetap naik.
+    """
+    max_iter = MAP_NEWTON_MAX_ITER if max_iter is None else max_iter
+    tol = MAP_NEWTON_TOL if tol is None else tol
+    a, b, g, u = params
+    x = answers.astype(np.float64)
+    x_wrong = 1 - x
+    c = u - g
+    ac = a * c
+    prior_precision = 1.0 / prior_sd**2
+
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        if theta_start is None:
+            grid = MAP_NEWTON_START_GRID[:, None]
+            p = np.clip(g + c / (1 + np.exp(-a * (grid - b))), P_CLIP, 1 - P_CLIP)
+            log_posterior = np.log(np.where(answers, p, 1 - p)).sum(axis=1)
+            log_posterior -= 0.5 * (MAP_NEWTON_START_GRID - prior_mean)**2 * prior_precision
+            theta_start = MAP_NEWTON_START_GRID[np.argmax(log_posterior)]
+
+        theta = float(theta_start)
+        for iteration in range(1, max_iter + 1):
+            l = 1 / (1 + np.exp(-a * (theta - b)))
+            p = np.clip(g + c * l, P_CLIP, 1 - P_CLIP)
+            q = 1 - p
+            dp = ac * l * (1 - l)
+            dp_sq = dp * dp
+            w = (x - p) / (p * q)
+
+            # Gradien dan turunan kedua log-posterior (P" = a P' (1 - 2L))
+            gradient = float(w @ dp) - (theta - prior_mean) * prior_precision
+            hessian = float(w @ (a * dp * (1 - 2 * l)) - dp_sq @ (x / (p * p) + x_wrong / (q * q))) - prior_precision
+            if not hessian < 0:
+                hessian = -float(dp_sq @ (1 / (p * q))) - prior_precision
+
+            step = min(max(-gradient / hessian, -MAP_NEWTON_MAX_STEP), MAP_NEWTON_MAX_STEP)
+            theta += step
+            if not np.isfinite(theta) or abs(theta) > 6:
+                return None
+            if abs(step) < tol:
+                return theta, iteration
+    return None
+
+def eap_from_posterior(posterior, grid=None, grid_sq=None):
+    """EAP theta (mean posterior) dan SE (SD posterior); grid_sq = grid**2 precompute jika tersedia"""
+    if grid is None:
+        grid = THETA_GRID
+
+    # EAP estimate: expected value of posterior distribution
+    theta_eap = grid @ posterior
+
+    # Absolute theta bounds
+    theta_eap = max(-6, min(6, theta_eap))
+
+    # Calculate SE_EAP using variance of posterior
+    if grid_sq is None:
+        variance = ((grid - theta_eap)**2) @ posterior
+    else:
+        variance = max(grid_sq @ posterior - theta_eap**2, 0.0)
+    se_eap = np.sqrt(variance)
+
+    return theta_eap, se_eap
+
+class Quadrature:
+    """Konteks quadrature immutable: node theta, log-bobot (prior x bobot quadrature), prior ternormalisasi dan theta^2
+
+    Seperti grid referensi, posterior dibatasi ke [-6, 6]: node Gauss-Hermite di luar rentang diberi bobot nol.
+    fixed=True: node tetap sehingga tabel item x node bank bisa di-cache (ItemBank.tables) dan konteks
+    dibagi antar thread lewat prior_quadrature; node adaptif dan Gauss-Hermite berubah tiap panggilan dan
+    dihitung langsung dari parameter respons.
+    """
+
+    def __init__(self, method, nodes, log_weights, fixed=True, prior_mean=0.0, prior_sd=2.0):
+        self.method = method
+        self.fixed = fixed
+        self.prior_mean = prior_mean
+        self.prior_sd = prior_sd
+        self.nodes = nodes
+        self.nodes_sq = nodes**2
+        self.log_weights = np.where(np.abs(nodes) <= 6, log_weights, -np.inf)
+        # Posterior tanpa respons (dipakai langsung untuk EFI item pertama)
+        prior = np.exp(self.log_weights - np.max(self.log_weights))
+        self.prior = prior / np.sum(prior)
+        for array in (self.nodes_sq, self.log_weights, self.prior):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @classmethod
+    def uniform(cls, n_nodes=None, prior_mean=0.0, prior_sd=2.0):
+        """Grid rata di [-6, 6] dengan bobot prior normal (n = len(THETA_GRID) sama dengan grid referensi)"""
+        n_nodes = len(THETA_GRID) if n_nodes is None else n_nodes
+        nodes = THETA_GRID if n_nodes == len(THETA_GRID) else np.linspace(-6, 6, n_nodes)
+        return cls('uniform', nodes, prior_log_weights(nodes, prior_mean, prior_sd),
+                   prior_mean=prior_mean, prior_sd=prior_sd)
+
+    @classmethod
+    def gauss_hermite(cls, mode, scale, n_nodes=None, prior_mean=0.0, prior_sd=2.0):
+        """Adaptive Gauss-Hermite: node mode + sqrt(2) * scale * x dengan bobot w * exp(x^2) x prior normal
+
+        Integrand posterior dibagi kernel Gaussian N(mode, scale) sehingga eksak jika posterior Gaussian.
+        """
+        n_nodes = QUADRATURE_DEFAULT_NODES['gauss-hermite'] if n_nodes is None else n_nodes
+        x, w = hermite_nodes(n_nodes)
+        nodes = mode + np.sqrt(2) * scale * x
+        return cls('gauss-hermite', nodes, np.log(w) + x**2 + prior_log_weights(nodes, prior_mean, prior_sd),
+                   fixed=False, prior_mean=prior_mean, prior_sd=prior_sd)
+
+    @classmethod
+    def adaptive(cls, lower, upper, n_nodes=None, prior_mean=0.0, prior_sd=2.0):
+        """Grid rata di [lower, upper] (wilayah massa posterior) dengan bobot trapesium x prior normal
+
+        Grid referensi (jumlah biasa di THETA_GRID) setara trapesium ditambah setengah step massa di -6 dan 6;
+        ujung adaptif yang jatuh di batas tersebut diberi tambahan yang sama supaya hasil sinkron dengan referensi.
+        """
+        n_nodes = QUADRATURE_DEFAULT_NODES['adaptive'] if n_nodes is None else n_nodes
+        nodes = np.linspace(lower, upper, n_nodes)
+        weights = np.ones(n_nodes)
+        weights[[0, -1]] = 0.5
+        step, reference_step = nodes[1] - nodes[0], THETA_GRID[1] - THETA_GRID[0]
+        weights[[0, -1]] += np.where(np.abs(nodes[[0, -1]]) >= 6, 0.5 * reference_step / step, 0.0)
+        return cls('adaptive', nodes, np.log(weights) + prior_log_weights(nodes, prior_mean, prior_sd),
+                   fixed=False, prior_mean=prior_mean, prior_sd=prior_sd)
+
+    def posterior(self, indices, answers, params, item_bank=None):
+        """Bobot posterior ternormalisasi pada node"""
+        if len(indices) == 0:
+            return self.prior
+        return posterior_grid(indices, answers, params, self.nodes, self.log_weights, item_bank, use_tables=self.fixed)
+
+    def information_row(self, a, b, g, u, item_bank=None):
+        """Fisher information satu item pada node"""
+        return item_information_row(a, b, g, u, self.nodes, item_bank, use_tables=self.fixed)
+
+    def eap(self, posterior):
+        """EAP theta dan SE dari bobot posterior pada node"""
+        return eap_from_posterior(posterior, self.nodes, self.nodes_sq)
+
+QUADRATURE_CACHE_SIZE = 32  # Konteks quadrature tetap (metode, node, prior) yang disimpan (LRU)
+
+_HERMITE_NODES = {}
+_FIXED_QUADRATURES = OrderedDict()
+_FIXED_QUADRATURES_LOCK = threading.Lock()
+
+def hermite_nodes(n_nodes):
+    """Node dan bobot Gauss-Hermite (fisikawan, kernel exp(-x^2)), di-cache per jumlah node"""
+    nodes = _HERMITE_NODES.get(n_nodes)
+    if nodes is None:
+        nodes = np.polynomial.hermite.hermgauss(n_nodes)
+        _HERMITE_NODES[n_nodes] = nodes
+    return nodes
+
+def prior_quadrature(method='uniform', n_nodes=None, prior_mean=0.0, prior_sd=2.0):
+    """Konteks quadrature node tetap untuk satu prior, dibangun sekali dan disimpan di LRU terbatas"""
+    if method != 'uniform':
+        raise ValueError(f"Quadrature '{method}' has no fixed nodes")
+    n_nodes = n_nodes or QUADRATURE_NODES or QUADRATURE_DEFAULT_NODES[method]
+    key = (method, n_nodes, float(prior_mean), float(prior_sd))
+    with _FIXED_QUADRATURES_LOCK:
+        quadrature = _FIXED_QUADRATURES.get(key)
+        if quadrature is not None:
+            _FIXED_QUADRATURES.move_to_end(key)
+            return quadrature
+
+    quadrature = Quadrature.uniform(n_nodes, prior_mean, prior_sd)
+    with _FIXED_QUADRATURES_LOCK:
+        quadrature = _FIXED_QUADRATURES.setdefault(key, quadrature)
+        while len(_FIXED_QUADRATURES) > QUADRATURE_CACHE_SIZE:
+            _FIXED_QUADRATURES.popitem(last=False)
+    return quadrature
+
+def quadrature_for(answers, params, quadrature=None, n_nodes=None, prior_mean=0.0, prior_sd=2.0):
+    """Quadrature untuk posterior respons ini: konteks Quadrature yang diberikan, atau nama metode
+    (default QUADRATURE, QUADRATURE_NODES)"""
+    if isinstance(quadrature, Quadrature):
+        return quadrature
+    method = quadrature or QUADRATURE
+    if method not in QUADRATURE_METHODS:
+        raise ValueError(f"Unknown quadrature '{method}'")
+
+    if method == 'uniform':
+        return prior_quadrature(method, n_nodes, prior_mean, prior_sd)
+
+    n_nodes = n_nodes or QUADRATURE_NODES or QUADRATURE_DEFAULT_NODES[method]
+    # Posterior kasar di grid uniform untuk menentukan wilayah/bentuk posterior
+    coarse = prior_quadrature('uniform', QUADRATURE_ADAPTIVE_COARSE_NODES, prior_mean, prior_sd)
+    posterior = coarse.posterior(np.full(len(answers), -1, dtype=np.intp), answers, params)
+    if method == 'gauss-hermite':
+        mode, scale = posterior_mode_scale(coarse.nodes, posterior, prior_sd)
+        return Quadrature.gauss_hermite(mode, scale, n_nodes, prior_mean, prior_sd)
+
+    # Wilayah yang massanya tidak dapat diabaikan
+    keep = np.flatnonzero(posterior >= QUADRATURE_ADAPTIVE_TAIL * posterior.max())
+    lower = coarse.nodes[max(keep[0] - 1, 0)]
+    upper = coarse.nodes[min(keep[-1] + 1, len(coarse) - 1)]
+    return Quadrature.adaptive(lower, upper, n_nodes, prior_mean, prior_sd)
+
+def posterior_mode_scale(grid, posterior, default_scale):
+    """Mode dan skala (1 / sqrt(-d2 log posterior)) dari posterior grid kasar, diperhalus dengan parabola di
+    sekitar argmax; default_scale jika log posterior tidak cekung di sana (mis. mode di batas grid)"""
+    k = min(max(int(np.argmax(posterior)), 1), len(grid) - 2)
+    with np.errstate(divide='ignore'):
+        left, center, right = np.log(posterior[k - 1:k + 2])
+    step = grid[1] - grid[0]
+    curvature = (left - 2 * center + right) / step**2
+    if not np.isfinite(curvature) or curvature >= 0:
+        return grid[k], default_scale
+    mode = grid[k] - (right - left) / (2 * step) / curvature
+    return float(np.clip(mode, grid[0], grid[-1])), float(1 / np.sqrt(-curvature))
+
+# Konteks grid referensi (MAP grid, posterior sesi, EAP/EFI uniform default), dibuat sekali saat startup
+REFERENCE_QUADRATURE = prior_quadrature('uniform', len(THETA_GRID))
+
+@timed_kernel('map')
+def estimate_theta_map(responses, prior_mean=0.0, prior_sd=2.0, theta_old=0.0, item_bank=None, method='grid',
+                       quadrature=None):
+    """Estimate theta using MAP (Maximum A Posteriori) method for real-time estimation
+
+    method: 'grid' (argmax posterior pada THETA_GRID) atau 'newton' (fallback ke grid jika tidak konvergen)
+    quadrature: konteks grid untuk metode 'grid' (default grid referensi dengan prior N(prior_mean, prior_sd))
+    """
+    log_estimate_theta_map()  # Log performance
+    try:
+        if not responses:
+            return prior_mean, prior_sd
 
-        return theta_map, se_map
+        indices, answers, params = response_matrix(responses, item_bank)
+        if method == 'newton':
+            result = map_newton(answers, params, prior_mean=prior_mean, prior_sd=prior_sd)
+            if result is not None:
+                return constrain_map(result[0], params, len(responses), theta_old)
+            logger.info("Newton MAP did not converge, falling back to grid")
+
+        # Posterior pada quadrature grid dengan prior N(0,2), dilanjutkan dari prefix respons yang sudah di-cache
+        if uses_prefix_cache(indices, prior_mean, prior_sd, quadrature):
+            return map_from_posterior(PREFIX_CACHE.entry(indices, answers, params, item_bank).posterior,
+                                      params, len(responses), theta_old, THETA_GRID)
+        if quadrature is None:
+            quadrature = prior_quadrature('uniform', len(THETA_GRID), prior_mean, prior_sd)
+        posterior = quadrature.posterior(indices, answers, params, item_bank)
+
+        return map_from_posterior(posterior, params, len(responses), theta_old, quadrature.nodes)
     except (OverflowError, ValueError, ZeroDivisionError):
         return prior_mean, prior_sd
 
-def estimate_theta_eap(responses, prior_mean=0.0, prior_sd=2.0):
-    """Estimate theta using EAP (Expected A Posteriori) method for final scoring"""
+@timed_kernel('eap')
+def estimate_theta_eap(responses, prior_mean=0.0, prior_sd=2.0, item_bank=None, quadrature=None):
+    """Estimate theta using EAP (Expected A Posteriori) method for final scoring
+
+    quadrature: konteks Quadrature, atau 'uniform', 'gauss-hermite', 'adaptive' (default QUADRATURE)
+    """
     log_estimate_theta_eap()  # Log performance
     try:
         if not responses:
             return prior_mean, prior_sd
 
-        # Quadrature points and weights (expanded range and resolution)
-        theta_range = np.linspace(-6, 6, 1001)
-        # Prior distribution: N(0,2)
-        weights = norm.pdf(theta_range, 0, 2)
-        weights = weights / np.sum(weights)
-
-        # Calculate likelihood for each theta
-        likelihood = np.ones_like(theta_range)
-        for resp in responses:
-            a, b, g = resp['a'], resp['b'], resp['g']
-            u = resp.get('u', 1.0)
-            answer = resp['answer']
-            p = np.array([probability_3pl(theta_val, a, b, g, u) for theta_val in theta_range])
-            p = np.clip(p, 1e-10, 1 - 1e-10)
-            if answer == 1:
-                likelihood *= p
-            else:
-                likelihood *= (1 - p)
+        # Posterior pada node quadrature dengan prior N(0,2)
+        indices, answers, params = response_matrix(responses, item_bank)
+        quad = quadrature_for(answers, params, quadrature, prior_mean=prior_mean, prior_sd=prior_sd)
+        if uses_prefix_cache(indices, prior_mean, prior_sd, quad):
+            return PREFIX_CACHE.entry(indices, answers, params, item_bank).eap()
+        posterior = quad.posterior(indices, answers, params, item_bank)
 
-        # Calculate posterior
-        posterior = likelihood * weights
-        posterior_sum = np.sum(posterior)
-        if posterior_sum > 0:
-            posterior = posterior / posterior_sum
-        else:
-            # Fallback jika posterior sum = 0
-            posterior = weights / np.sum(weights)
-
-        # EAP estimate: expected value of posterior distribution
-        theta_eap = np.sum(theta_range * posterior)
-
-        # Absolute theta bounds
-        theta_eap = max(-6, min(6, theta_eap))
-
-        # Calculate SE_EAP using variance of posterior
-        variance = np.sum(((theta_range - theta_eap)**2) * posterior)
-        se_eap = np.sqrt(variance)
-
-        return theta_eap, se_eap
+        return quad.eap(posterior)
     except (OverflowError, ValueError, ZeroDivisionError):
         return prior_mean, prior_sd
 
-def expected_fisher_information(a, b, g, u, responses=None):
+@timed_kernel('eap_batch')
+def estimate_theta_eap_batch(indices, answers, params, lengths, prior_mean=0.0, prior_sd=2.0, item_bank=None,
+                             quadrature=None, chunk_rows=None):
+    """EAP theta dan SE banyak peserta sekaligus dari response matrix yang digabung (ragged, panjang per peserta)
+
+    Log-likelihood per peserta = matriks hitungan (peserta x baris log P/log Q yang dipakai) @ tabel bank,
+    sehingga posterior (peserta x node) dihitung dalam satu pass per chunk (maksimal chunk_rows respons
+    dan BATCH_CHUNK_EXAMINEES peserta).
+    Peserta tanpa respons mendapat (prior_mean, prior_sd). Quadrature adaptif dan Gauss-Hermite (node berbeda
+    per peserta) dihitung per peserta. Return (theta, se) array sesuai urutan input.
+    """
+    if item_bank is None:
+        item_bank = ITEM_BANK
+    chunk_rows = BATCH_CHUNK_ROWS if chunk_rows is None else chunk_rows
+    lengths = np.asarray(lengths, dtype=np.intp)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    theta = np.full(len(lengths), float(prior_mean))
+    se = np.full(len(lengths), float(prior_sd))
+
+    method = quadrature.method if isinstance(quadrature, Quadrature) else quadrature or QUADRATURE
+    if method != 'uniform':
+        for k in np.flatnonzero(lengths > 0):
+            rows = slice(offsets[k], offsets[k + 1])
+            row_params = tuple(param[rows] for param in params)
+            quad = quadrature_for(answers[rows], row_params, quadrature, prior_mean=prior_mean, prior_sd=prior_sd)
+            theta[k], se[k] = quad.eap(quad.posterior(indices[rows], answers[rows], row_params, item_bank))
+        return theta, se
+
+    quad = quadrature_for(answers, params, quadrature, prior_mean=prior_mean, prior_sd=prior_sd)
+    tables = item_bank.tables(quad.nodes)
+    n_items = len(item_bank)
+
+    # Chunk berisi peserta berurutan dengan total respons <= chunk_rows (minimal satu peserta)
+    start = 0
+    while start < len(lengths):
+        end = start + 1
+        while (end < len(lengths) and end - start < BATCH_CHUNK_EXAMINEES
+               and offsets[end + 1] - offsets[start] <= chunk_rows):
+            end += 1
+        scored = start + np.flatnonzero(lengths[start:end] > 0)
+        rows = slice(offsets[start], offsets[end])
+        start = end
+        if len(scored) == 0:
+            continue
+
+        # Kolom = baris log Q (salah) atau log P (benar) item bank yang muncul di chunk, lalu item di luar bank
+        chunk_indices, chunk_answers = indices[rows], answers[rows]
+        known = chunk_indices >= 0
+        columns, column_of = np.unique(chunk_indices[known] + n_items * chunk_answers[known], return_inverse=True)
+        log_rows = [np.where((columns >= n_items)[:, None],
+                             tables.log_p[columns % n_items], tables.log_q[columns % n_items])]
+        column = np.empty(len(chunk_indices), dtype=np.intp)
+        column[known] = column_of
+        unknown = np.flatnonzero(~known)
+        if len(unknown) > 0:
+            a, b, g, u = (param[rows][unknown, None] for param in params)
+            with np.errstate(over='ignore'):
+                p = np.clip(probability_3pl(quad.nodes[None, :], a, b, g, u), P_CLIP, 1 - P_CLIP)
+            log_rows.append(np.where(chunk_answers[unknown, None], np.log(p), np.log(1 - p)))
+            column[unknown] = len(columns) + np.arange(len(unknown))
+        n_columns = len(columns) + len(unknown)
+
+        # Matriks hitungan (peserta x kolom) dikali tabel log-likelihood: satu perkalian matriks per chunk
+        examinee = np.repeat(np.arange(len(scored)), lengths[scored])
+        counts = np.bincount(examinee * n_columns + column, minlength=len(scored) * n_columns)
+        log_posterior = counts.reshape(len(scored), n_columns).astype(np.float64) @ np.vstack(log_rows)
+        log_posterior += quad.log_weights
+        log_posterior -= log_posterior.max(axis=1, keepdims=True)
+        posterior = np.exp(log_posterior)
+        posterior /= posterior.sum(axis=1, keepdims=True)
+
+        chunk_theta = np.clip(posterior @ quad.nodes, -6, 6)
+        theta[scored] = chunk_theta
+        se[scored] = np.sqrt(np.maximum(posterior @ quad.nodes_sq - chunk_theta**2, 0.0))
+
+    return theta, se
+
+@timed_kernel('efi')
+def expected_fisher_information(a, b, g, u, responses=None, item_bank=None, quadrature=None,
+                                prior_mean=0.0, prior_sd=2.0):
     """Calculate Expected Fisher Information (EFI) for 3PL model with EAP"""
     try:
-        # Grid theta yang sinkron dengan EAP
-        theta_grid = np.linspace(-6, 6, 1001)
-        
-        if not responses:
-            # Jika belum ada respons, gunakan prior N(0,2)
-            prior = np.exp(-0.5 * (theta_grid / 2)**2)
-            prior = prior / np.sum(prior)
-            
-            # Hitung EFI berdasarkan prior
-            efi = 0
-            for theta_val, weight in zip(theta_grid, prior):
-                info = information_3pl(theta_val, a, b, g, u)
-                efi += info * weight
-            return efi
-        
-        # Jika sudah ada respons, gunakan posterior dari EAP
-        # Prior distribution: N(0,2) - SINKRON dengan EAP
-        prior = np.exp(-0.5 * (theta_grid / 2)**2)
-        prior = prior / np.sum(prior)
-        
-        # Hitung likelihood untuk setiap theta di grid
-        likelihood = np.ones_like(theta_grid)
-        
-        for response in responses:
-            a_resp, b_resp, g_resp = response['a'], response['b'], response['g']
-            u_resp = response.get('u', 1.0)
-            answer = response['answer']
-            
-            p = np.array([probability_3pl(theta_val, a_resp, b_resp, g_resp, u_resp) 
-                         for theta_val in theta_grid])
-            p = np.clip(p, 1e-10, 1 - 1e-10)
-            
-            if answer == 1:
-                likelihood *= p
-            else:
-                likelihood *= (1 - p)
-        
-        # Hitung posterior distribution
-        posterior = likelihood * prior
-        posterior_sum = np.sum(posterior)
-        if posterior_sum > 0:
-            posterior = posterior / posterior_sum
+        # Posterior dari respons (prior N(0,2) jika belum ada respons) - SINKRON dengan EAP
+        indices, answers, params = response_matrix(responses or [], item_bank)
+        quad = quadrature_for(answers, params, quadrature, prior_mean=prior_mean, prior_sd=prior_sd)
+        if uses_prefix_cache(indices, prior_mean, prior_sd, quad):
+            posterior = PREFIX_CACHE.entry(indices, answers, params, item_bank).posterior
         else:
-            posterior = prior
-        
+            posterior = quad.posterior(indices, answers, params, item_bank)
+
+        # Information item kandidat pada node yang sama (dari tabel precompute untuk node tetap)
+        info = quad.information_row(a, b, g, u, item_bank)
+
         # Hitung Expected Fisher Information
-        efi = 0
-        for theta_val, weight in zip(theta_grid, posterior):
-            info = information_3pl(theta_val, a, b, g, u)
-            efi += info * weight
-            
-        return efi
-        
+        return float(info @ posterior)
+
     except (OverflowError, ValueError, ZeroDivisionError):
         return 0.0
 
-def select_next_item_mi(theta, used_item_ids, item_bank, responses=None):
-    """Select next item using Maximum Fisher Information (MI) based on MAP theta"""
+@timed_kernel('efi_batch')
+def expected_fisher_information_batch(posterior, grid=None, item_bank=None, available_mask=None):
+    """EFI semua item tersedia sekaligus: (info_table @ posterior)[available]
+
+    posterior harus pada grid node tetap (tabel item x grid bank di-cache). Return (posisi bank, EFI).
+    Matvec dijalankan atas seluruh tabel lalu di-mask, supaya baris tabel item tersedia tidak disalin.
+    """
+    if grid is None:
+        grid = THETA_GRID
+    if item_bank is None:
+        item_bank = ITEM_BANK
+
+    efi = item_bank.tables(grid).info @ posterior
+    if available_mask is None:
+        return np.arange(len(item_bank)), efi
+    indices = np.flatnonzero(available_mask)
+    return indices, efi[indices]
+
+# Incremental posterior per sesi
+POSTERIOR_CACHE_MAX_SESSIONS = 2000  # ~8KB per sesi untuk grid 1001 titik
+
+class PosteriorState:
+    """Log-posterior satu sesi pada grid; respons baru hanya menambah satu baris log-likelihood (O(grid))"""
+
+    def __init__(self, grid=None, log_prior=None, item_bank=None):
+        self.grid = THETA_GRID if grid is None else grid
+        self.item_bank = ITEM_BANK if item_bank is None else item_bank
+        if log_prior is None:
+            log_prior = REFERENCE_QUADRATURE.log_weights if grid is None else prior_log_weights(self.grid)
+        self.log_posterior = log_prior.copy()
+        self.grid_sq = REFERENCE_QUADRATURE.nodes_sq if grid is None else self.grid**2
+        self.keys = []      # (posisi bank atau parameter, jawaban) per respons, urut
+        self.a, self.b, self.g, self.u = [], [], [], []
+        self.lock = threading.Lock()
+        self._posterior = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def response_keys(indices, answers, params):
+        """Key urutan respons: posisi bank untuk item yang dikenal, tuple parameter untuk yang tidak"""
+        a, b, g, u = params
+        return [
+            (int(idx) if idx >= 0 else (float(a[k]), float(b[k]), float(g[k]), float(u[k])), bool(answers[k]))
+            for k, idx in enumerate(indices.tolist())
+        ]
+
+    def extend(self, indices, answers, params, keys=None):
+        """Tambah respons baru (sudah dalam bentuk response matrix) ke posterior"""
+        if len(indices) == 0:
+            return
+        if keys is None:
+            keys = self.response_keys(indices, answers, params)
+        self.log_posterior += log_likelihood_grid(indices, answers, params, self.grid, self.item_bank)
+        self.keys.extend(keys)
+        for values, param in zip((self.a, self.b, self.g, self.u), params):
+            values.extend(param.tolist())
+        self._posterior = None
+
+    def copy(self):
+        """Salinan state (log-posterior dan riwayat respons) untuk dicabangkan tanpa mengubah aslinya"""
+        state = PosteriorState.__new__(PosteriorState)
+        state.__dict__.update(self.__dict__)
+        state.log_posterior = self.log_posterior.copy()
+        state.keys = list(self.keys)
+        state.a, state.b, state.g, state.u = list(self.a), list(self.b), list(self.g), list(self.u)
+        state.lock = threading.Lock()
+        return state
+
+    @timed_phase('posterior')
+    def add_responses(self, responses):
+        """Tambah respons dalam format API (dict a, b, g, u, answer)"""
+        indices, answers, params = response_matrix(responses, self.item_bank)
+        self.extend(indices, answers, params)
+
+    @property
+    def params(self):
+        return (np.array(self.a), np.array(self.b), np.array(self.g), np.array(self.u))
+
+    @property
+    def answers(self):
+        return np.array([answer for _, answer in self.keys], dtype=bool)
+
+    @property
+    def indices(self):
+        return np.array([key if isinstance(key, int) else -1 for key, _ in self.keys], dtype=np.intp)
+
+    @property
+    def posterior(self):
+        """Posterior ternormalisasi (log-sum-exp), di-cache sampai ada respons baru"""
+        if self._posterior is None:
+            log_posterior = self.log_posterior - np.max(self.log_posterior)
+            posterior = np.exp(log_posterior)
+            self._posterior = posterior / np.sum(posterior)
+        return self._posterior
+
+    @timed_kernel('map')
+    def map_estimate(self, theta_old=0.0, prior_mean=0.0, prior_sd=2.0, method='grid'):
+        """MAP theta dan SE dari state (sama dengan estimate_theta_map)"""
+        log_estimate_theta_map()  # Log performance
+        if not self.keys:
+            return prior_mean, prior_sd
+        params = self.params
+        if method == 'newton':
+            result = map_newton(self.answers, params, prior_mean=prior_mean, prior_sd=prior_sd)
+            if result is not None:
+                return constrain_map(result[0], params, len(self.keys), theta_old)
+            logger.info("Newton MAP did not converge, falling back to grid")
+        return map_from_posterior(self.posterior, params, len(self.keys), theta_old, self.grid)
+
+    @timed_kernel('eap')
+    def eap_estimate(self, prior_mean=0.0, prior_sd=2.0, quadrature=None):
+        """EAP theta dan SE dari state (sama dengan estimate_theta_eap, quadrature default QUADRATURE)
+
+        Posterior state dipakai langsung jika quadrature-nya grid referensi; quadrature lain (CAT_QUADRATURE
+        adaptive, jumlah node lain, prior lain) dihitung dari riwayat respons state.
+        """
+        log_estimate_theta_eap()  # Log performance
+        if not self.keys:
+            return prior_mean, prior_sd
+        quad, posterior = self.quadrature_posterior(quadrature, prior_mean, prior_sd)
+        return quad.eap(posterior)
+
+    def quadrature_posterior(self, quadrature=None, prior_mean=0.0, prior_sd=2.0):
+        """(quadrature, posterior) untuk riwayat state; posterior state sendiri jika quadrature-nya grid referensi"""
+        answers, params = self.answers, self.params
+        quad = quadrature_for(answers, params, quadrature, prior_mean=prior_mean, prior_sd=prior_sd)
+        if quad is REFERENCE_QUADRATURE and self.grid is THETA_GRID:
+            return quad, self.posterior
+        return quad, quad.posterior(self.indices, answers, params, self.item_bank)
+
+    @timed_kernel('efi')
+    def expected_fisher_information(self, a, b, g, u, quadrature=None):
+        """EFI item kandidat terhadap posterior state (sama dengan expected_fisher_information)"""
+        quad, posterior = self.quadrature_posterior(quadrature)
+        return float(quad.information_row(a, b, g, u, self.item_bank) @ posterior)
+
+    def expected_fisher_information_batch(self, available_mask=None):
+        """EFI seluruh item tersedia terhadap posterior state (lihat expected_fisher_information_batch)"""
+        return expected_fisher_information_batch(self.posterior, self.grid, self.item_bank, available_mask)
+
+class PosteriorCache:
+    """Store PosteriorState per session_id (LRU, thread-safe) untuk endpoint stateless"""
+
+    def __init__(self, max_sessions=POSTERIOR_CACHE_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0           # state dipakai ulang (0 atau beberapa baris baru ditambahkan)
+        self.rebuilds = 0       # riwayat tidak cocok dengan state, dibangun ulang
+        self.misses = 0         # session_id belum punya state
+        self.evictions = 0
+
+    @timed_phase('posterior')
+    def sync(self, session_id, responses, item_bank=None):
+        """State untuk session_id yang sudah mencakup seluruh responses; hanya respons baru yang dihitung"""
+        if item_bank is None:
+            item_bank = ITEM_BANK
+        indices, answers, params = response_matrix(responses, item_bank)
+        keys = PosteriorState.response_keys(indices, answers, params)
+
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+
+        if state is not None:
+            with state.lock:
+                n_cached = len(state.keys)
+                reusable = (
+                    state.item_bank is item_bank
+                    and n_cached <= len(keys)
+                    and state.keys == keys[:n_cached]
+                )
+                if reusable:
+                    new = slice(n_cached, None)
+                    state.extend(indices[new], answers[new], tuple(param[new] for param in params), keys[new])
+                    with self._lock:
+                        self.hits += 1
+                    return state
+            with self._lock:
+                self.rebuilds += 1
+        else:
+            with self._lock:
+                self.misses += 1
+
+        state = PosteriorState(item_bank=item_bank)
+        state.extend(indices, answers, params, keys)
+        with self._lock:
+            self._states[session_id] = state
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+                self.evictions += 1
+        return state
+
+    def store(self, session_id, state):
+        """Simpan state yang sudah dihitung di tempat lain (misal node pohon awal tes) untuk session_id"""
+        with self._lock:
+            self._states[session_id] = state
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, session_id):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._states),
+                'max_sessions': self.max_sessions,
+                'hits': self.hits,
+                'rebuilds': self.rebuilds,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+POSTERIOR_CACHE = PosteriorCache()
+
+# Cache prefix pola respons lintas peserta (endpoint stateless tanpa session_id)
+PREFIX_CACHE_MAX_ENTRIES = int(os.environ.get('CAT_PREFIX_CACHE_ENTRIES', '20000'))
+PREFIX_CACHE_MAX_MB = float(os.environ.get('CAT_PREFIX_CACHE_MB', '128'))
+
+class PrefixEntry:
+    """Log-posterior grid referensi untuk satu prefix respons, dengan posterior dan EAP yang di-cache"""
+
+    def __init__(self, item_bank, log_posterior):
+        self.item_bank = item_bank
+        self.log_posterior = log_posterior
+        self.log_posterior.flags.writeable = False
+        self._posterior = None
+        self._eap = None
+
+    @property
+    def nbytes(self):
+        return 2 * self.log_posterior.nbytes  # log-posterior + posterior ternormalisasi
+
+    @property
+    def posterior(self):
+        if self._posterior is None:
+            log_posterior = self.log_posterior - np.max(self.log_posterior)
+            posterior = np.exp(log_posterior)
+            posterior = posterior / np.sum(posterior)
+            posterior.flags.writeable = False
+            self._posterior = posterior
+        return self._posterior
+
+    def eap(self):
+        if self._eap is None:
+            self._eap = REFERENCE_QUADRATURE.eap(self.posterior)
+        return self._eap
+
+class PrefixCache:
+    """LRU thread-safe berkunci prefix berurutan (item, jawaban); respons baru dilanjutkan dari prefix terpanjang
+
+    Hanya untuk grid referensi dengan prior default, karena isi cache dibagi semua peserta.
+    """
+
+    def __init__(self, max_entries=PREFIX_CACHE_MAX_ENTRIES, max_mb=PREFIX_CACHE_MAX_MB):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0           # seluruh pola respons sudah ada di cache
+        self.partial_hits = 0   # dilanjutkan dari prefix yang lebih pendek
+        self.misses = 0         # dihitung dari prior
+        self.evictions = 0
+        self.rows_saved = 0     # baris log-likelihood yang tidak perlu dijumlahkan
+
+    def _longest_prefix(self, bank_key, keys, item_bank):
+        with self._lock:
+            for n in range(len(keys), 0, -1):
+                entry = self._entries.get((bank_key, keys[:n]))
+                if entry is not None and entry.item_bank is item_bank:
+                    self._entries.move_to_end((bank_key, keys[:n]))
+                    return n, entry
+        return 0, None
+
+    @timed_phase('posterior')
+    def entry(self, indices, answers, params, item_bank=None):
+        """PrefixEntry untuk seluruh respons; hanya respons setelah prefix terpanjang yang dihitung"""
+        if item_bank is None:
+            item_bank = ITEM_BANK
+        keys = tuple(PosteriorState.response_keys(indices, answers, params))
+        bank_key = id(item_bank)  # entry juga menyimpan bank-nya, jadi id yang dipakai ulang tidak tertukar
+        n_cached, cached = self._longest_prefix(bank_key, keys, item_bank)
+        if n_cached == len(keys):
+            with self._lock:
+                self.hits += 1
+                self.rows_saved += n_cached
+            return cached
+
+        new = slice(n_cached, None)
+        log_posterior = REFERENCE_QUADRATURE.log_weights if cached is None else cached.log_posterior
+        log_posterior = log_posterior + log_likelihood_grid(
+            indices[new], answers[new], tuple(param[new] for param in params), THETA_GRID, item_bank
+        )
+        entry = PrefixEntry(item_bank, log_posterior)
+
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.partial_hits += 1
+                self.rows_saved += n_cached
+            key = (bank_key, keys)
+            if key not in self._entries:
+                self._entries[key] = entry
+                self.nbytes += entry.nbytes
+                while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                    _, evicted = self._entries.popitem(last=False)
+                    self.nbytes -= evicted.nbytes
+                    self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.partial_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'memory_mb': self.nbytes / 1024 / 1024,
+                'max_memory_mb': self.max_bytes / 1024 / 1024,
+                'hits': self.hits,
+                'partial_hits': self.partial_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'rows_saved': self.rows_saved,
+                'hit_ratio': (self.hits + self.partial_hits) / lookups if lookups else 0.0
+            }
+
+PREFIX_CACHE = PrefixCache()
+
+def uses_prefix_cache(indices, prior_mean=0.0, prior_sd=2.0, quadrature=None):
+    """Prefix cache hanya berlaku untuk grid referensi dengan prior default dan minimal satu respons"""
+    return (
+        len(indices) > 0 and prior_mean == 0.0 and prior_sd == 2.0
+        and (quadrature is None or quadrature is REFERENCE_QUADRATURE)
+    )
+
+@timed_phase('forcing')
+def forced_item(theta, available_mask, item_bank):
+    """Item b_max/b_min yang wajib diberikan pada theta ekstrem (None jika forcing tidak berlaku)"""
+    # b_max, b_min dan margin sudah dihitung saat bank di-load
+    b_max = item_bank.b_max
+    b_min = item_bank.b_min
+    margin = item_bank.margin
+
+    # Forcing logic: only if b_max/b_min item BELUM PERNAH diberikan
+    # Cek apakah item b_max / b_min sudah pernah diberikan (posisi precompute)
+    b_max_available = available_mask[item_bank.b_max_indices]
+    b_min_available = available_mask[item_bank.b_min_indices]
+    b_max_given = not b_max_available.all()
+    b_min_given = not b_min_available.all()
+
+    # Jika theta sangat tinggi dan item b_max belum pernah diberikan, paksa pilih b_max
+    if theta > b_max - margin and not b_max_given and len(b_max_available) > 0:
+        logger.info(f"Forcing b_max triggered: theta={theta:.3f} > {b_max:.3f} - {margin:.3f} = {b_max - margin:.3f}, b_max_given={b_max_given}")
+        item = item_bank.item(int(item_bank.b_max_indices[0]))
+        logger.info(f"Forcing b_max item: {item['id']} (b={item['b']:.3f}) for theta={theta:.3f}")
+        return item
+
+    # Jika theta sangat rendah dan item b_min belum pernah diberikan, paksa pilih b_min
+    if theta < b_min + margin and not b_min_given and len(b_min_available) > 0:
+        logger.info(f"Forcing b_min triggered: theta={theta:.3f} < {b_min:.3f} + {margin:.3f} = {b_min + margin:.3f}, b_min_given={b_min_given}")
+        item = item_bank.item(int(item_bank.b_min_indices[0]))
+        logger.info(f"Forcing b_min item: {item['id']} (b={item['b']:.3f}) for theta={theta:.3f}")
+        return item
+
+    return None
+
+@timed_kernel('select_mi')
+def select_next_item_mi(theta, used_item_ids, item_bank, responses=None, available_mask=None, selection_mode=None):
+    """Select next item using Maximum Fisher Information (MI) based on MAP theta
+
+    selection_mode: 'exact' atau 'ranked' (tabel ranking per bin theta), default SELECTION_MODE
+    """
     log_select_next_item()  # Log performance
     try:
-        available_items = [item for item in item_bank if item['id'] not in used_item_ids]
-        if not available_items:
+        # Bitmask ketersediaan item (True = belum dipakai)
+        if available_mask is None:
+            available_mask = item_bank.available_mask(used_item_ids)
+        if not available_mask.any():
             return None
 
-        # Get b values for forcing logic
-        b_values = np.array([item['b'] for item in item_bank])
-        b_values_valid = b_values[(b_values >= -6) & (b_values <= 6)]
-        b_max = np.max(b_values_valid) if len(b_values_valid) > 0 else 6.0
-        b_min = np.min(b_values_valid) if len(b_values_valid) > 0 else -6.0
-        margin = max(0.5, 0.1 * (b_max - b_min))
-
-        # Forcing logic: only if b_max/b_min item BELUM PERNAH diberikan
-        # Cek apakah item b_max sudah pernah diberikan
-        b_max_given = any(
-            np.isclose(item['b'], b_max, atol=0.001) and -6 <= item['b'] <= 6
-            for item in item_bank if item['id'] in used_item_ids
-        )
-        # Cek apakah item b_min sudah pernah diberikan
-        b_min_given = any(
-            np.isclose(item['b'], b_min, atol=0.001) and -6 <= item['b'] <= 6
-            for item in item_bank if item['id'] in used_item_ids
-        )
-
-        # Jika theta sangat tinggi dan item b_max belum pernah diberikan, paksa pilih b_max
-        if theta > b_max - margin and not b_max_given:
-            logger.info(f"Forcing b_max triggered: theta={theta:.3f} > {b_max:.3f} - {margin:.3f} = {b_max - margin:.3f}, b_max_given={b_max_given}")
-            for item in available_items:
-                if np.isclose(item['b'], b_max, atol=0.001) and -6 <= item['b'] <= 6:
-                    logger.info(f"Forcing b_max item: {item['id']} (b={item['b']:.3f}) for theta={theta:.3f}")
-                    return item
-
-        # Jika theta sangat rendah dan item b_min belum pernah diberikan, paksa pilih b_min
-        if theta < b_min + margin and not b_min_given:
-            logger.info(f"Forcing b_min triggered: theta={theta:.3f} < {b_min:.3f} + {margin:.3f} = {b_min + margin:.3f}, b_min_given={b_min_given}")
-            for item in available_items:
-                if np.isclose(item['b'], b_min, atol=0.001) and -6 <= item['b'] <= 6:
-                    logger.info(f"Forcing b_min item: {item['id']} (b={item['b']:.3f}) for theta={theta:.3f}")
-                    return item
+        item = forced_item(theta, available_mask, item_bank)
+        if item is not None:
+            return item
 
         # Default: pilih item dengan Maximum Fisher Information (MI) pada theta MAP
-        max_info = -1
-        best_item = None
-        for item in available_items:
-            # Calculate Fisher Information at current theta (MAP estimate)
-            info = information_3pl(theta, item['a'], item['b'], item['g'], item['u'])
-            if info > max_info:
-                max_info = info
-                best_item = item
-        
-        if best_item:
-            logger.info(f"Selected item {best_item['id']} with MI={max_info:.3f} at theta={theta:.3f}")
-        
+        with request_phase('mi'):
+            best_idx = -1
+            if (selection_mode or SELECTION_MODE) == 'ranked':
+                # Lookup ranking bin theta terdekat; -1 jika ranking yang disimpan sudah habis terpakai
+                best_idx, max_info = item_bank.ranking_table().lookup(theta, available_mask)
+            if best_idx < 0:
+                if len(item_bank) >= SELECTION_INDEX_MIN_ITEMS:
+                    # Bank besar: branch-and-bound per bucket b, hanya bucket yang bisa menang yang dievaluasi
+                    best_idx, max_info = item_bank.selection_index().argmax_information(theta, available_mask)
+                else:
+                    # Information seluruh bank dalam satu panggilan vectorized, item terpakai di-mask
+                    info = information_3pl_array(theta, item_bank.a, item_bank.b, item_bank.g, item_bank.u)
+                    info = np.where(available_mask, info, -np.inf)
+                    best_idx = int(np.argmax(info))
+                    max_info = info[best_idx]
+
+        best_item = item_bank.item(best_idx)
+        logger.info(f"Selected item {best_item['id']} with MI={max_info:.3f} at theta={theta:.3f}")
         return best_item
     except (ValueError, TypeError):
-        return available_items[0] if available_items else None
+        if available_mask is None or not available_mask.any():
+            return None
+        return item_bank.item(int(np.argmax(available_mask)))
+
+@timed_kernel('select_efi')
+def select_next_item_efi(theta, used_item_ids, item_bank, posterior, grid=None, available_mask=None):
+    """Select next item using maximum Expected Fisher Information (EFI) over the posterior
+
+    Forcing b_max/b_min sama dengan MI; posterior dipakai ulang dari langkah estimasi (grid node tetap).
+    """
+    log_select_next_item()  # Log performance
+    if available_mask is None:
+        available_mask = item_bank.available_mask(used_item_ids)
+    if not available_mask.any():
+        return None
+
+    item = forced_item(theta, available_mask, item_bank)
+    if item is not None:
+        return item
+
+    indices, efi = expected_fisher_information_batch(posterior, grid, item_bank, available_mask)
+    best = int(np.argmax(efi))
+    best_item = item_bank.item(int(indices[best]))
+    logger.info(f"Selected item {best_item['id']} with EFI={efi[best]:.3f} at theta={theta:.3f}")
+    return best_item
 
 def calculate_score(theta):
     """Menghitung skor dengan rumus (100+15) * theta berbasis IQ"""
@@ -468,47 +1941,37 @@ def calculate_score(theta):
     except (ValueError, TypeError):
         return 100.0  # Default IQ 100 jika error
 
-def check_stopping_criteria(responses, se_eap, used_item_ids, max_items=30, se_threshold=0.25):
+@timed_kernel('stopping')
+def check_stopping_criteria(responses, se_eap, used_item_ids, max_items=30, se_threshold=0.25, item_bank=None):
     """Check if test should stop based on criteria"""
     log_stopping_criteria()  # Log performance
     try:
-        # Get b values from item bank for min/max detection (filter -6 <= b <= 6)
-        b_values = np.array([item['b'] for item in ITEM_BANK])
-        b_values_valid = b_values[(b_values >= -6) & (b_values <= 6)]
-        b_max = np.max(b_values_valid) if len(b_values_valid) > 0 else 6.0
-        b_min = np.min(b_values_valid) if len(b_values_valid) > 0 else -6.0
-        
+        if item_bank is None:
+            item_bank = ITEM_BANK
+
+        # b_max/b_min (filter -6 <= b <= 6) sudah dihitung saat bank di-load
+        b_max = item_bank.b_max
+        b_min = item_bank.b_min
+
         logger.info(f"Stopping criteria check: responses={len(responses)}, se_eap={se_eap:.3f}, used_items={len(used_item_ids)}, b_max={b_max:.3f}, b_min={b_min:.3f}")
-        
+
+        resp_b = np.array([resp.get('b', 0) for resp in responses], dtype=np.float64)
+        answers = [resp.get('answer') for resp in responses]
+        resp_b_valid = (resp_b >= B_VALID_MIN) & (resp_b <= B_VALID_MAX)
+
         # Check if participant got maximum difficulty item (b_max) correct
-        b_max_responses = []
-        for resp in responses:
-            if np.isclose(resp.get('b', 0), b_max, atol=0.001) and -6 <= resp.get('b', 0) <= 6:
-                b_max_responses.append(f"item_b={resp.get('b', 0):.3f}, answer={resp.get('answer')}")
-        
-        has_b_max = any(
-            np.isclose(resp.get('b', 0), b_max, atol=0.001) and 
-            -6 <= resp.get('b', 0) <= 6 and 
-            resp.get('answer') == 1
-            for resp in responses
-        )
-        
+        at_b_max = np.flatnonzero(resp_b_valid & np.isclose(resp_b, b_max, atol=0.001)).tolist()
+        b_max_responses = [f"item_b={resp_b[i]:.3f}, answer={answers[i]}" for i in at_b_max]
+        has_b_max = any(answers[i] == 1 for i in at_b_max)
+
         # Check if participant got minimum difficulty item (b_min) incorrect
-        b_min_responses = []
-        for resp in responses:
-            if np.isclose(resp.get('b', 0), b_min, atol=0.001) and -6 <= resp.get('b', 0) <= 6:
-                b_min_responses.append(f"item_b={resp.get('b', 0):.3f}, answer={resp.get('answer')}")
-                
-        has_b_min = any(
-            np.isclose(resp.get('b', 0), b_min, atol=0.001) and 
-            -6 <= resp.get('b', 0) <= 6 and 
-            resp.get('answer') == 0
-            for resp in responses
-        )
-        
+        at_b_min = np.flatnonzero(resp_b_valid & np.isclose(resp_b, b_min, atol=0.001)).tolist()
+        b_min_responses = [f"item_b={resp_b[i]:.3f}, answer={answers[i]}" for i in at_b_min]
+        has_b_min = any(answers[i] == 0 for i in at_b_min)
+
         logger.info(f"B_max responses: {b_max_responses}, has_b_max_correct: {has_b_max}")
         logger.info(f"B_min responses: {b_min_responses}, has_b_min_incorrect: {has_b_min}")
-        
+
         # SE threshold reached (need at least 10 items)
         if len(responses) >= 10 and se_eap <= se_threshold:
             logger.info(f"Stopping: SE threshold reached ({se_eap:.3f} <= {se_threshold})")
@@ -518,8 +1981,8 @@ def check_stopping_criteria(responses, se_eap, used_item_ids, max_items=30, se_t
             logger.info(f"Stopping: Max items reached ({len(responses)} >= {max_items})")
             return True, "Mencapai maksimal 30 soal"
         # All items have been used
-        elif len(used_item_ids) >= len(ITEM_BANK):
-            logger.info(f"Stopping: All items used ({len(used_item_ids)} >= {len(ITEM_BANK)})")
+        elif len(used_item_ids) >= len(item_bank):
+            logger.info(f"Stopping: All items used ({len(used_item_ids)} >= {len(item_bank)})")
             return True, "Semua item telah digunakan"
         # Participant got maximum difficulty item correct
         elif has_b_max:
@@ -537,17 +2000,549 @@ def check_stopping_criteria(responses, se_eap, used_item_ids, max_items=30, se_t
         logger.error(f"Error in stopping criteria: {str(e)}")
         return False, "Continuing"
 
+# Server-side CAT sessions
+CAT_SESSION_TTL = 2 * 60 * 60      # Detik sejak akses terakhir sebelum sesi kedaluwarsa
+CAT_SESSION_MAX = 5000              # Sesi aktif maksimal (LRU eviction)
+# Precompute langkah berikutnya untuk jawaban 0 dan 1 selagi peserta membaca item (default per sesi)
+CAT_SPECULATE = os.environ.get('CAT_SPECULATE', '0') == '1'
+CAT_SPECULATION_WORKERS = 2         # Thread background untuk precompute spekulatif
+# Pohon keputusan awal tes (semua peserta mulai dari theta 0): jumlah level item yang di-precompute, 0 = nonaktif
+OPENING_TREE_DEPTH = int(os.environ.get('CAT_OPENING_TREE_DEPTH', '8'))
+OPENING_TREE_THETA_ATOL = 1e-6  # Toleransi theta_old vs theta node (Laravel menyimpan theta sebagai decimal:6)
+
+class CATSession:
+    """State satu sesi CAT di server: item terpakai, posterior, riwayat theta dan item yang sedang diberikan"""
+
+    def __init__(self, session_id, item_bank=None, criterion='MI', speculate=None):
+        self.session_id = session_id
+        self.item_bank = ITEM_BANK if item_bank is None else item_bank
+        self.criterion = criterion
+        self.speculate = CAT_SPECULATE if speculate is None else speculate
+        self.speculation = None  # {'item_id', 0: (cabang, payload, detik), 1: ...} untuk item yang sedang diberikan
+        self.opening_tree = None  # Pohon awal tes yang masih diikuti sesi ini
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        self.lock = threading.Lock()
+
+        self.used_mask = np.zeros(len(self.item_bank), dtype=bool)  # Bitmap item terpakai
+        self.used_item_ids = []
+        self.responses = []
+        self.posterior = PosteriorState(item_bank=self.item_bank)
+        self.theta = 0.0
+        self.se = 1.0
+        self.theta_history = []
+        self.current_item = None
+        self.completed = False
+        self.stop_reason = None
+        self.result = None
+
+    def administer(self, item):
+        """Tandai item sebagai item yang sedang diberikan (dan terpakai)"""
+        self.current_item = item
+        self.used_mask[self.item_bank.index_of(item['id'])] = True
+        self.used_item_ids.append(item['id'])
+
+    def item_payload(self, item):
+        """Item beserta P, I dan EFI pada theta sesi saat ini"""
+        probability = probability_3pl(self.theta, item['a'], item['b'], item['g'], item['u'])
+        information = information_3pl(self.theta, item['a'], item['b'], item['g'], item['u'])
+        efi = self.posterior.expected_fisher_information(item['a'], item['b'], item['g'], item['u'])
+        return {
+            'item': item,
+            'item_number': len(self.responses) + 1,
+            'probability': float(probability),
+            'information': float(information),
+            'fisher_information': float(information),
+            'expected_fisher_information': float(efi)
+        }
+
+    def start(self):
+        """Item pertama sesi (payload), dari pohon awal tes jika tersedia; None jika bank kosong"""
+        if OPENING_TREE_DEPTH > 0:
+            tree = self.item_bank.opening_tree(self.criterion)
+            node = tree.lookup(())
+            if node is not None:
+                self.adopt(node[0].fork())
+                self.opening_tree = tree
+                return dict(node[1])
+        item = self.select_next()
+        return None if item is None else self.item_payload(item)
+
+    def answer_path(self):
+        return tuple(int(response['answer']) for response in self.responses)
+
+    def select_next(self):
+        """Pilih item berikutnya (MI pada theta MAP atau EFI dari posterior sesi) dan tandai sebagai diberikan"""
+        if self.criterion == 'EFI':
+            item = select_next_item_efi(self.theta, self.used_item_ids, self.item_bank, self.posterior.posterior,
+                                        self.posterior.grid, available_mask=~self.used_mask)
+        else:
+            item = select_next_item_mi(self.theta, self.used_item_ids, self.item_bank, available_mask=~self.used_mask)
+        if item is not None:
+            self.administer(item)
+        return item
+
+    def record_response(self, answer):
+        """Tambah jawaban untuk item yang sedang diberikan lalu update theta MAP dan SE"""
+        item = self.current_item
+        response = {'id': item['id'], 'a': item['a'], 'b': item['b'], 'g': item['g'], 'u': item['u'], 'answer': answer}
+        self.responses.append(response)
+        self.posterior.add_responses([response])
+        self.current_item = None
+
+        theta_map, se_map = self.posterior.map_estimate(theta_old=self.theta)
+        self.theta = float(theta_map)
+        self.se = float(se_map)
+        self.theta_history.append(self.theta)
+
+    def finish(self, stop_reason):
+        """Skor akhir EAP dari posterior sesi"""
+        theta_eap, se_eap = self.posterior.eap_estimate()
+        self.completed = True
+        self.stop_reason = stop_reason
+        self.current_item = None
+        self.result = {
+            'test_completed': True,
+            'theta': float(theta_eap),
+            'se': float(se_eap),
+            'se_eap': float(se_eap),
+            'final_score': float(calculate_score(theta_eap)),
+            'stop_reason': stop_reason,
+            'total_items': len(self.responses),
+            'method': 'EAP'
+        }
+        return self.result
+
+    def advance(self, answer):
+        """Jawab item yang sedang diberikan: update theta, cek stopping, lalu item berikutnya atau skor akhir"""
+        theta_before = self.theta
+        self.record_response(answer)
+
+        # Stopping criteria memakai SE MAP (sama dengan alur Laravel)
+        should_stop, stop_reason = check_stopping_criteria(
+            self.responses, self.se, self.used_item_ids, item_bank=self.item_bank
+        )
+        if not should_stop:
+            item = self.select_next()
+            if item is None:
+                should_stop, stop_reason = True, 'No more items available'
+
+        if should_stop:
+            return dict(self.finish(stop_reason), session_id=self.session_id, theta_before=theta_before)
+
+        payload = self.item_payload(item)
+        payload.update({
+            'session_id': self.session_id,
+            'test_completed': False,
+            'theta': self.theta,
+            'se': self.se,
+            'theta_before': theta_before
+        })
+        return payload
+
+    def fork(self):
+        """Salinan sesi untuk menghitung satu cabang jawaban secara spekulatif"""
+        branch = CATSession.__new__(CATSession)
+        branch.__dict__.update(self.__dict__)
+        branch.lock = threading.Lock()
+        branch.speculation = None
+        branch.used_mask = self.used_mask.copy()
+        branch.used_item_ids = list(self.used_item_ids)
+        branch.responses = list(self.responses)
+        branch.posterior = self.posterior.copy()
+        branch.theta_history = list(self.theta_history)
+        return branch
+
+    def adopt(self, branch):
+        """Ambil state cabang spekulatif yang ternyata sesuai jawaban peserta"""
+        for name in ('used_mask', 'used_item_ids', 'responses', 'posterior', 'theta', 'se', 'theta_history',
+                     'current_item', 'completed', 'stop_reason', 'result'):
+            setattr(self, name, getattr(branch, name))
+
+    def speculate_next(self):
+        """Precompute advance() untuk jawaban 0 dan 1 dari item yang sedang diberikan (dipanggil dengan lock)"""
+        if self.completed or self.current_item is None:
+            return False
+        if self.opening_tree is not None and len(self.responses) + 1 < self.opening_tree.depth:
+            return False  # Kedua cabang sudah ada di pohon awal tes
+        item_id = self.current_item['id']
+        if self.speculation is not None and self.speculation['item_id'] == item_id:
+            return False
+        speculation = {'item_id': item_id}
+        for answer in (0, 1):
+            start = time.perf_counter()
+            branch = self.fork()
+            payload = branch.advance(answer)
+            speculation[answer] = (branch, payload, time.perf_counter() - start)
+        self.speculation = speculation
+        return True
+
+    def submit(self, answer, speculator=None):
+        """advance() dengan memakai pohon awal tes atau hasil spekulatif jika tersedia untuk item dan jawaban ini"""
+        if self.opening_tree is not None:
+            node = self.opening_tree.lookup(self.answer_path() + (int(answer),))
+            if node is not None:
+                self.adopt(node[0].fork())
+                return dict(node[1], session_id=self.session_id)
+            self.opening_tree = None  # Sudah keluar dari pohon
+
+        speculation, self.speculation = self.speculation, None
+        if speculation is not None and speculation['item_id'] == self.current_item['id']:
+            branch, payload, elapsed = speculation[answer]
+            self.adopt(branch)
+            if speculator is not None:
+                speculator.record_hit(elapsed)
+            return payload
+        if speculator is not None and self.speculate:
+            speculator.record_miss()
+        return self.advance(answer)
+
+    def summary(self):
+        return {
+            'session_id': self.session_id,
+            'criterion': self.criterion,
+            'theta': self.theta,
+            'se': self.se,
+            'n_responses': len(self.responses),
+            'used_items': len(self.used_item_ids),
+            'theta_history': self.theta_history,
+            'test_completed': self.completed,
+            'stop_reason': self.stop_reason
+        }
+
+class CATSessionStore:
+    """Store sesi in-process dengan TTL (sejak akses terakhir) dan LRU eviction"""
+
+    def __init__(self, ttl=CAT_SESSION_TTL, max_sessions=CAT_SESSION_MAX):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def create(self, item_bank=None, criterion='MI', speculate=None):
+        session = CATSession(f"CAT_{uuid.uuid4().hex}", item_bank, criterion, speculate)
+        with self._lock:
+            self._purge_expired(session.created_at)
+            self._sessions[session.session_id] = session
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def get(self, session_id):
+        """Sesi aktif atau None jika tidak ada / sudah kedaluwarsa"""
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if now - session.last_access > self.ttl:
+                del self._sessions[session_id]
+                self.expired += 1
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def remove(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _purge_expired(self, now):
+        # Urutan OrderedDict = urutan akses, jadi sesi kedaluwarsa selalu di depan
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access <= self.ttl:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted
+            }
+
+SESSION_STORE = CATSessionStore()
+
+class SessionSpeculator:
+    """Precompute spekulatif langkah sesi di thread background, dengan counter hit-rate dan latency yang dihemat"""
+
+    def __init__(self, workers=CAT_SPECULATION_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cat-speculate')
+        self._lock = threading.Lock()
+        self.scheduled = 0
+        self.computed = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.saved_seconds = 0.0
+
+    def schedule(self, session):
+        """Jadwalkan precompute kedua jawaban untuk item sesi yang sedang diberikan"""
+        if not session.speculate:
+            return
+        with self._lock:
+            self.scheduled += 1
+        self._executor.submit(self._run, session)
+
+    def _run(self, session):
+        try:
+            with session.lock:
+                computed = session.speculate_next()
+            if computed:
+                with self._lock:
+                    self.computed += 1
+        except Exception as e:
+            logger.error(f"Error in speculative step for {session.session_id}: {str(e)}")
+            with self._lock:
+                self.errors += 1
+
+    def record_hit(self, elapsed):
+        with self._lock:
+            self.hits += 1
+            self.saved_seconds += elapsed
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stop(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled_by_default': CAT_SPECULATE,
+                'scheduled': self.scheduled,
+                'computed': self.computed,
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_ms_total': self.saved_seconds * 1e3,
+                'saved_ms_per_hit': self.saved_seconds * 1e3 / self.hits if self.hits else 0.0
+            }
+
+SPECULATOR = SessionSpeculator()
+atexit.register(SPECULATOR.stop)
+
+def opening_tree_settings():
+    """Setting algoritma yang menentukan isi pohon awal tes (pohon dibangun ulang jika berubah)"""
+    return (
+        OPENING_TREE_DEPTH, SELECTION_MODE, RANKING_TOP_K, RANKING_BIN_WIDTH, SELECTION_INDEX_MIN_ITEMS,
+        THETA_GRID.tobytes(), PARAM_ATOL, QUADRATURE, QUADRATURE_NODES
+    )
+
+class OpeningTree:
+    """Pohon keputusan awal tes: state sesi setelah tiap jalur jawaban untuk `depth` level item pertama
+
+    Semua peserta mulai dari theta 0 dengan prior yang sama dan pemilihan item deterministik,
+    sehingga level-level awal hanya perlu lookup. Node menyimpan salinan CATSession (theta MAP, SE,
+    item berikutnya, status berhenti/skor akhir) beserta payload respons API-nya.
+    """
+
+    def __init__(self, item_bank, depth, criterion='MI', key=None):
+        start = time.perf_counter()
+        self.depth = depth
+        self.criterion = criterion
+        self.key = key
+        self.nodes = {}
+
+        root = CATSession('opening-tree', item_bank, criterion, speculate=False)
+        item = root.select_next()
+        if item is not None and depth > 0:
+            self.nodes[()] = (root, root.item_payload(item))
+
+        # Node jalur berisi L jawaban menyimpan item level L; level terakhir = depth - 1 jawaban
+        frontier = list(self.nodes)
+        for _ in range(depth - 1):
+            next_frontier = []
+            for path in frontier:
+                node = self.nodes[path][0]
+                if node.completed:
+                    continue
+                for answer in (0, 1):
+                    branch = node.fork()
+                    payload = branch.advance(answer)
+                    payload.pop('session_id', None)
+                    self.nodes[path + (answer,)] = (branch, payload)
+                    next_frontier.append(path + (answer,))
+            frontier = next_frontier
+        self.build_seconds = time.perf_counter() - start
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def lookup(self, path):
+        """(sesi node, payload) untuk jalur jawaban, None jika di luar pohon"""
+        return self.nodes.get(tuple(path))
+
+    def lookup_step(self, responses, theta_old, used_item_ids):
+        """Node untuk request /api/step yang mengikuti pohon (item, parameter, theta_old, item terpakai)
+
+        Parameter dan theta dibandingkan dengan toleransi karena Laravel mengirimnya dalam presisi 6 desimal
+        """
+        path = tuple(int(response['answer']) for response in responses)
+        if not 0 < len(path) < self.depth or len(used_item_ids) != len(path):
+            return None
+        node = self.lookup(path)
+        parent = self.lookup(path[:-1])
+        if node is None or parent is None or abs(float(theta_old) - parent[0].theta) > OPENING_TREE_THETA_ATOL:
+            return None
+        # Item dicocokkan per id lalu parameternya dengan toleransi PARAM_ATOL (sama dengan ItemBank.match_indices)
+        for response, item in zip(responses, node[0].responses):
+            if str(response.get('id')) != item['id'] or any(
+                    abs(float(response.get(param, 1.0)) - item[param]) > PARAM_ATOL for param in ('a', 'b', 'g', 'u')):
+                return None
+        if set(map(str, used_item_ids)) != {item['id'] for item in node[0].responses}:
+            return None
+        return node
+
+    def step_result(self, node, theta_old, n_used):
+        """Response /api/step dari node pohon (format sama dengan hasil komputasi langsung)"""
+        session, payload = node
+        result = {
+            'theta': float(session.theta),
+            'se': float(session.se),
+            'method': 'MAP',
+            'n_responses': len(session.responses),
+            'theta_old': float(theta_old),
+            'should_stop': session.completed,
+            'stop_reason': session.stop_reason if session.completed else 'Continuing'
+        }
+        if session.completed:
+            result['final'] = {key: session.result[key] for key in ('theta', 'se_eap', 'final_score', 'method')}
+        else:
+            result.update({key: payload[key] for key in (
+                'item', 'probability', 'information', 'fisher_information', 'expected_fisher_information')})
+            result['selection_method'] = self.criterion
+            result['available_items'] = len(session.item_bank) - n_used
+        return result
+
+    def stats(self):
+        return {
+            'criterion': self.criterion,
+            'depth': self.depth,
+            'nodes': len(self.nodes),
+            'build_ms': self.build_seconds * 1e3
+        }
+
+def build_opening_tree():
+    """Bangun pohon awal tes (kriteria MI) saat server start; tanpa ini pohon dibangun saat pertama dipakai"""
+    if OPENING_TREE_DEPTH > 0:
+        opening_tree = ITEM_BANK.opening_tree()
+        logger.info(f"✓ Precomputed opening tree: {len(opening_tree)} nodes, {OPENING_TREE_DEPTH} levels "
+                    f"({opening_tree.build_seconds * 1e3:.0f}ms)")
+
 # API Routes
+@timed_phase('parse')
+def parse_responses(responses):
+    """Validasi dan normalisasi responses (format API dan GUI); return (parsed_responses, error_message)"""
+    if not isinstance(responses, list):
+        return None, 'responses must be a list'
+    parsed_responses = []
+    for resp in responses:
+        if not isinstance(resp, dict):
+            return None, 'Each response must be an object'
+        if 'item' in resp:
+            item = resp['item']
+            if not isinstance(item, dict) or not all(key in item for key in ['a', 'b', 'g']) or 'answer' not in resp:
+                return None, 'Invalid GUI response format. Required: item.a, item.b, item.g, answer'
+            parsed_responses.append({
+                'id': item.get('id'),
+                'a': item['a'],
+                'b': item['b'],
+                'g': item['g'],
+                'u': item.get('u', 1.0),
+                'answer': resp['answer']
+            })
+        else:
+            if not all(key in resp for key in ['a', 'b', 'g', 'answer']):
+                return None, 'Invalid API response format. Required keys: a, b, g, answer'
+            parsed_responses.append({
+                'id': resp.get('id'),
+                'a': resp['a'],
+                'b': resp['b'],
+                'g': resp['g'],
+                'u': resp.get('u', 1.0),
+                'answer': resp['answer']
+            })
+    return parsed_responses, None
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    # Pohon awal tes tidak dibangun di dalam health check (None jika belum dipakai)
+    opening_tree = ITEM_BANK.opening_tree(build=False)
     return jsonify({
         'status': 'healthy',
         'version': API_VERSION,
         'timestamp': datetime.now().isoformat(),
-        'service': 'CAT Flask API'
+        'service': 'CAT Flask API',
+        'performance_log': PERFORMANCE_LOGGER.stats(),
+        'posterior_cache': POSTERIOR_CACHE.stats(),
+        'prefix_cache': PREFIX_CACHE.stats(),
+        'sessions': SESSION_STORE.stats(),
+        'speculation': SPECULATOR.stats(),
+        'opening_tree': opening_tree.stats() if opening_tree is not None else None,
+        'selection_mode': SELECTION_MODE,
+        'quadrature': QUADRATURE
     })
 
+@METRICS.collector
+def collect_cache_metrics():
+    prefix = PREFIX_CACHE.stats()
+    yield ('cat_prefix_cache_hit_ratio', 'gauge', 'Fraction of posterior lookups resumed from a cached response prefix',
+           prefix['hit_ratio'])
+    yield ('cat_prefix_cache_hits_total', 'counter', 'Lookups whose full response pattern was cached', prefix['hits'])
+    yield ('cat_prefix_cache_partial_hits_total', 'counter', 'Lookups resumed from a shorter cached prefix',
+           prefix['partial_hits'])
+    yield ('cat_prefix_cache_misses_total', 'counter', 'Lookups computed from the prior', prefix['misses'])
+    yield ('cat_prefix_cache_evictions_total', 'counter', 'Entries evicted by the entry or memory cap',
+           prefix['evictions'])
+    yield ('cat_prefix_cache_entries', 'gauge', 'Cached response prefixes', prefix['entries'])
+    yield ('cat_prefix_cache_memory_bytes', 'gauge', 'Memory held by cached posteriors',
+           prefix['memory_mb'] * 1024 * 1024)
+
+    posterior = POSTERIOR_CACHE.stats()
+    lookups = posterior['hits'] + posterior['rebuilds'] + posterior['misses']
+    yield ('cat_posterior_cache_hit_ratio', 'gauge', 'Fraction of session posterior syncs that reused the cached state',
+           posterior['hits'] / lookups if lookups else 0.0)
+    yield ('cat_posterior_cache_sessions', 'gauge', 'Sessions with a cached posterior', posterior['sessions'])
+
+    yield ('cat_speculation_hit_ratio', 'gauge', 'Fraction of session answers served from speculation',
+           SPECULATOR.stats()['hit_rate'])
+    yield ('cat_sessions_active', 'gauge', 'Stateful CAT sessions in the session store', SESSION_STORE.stats()['active'])
+
+@METRICS.collector
+def collect_process_metrics():
+    yield ('cat_item_bank_items', 'gauge', 'Items in the loaded item bank', len(ITEM_BANK))
+    process = psutil.Process()
+    cpu = process.cpu_times()
+    yield ('cat_process_resident_memory_bytes', 'gauge', 'Resident set size of the API process',
+           process.memory_info().rss)
+    yield ('cat_process_cpu_seconds_total', 'counter', 'User and system CPU time of the API process',
+           cpu.user + cpu.system)
+    yield ('cat_process_threads', 'gauge', 'Threads in the API process', process.num_threads())
+    yield ('cat_perf_log_dropped_total', 'counter', 'Performance log events dropped because the queue was full',
+           PERFORMANCE_LOGGER.dropped)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Request counter, histogram latency per route dan per kernel, cache, bank dan proses (format teks Prometheus)"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/estimate-theta', methods=['POST'])
 def estimate_theta():
     """Estimate theta using MAP method for real-time estimation during test"""
@@ -556,42 +2551,33 @@ def estimate_theta():
         data = request.get_json()
         responses = data.get('responses', [])
         theta_old = data.get('theta_old', 0.0)  # Get previous theta from request
+        map_method = data.get('method', 'grid')
         
         if not responses:
             return jsonify({'error': 'No responses provided'}), 400
+        if map_method not in MAP_METHODS:
+            return jsonify({'error': f"Invalid method '{map_method}', expected one of {list(MAP_METHODS)}"}), 400
         
         # Validate response format (support API and GUI)
-        parsed_responses = []
-        for resp in responses:
-            if 'item' in resp:
-                item = resp['item']
-                if not all(key in item for key in ['a', 'b', 'g']) or 'answer' not in resp:
-                    return jsonify({'error': 'Invalid GUI response format. Required: item.a, item.b, item.g, answer'}), 400
-                parsed_responses.append({
-                    'a': item['a'],
-                    'b': item['b'],
-                    'g': item['g'],
-                    'u': item.get('u', 1.0),
-                    'answer': resp['answer']
-                })
-            else:
-                if not all(key in resp for key in ['a', 'b', 'g', 'answer']):
-                    return jsonify({'error': 'Invalid API response format. Required keys: a, b, g, answer'}), 400
-                parsed_responses.append({
-                    'a': resp['a'],
-                    'b': resp['b'],
-                    'g': resp['g'],
-                    'u': resp.get('u', 1.0),
-                    'answer': resp['answer']
-                })
+        parsed_responses, parse_error = parse_responses(responses)
+        if parse_error:
+            return jsonify({'error': parse_error}), 400
 
         # Use MAP for real-time estimation during test
-        theta_map, se_map = estimate_theta_map(parsed_responses, theta_old=theta_old)
+        session_id = data.get('session_id')
+        if session_id:
+            # Posterior sesi di-update incremental, hanya respons baru yang dihitung
+            state = POSTERIOR_CACHE.sync(session_id, parsed_responses)
+            with state.lock:
+                theta_map, se_map = state.map_estimate(theta_old, method=map_method)
+        else:
+            theta_map, se_map = estimate_theta_map(parsed_responses, theta_old=theta_old, method=map_method)
 
         return jsonify({
             'theta': float(theta_map),
             'se': float(se_map),
             'method': 'MAP',
+            'map_method': map_method,
             'n_responses': len(parsed_responses),
             'theta_old': float(theta_old)
         })
@@ -602,19 +2588,41 @@ def estimate_theta():
 
 @app.route('/api/select-item', methods=['POST'])
 def select_item():
-    """Select next item using MI (Maximum Fisher Information) method"""
+    """Select next item using MI (Maximum Fisher Information) or EFI (Expected Fisher Information) method"""
     log_api_request('select_item')  # Log performance
     try:
         data = request.get_json()
         theta = data.get('theta', 0.0)
         used_item_ids = data.get('used_item_ids', [])
         responses = data.get('responses', [])
+        criterion = data.get('criterion', 'MI')
+        if criterion not in SELECTION_CRITERIA:
+            return jsonify({'error': f"Invalid criterion '{criterion}', expected one of {list(SELECTION_CRITERIA)}"}), 400
         
         # Get item bank
         item_bank = ITEM_BANK
+
+        # Responses format API/GUI dinormalisasi sebelum masuk posterior dan pemilihan item
+        responses, parse_error = parse_responses(responses)
+        if parse_error:
+            return jsonify({'error': parse_error}), 400
+
+        # Posterior sesi (incremental) atau posterior sekali pakai jika EFI butuh seluruh pool
+        session_id = data.get('session_id')
+        state = None
+        if session_id:
+            state = POSTERIOR_CACHE.sync(session_id, responses)
+        elif criterion == 'EFI':
+            state = PosteriorState()
+            state.add_responses(responses)
         
-        # Select next item using Maximum Fisher Information
-        next_item = select_next_item_mi(theta, used_item_ids, item_bank, responses)
+        if criterion == 'EFI':
+            # Select next item using maximum EFI over the whole available pool
+            with state.lock:
+                next_item = select_next_item_efi(theta, used_item_ids, item_bank, state.posterior, state.grid)
+        else:
+            # Select next item using Maximum Fisher Information
+            next_item = select_next_item_mi(theta, used_item_ids, item_bank, responses)
         
         if not next_item:
             return jsonify({'error': 'No items available'}), 404
@@ -622,7 +2630,11 @@ def select_item():
         # Calculate probability, information, and EFI (for compatibility)
         probability = probability_3pl(theta, next_item['a'], next_item['b'], next_item['g'], next_item['u'])
         information = information_3pl(theta, next_item['a'], next_item['b'], next_item['g'], next_item['u'])
-        efi = expected_fisher_information(next_item['a'], next_item['b'], next_item['g'], next_item['u'], responses)
+        if state is not None:
+            with state.lock:
+                efi = state.expected_fisher_information(next_item['a'], next_item['b'], next_item['g'], next_item['u'])
+        else:
+            efi = expected_fisher_information(next_item['a'], next_item['b'], next_item['g'], next_item['u'], responses)
         
         return jsonify({
             'item': next_item,
@@ -630,7 +2642,7 @@ def select_item():
             'information': float(information),
             'fisher_information': float(information),  # MI = Fisher Information at theta
             'expected_fisher_information': float(efi),  # Keep for compatibility
-            'method': 'MI',
+            'method': criterion,
             'available_items': len(item_bank) - len(used_item_ids)
         })
         
@@ -638,6 +2650,57 @@ def select_item():
         logger.error(f"Error in select_item: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/expected-information', methods=['POST'])
+def expected_information_pool():
+    """EFI seluruh item tersedia dalam satu perkalian matriks-vektor (diagnostik pemilihan item)"""
+    log_api_request('expected_information')  # Log performance
+    try:
+        data = request.get_json()
+        responses = data.get('responses', [])
+        used_item_ids = data.get('used_item_ids', [])
+        theta = data.get('theta')
+        top = data.get('top')
+
+        if top is not None and (not isinstance(top, int) or isinstance(top, bool) or top < 0):
+            return jsonify({'error': 'top must be a non-negative integer'}), 400
+        parsed_responses, parse_error = parse_responses(responses)
+        if parse_error:
+            return jsonify({'error': parse_error}), 400
+
+        # Posterior dari langkah estimasi sesi jika ada, selain itu dihitung sekali untuk seluruh pool
+        session_id = data.get('session_id')
+        if session_id:
+            state = POSTERIOR_CACHE.sync(session_id, parsed_responses)
+        else:
+            state = PosteriorState()
+            state.add_responses(parsed_responses)
+
+        with state.lock:
+            indices, efi = state.expected_fisher_information_batch(ITEM_BANK.available_mask(used_item_ids))
+
+        # Urut EFI menurun (seri ke posisi bank terkecil)
+        order = np.argsort(-efi, kind='stable')
+        if top is not None:
+            order = order[:top]
+        items = []
+        for k in order.tolist():
+            item = dict(ITEM_BANK.item(int(indices[k])))
+            item['expected_fisher_information'] = float(efi[k])
+            if theta is not None:
+                item['information'] = float(information_3pl(theta, item['a'], item['b'], item['g'], item['u']))
+            items.append(item)
+
+        return jsonify({
+            'items': items,
+            'n_responses': len(parsed_responses),
+            'available_items': len(indices),
+            'method': 'EFI'
+        })
+
+    except Exception as e:
+        logger.error(f"Error in expected_information_pool: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/calculate-score', methods=['POST'])
 def calculate_score_endpoint():
     """Calculate score from theta"""
@@ -700,8 +2763,8 @@ def debug_stopping():
         test_scenarios = []
         
         # Scenario 1: High theta user with b_max item answered correctly
-        if ITEM_BANK:
-            b_max_item = max(ITEM_BANK, key=lambda x: x['b'])
+        if len(ITEM_BANK) > 0:
+            b_max_item = ITEM_BANK.item(int(np.argmax(ITEM_BANK.b)))
             test_responses_high = [
                 {
                     'a': b_max_item['a'],
@@ -719,7 +2782,7 @@ def debug_stopping():
             })
             
             # Scenario 2: Low theta user with b_min item answered incorrectly  
-            b_min_item = min(ITEM_BANK, key=lambda x: x['b'])
+            b_min_item = ITEM_BANK.item(int(np.argmin(ITEM_BANK.b)))
             test_responses_low = [
                 {
                     'a': b_min_item['a'],
@@ -759,8 +2822,11 @@ def debug_stopping():
         return jsonify({
             'item_bank_info': {
                 'total_items': len(ITEM_BANK),
-                'b_max': max(item['b'] for item in ITEM_BANK) if ITEM_BANK else None,
-                'b_min': min(item['b'] for item in ITEM_BANK) if ITEM_BANK else None
+                'b_max': float(np.max(ITEM_BANK.b)) if len(ITEM_BANK) > 0 else None,
+                'b_min': float(np.min(ITEM_BANK.b)) if len(ITEM_BANK) > 0 else None,
+                'b_max_valid': ITEM_BANK.b_max,
+                'b_min_valid': ITEM_BANK.b_min,
+                'margin': ITEM_BANK.margin
             },
             'test_scenarios': test_scenarios,
             'debug_info': 'Use this endpoint to test stopping criteria logic'
@@ -775,11 +2841,11 @@ def get_item_bank():
     """Get item bank information"""
     try:
         return jsonify({
-            'items': ITEM_BANK,
+            'items': ITEM_BANK.records,
             'count': len(ITEM_BANK),
             'parameters': ['a', 'b', 'g', 'u'],
             'model': '3PL',
-            'source': 'Parameter_Item_IST.csv'
+            'source': ITEM_BANK.source
         })
         
     except Exception as e:
@@ -798,32 +2864,20 @@ def final_score():
             return jsonify({'error': 'No responses provided'}), 400
         
         # Validate response format (support API and GUI)
-        parsed_responses = []
-        for resp in responses:
-            if 'item' in resp:
-                item = resp['item']
-                if not all(key in item for key in ['a', 'b', 'g']) or 'answer' not in resp:
-                    return jsonify({'error': 'Invalid GUI response format. Required: item.a, item.b, item.g, answer'}), 400
-                parsed_responses.append({
-                    'a': item['a'],
-                    'b': item['b'],
-                    'g': item['g'],
-                    'u': item.get('u', 1.0),
-                    'answer': resp['answer']
-                })
-            else:
-                if not all(key in resp for key in ['a', 'b', 'g', 'answer']):
-                    return jsonify({'error': 'Invalid API response format. Required keys: a, b, g, answer'}), 400
-                parsed_responses.append({
-                    'a': resp['a'],
-                    'b': resp['b'],
-                    'g': resp['g'],
-                    'u': resp.get('u', 1.0),
-                    'answer': resp['answer']
-                })
+        parsed_responses, parse_error = parse_responses(responses)
+        if parse_error:
+            return jsonify({'error': parse_error}), 400
 
         # Use EAP for final scoring
-        theta_eap, se_eap = estimate_theta_eap(parsed_responses)
+        session_id = data.get('session_id')
+        if session_id:
+            state = POSTERIOR_CACHE.sync(session_id, parsed_responses)
+            with state.lock:
+                theta_eap, se_eap = state.eap_estimate()
+            # Tes selesai, state posterior sesi tidak dibutuhkan lagi
+            POSTERIOR_CACHE.discard(session_id)
+        else:
+            theta_eap, se_eap = estimate_theta_eap(parsed_responses)
         
         # Calculate final score
         final_score = calculate_score(theta_eap)
@@ -840,11 +2894,104 @@ def final_score():
         logger.error(f"Error in final_score: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def parse_batch_examinees(data, item_bank=None):
+    """Response matrix gabungan dari request batch; return ((indices, answers, params, lengths, ids), error_message)
+
+    Format 'examinees' (list responses per peserta, format API/GUI) atau format ringkas
+    'item_ids' + 'answers' (flat) + 'lengths' (jumlah respons per peserta, berurutan).
+    """
+    if item_bank is None:
+        item_bank = ITEM_BANK
+    if not isinstance(data, dict):
+        return None, 'Request body must be a JSON object'
+
+    if 'examinees' in data:
+        examinees = data['examinees']
+        if not isinstance(examinees, list) or not examinees:
+            return None, 'examinees must be a non-empty list'
+        responses, lengths, ids = [], [], []
+        for k, examinee in enumerate(examinees):
+            if not isinstance(examinee, (list, dict)):
+                return None, f'Examinee {k}: must be a list of responses or an object with responses'
+            examinee_responses = examinee if isinstance(examinee, list) else examinee.get('responses', [])
+            if not isinstance(examinee_responses, list):
+                return None, f'Examinee {k}: responses must be a list'
+            parsed, parse_error = parse_responses(examinee_responses)
+            if parse_error:
+                return None, f'Examinee {k}: {parse_error}'
+            responses.extend(parsed)
+            lengths.append(len(parsed))
+            ids.append(examinee.get('id') if isinstance(examinee, dict) else None)
+        indices, answers, params = response_matrix(responses, item_bank)
+        return (indices, answers, params, np.array(lengths, dtype=np.intp), ids), None
+
+    if not all(key in data for key in ['item_ids', 'answers', 'lengths']):
+        return None, 'Provide either examinees or item_ids, answers and lengths'
+    item_ids, answers, lengths, ids = data['item_ids'], data['answers'], data['lengths'], data.get('ids')
+    if not all(isinstance(field, list) for field in (item_ids, answers, lengths)):
+        return None, 'item_ids, answers and lengths must be lists'
+    if not all(isinstance(n, int) and not isinstance(n, bool) and n >= 0 for n in lengths):
+        return None, 'lengths must be non-negative integers'
+    if not all(isinstance(answer, int) and not isinstance(answer, bool) and answer in (0, 1) for answer in answers):
+        return None, 'answers must be 0 or 1'
+    if ids is not None and not isinstance(ids, list):
+        return None, 'ids must be a list'
+    if len(item_ids) != len(answers) or sum(lengths) != len(item_ids):
+        return None, 'item_ids and answers must have the same length, equal to sum(lengths)'
+    indices = np.fromiter((item_bank.id_to_index.get(str(item_id), -1) for item_id in item_ids),
+                          dtype=np.intp, count=len(item_ids))
+    missing = np.flatnonzero(indices < 0)
+    if len(missing) > 0:
+        return None, f'Unknown item id: {item_ids[missing[0]]}'
+    answers = np.fromiter((answer == 1 for answer in answers), dtype=bool, count=len(answers))
+    params = tuple(param[indices] for param in (item_bank.a, item_bank.b, item_bank.g, item_bank.u))
+    return (indices, answers, params, np.array(lengths, dtype=np.intp), ids), None
+
+@app.route('/api/final-score/batch', methods=['POST'])
+def final_score_batch():
+    """Final score EAP banyak peserta dalam satu request (rescoring massal)"""
+    log_api_request('final_score_batch')  # Log performance
+    try:
+        data = request.get_json()
+        parsed, parse_error = parse_batch_examinees(data)
+        if parse_error:
+            return jsonify({'error': parse_error}), 400
+        indices, answers, params, lengths, ids = parsed
+
+        thetas, ses = estimate_theta_eap_batch(indices, answers, params, lengths)
+
+        results = []
+        for k, (theta_eap, se_eap) in enumerate(zip(thetas, ses)):
+            result = {'index': k}
+            if ids is not None and k < len(ids) and ids[k] is not None:
+                result['id'] = ids[k]
+            if lengths[k] == 0:
+                result['error'] = 'No responses provided'
+            else:
+                result.update({
+                    'theta': float(theta_eap),
+                    'se_eap': float(se_eap),
+                    'final_score': float(calculate_score(theta_eap)),
+                    'n_responses': int(lengths[k])
+                })
+            results.append(result)
+
+        return jsonify({
+            'results': results,
+            'n_examinees': len(results),
+            'method': 'EAP',
+            'quadrature': QUADRATURE
+        })
+
+    except Exception as e:
+        logger.error(f"Error in final_score_batch: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/test-calculation', methods=['POST'])
 def test_calculation():
     """Test endpoint for debugging calculations"""
     try:
-        if not ITEM_BANK:
+        if len(ITEM_BANK) == 0:
             return jsonify({'error': 'No items loaded from CSV file'}), 400
             
         data = request.get_json()
@@ -914,6 +3061,236 @@ def test_calculation():
         logger.error(f"Error in test_calculation: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/step', methods=['POST'])
+def cat_step():
+    """Satu langkah CAT dalam satu request: MAP theta/SE, stopping criteria, lalu item berikutnya atau skor akhir EAP"""
+    log_api_request('step')  # Log performance
+    try:
+        data = request.get_json()
+        responses = data.get('responses', [])
+        theta_old = data.get('theta_old', 0.0)
+        used_item_ids = data.get('used_item_ids', [])
+        max_items = data.get('max_items', 30)
+        se_threshold = data.get('se_threshold', 0.25)
+        session_id = data.get('session_id')
+        criterion = data.get('criterion', 'MI')
+
+        if not responses:
+            return jsonify({'error': 'No responses provided'}), 400
+        if criterion not in SELECTION_CRITERIA:
+            return jsonify({'error': f"Invalid criterion '{criterion}', expected one of {list(SELECTION_CRITERIA)}"}), 400
+
+        # Parse responses sekali untuk semua tahap
+        parsed_responses, parse_error = parse_responses(responses)
+        if parse_error:
+            return jsonify({'error': parse_error}), 400
+
+        # Langkah awal tes yang persis mengikuti pohon keputusan: lookup tanpa komputasi
+        if OPENING_TREE_DEPTH > 0 and max_items == 30 and se_threshold == 0.25:
+            tree = ITEM_BANK.opening_tree(criterion)
+            node = tree.lookup_step(parsed_responses, theta_old, used_item_ids)
+            if node is not None:
+                if session_id:
+                    if node[0].completed:
+                        POSTERIOR_CACHE.discard(session_id)
+                    else:
+                        # Posterior node disalin ke cache supaya langkah setelah pohon tetap incremental
+                        POSTERIOR_CACHE.store(session_id, node[0].posterior.copy())
+                return jsonify(tree.step_result(node, theta_old, len(used_item_ids)))
+
+        # Posterior dihitung sekali (atau di-update incremental jika ada session_id)
+        if session_id:
+            state = POSTERIOR_CACHE.sync(session_id, parsed_responses)
+        else:
+            state = PosteriorState()
+            state.add_responses(parsed_responses)
+
+        with state.lock:
+            # 1. MAP theta dan SE
+            theta_map, se_map = state.map_estimate(theta_old)
+
+            result = {
+                'theta': float(theta_map),
+                'se': float(se_map),
+                'method': 'MAP',
+                'n_responses': len(parsed_responses),
+                'theta_old': float(theta_old)
+            }
+
+            # 2. Stopping criteria (memakai SE MAP, sama dengan /api/stopping-criteria)
+            should_stop, stop_reason = check_stopping_criteria(
+                parsed_responses, se_map, used_item_ids, max_items, se_threshold
+            )
+
+            # 3. Item berikutnya (MI pada theta MAP, atau EFI dari posterior yang sama)
+            next_item = None
+            if not should_stop:
+                if criterion == 'EFI':
+                    next_item = select_next_item_efi(theta_map, used_item_ids, ITEM_BANK, state.posterior, state.grid)
+                else:
+                    next_item = select_next_item_mi(theta_map, used_item_ids, ITEM_BANK)
+                if next_item is None:
+                    should_stop, stop_reason = True, 'No more items available'
+
+            result['should_stop'] = should_stop
+            result['stop_reason'] = stop_reason
+
+            if should_stop:
+                # 4. Skor akhir EAP dari posterior yang sama
+                theta_eap, se_eap = state.eap_estimate()
+                result['final'] = {
+                    'theta': float(theta_eap),
+                    'se_eap': float(se_eap),
+                    'final_score': float(calculate_score(theta_eap)),
+                    'method': 'EAP'
+                }
+            else:
+                probability = probability_3pl(theta_map, next_item['a'], next_item['b'], next_item['g'], next_item['u'])
+                information = information_3pl(theta_map, next_item['a'], next_item['b'], next_item['g'], next_item['u'])
+                efi = state.expected_fisher_information(next_item['a'], next_item['b'], next_item['g'], next_item['u'])
+                result.update({
+                    'item': next_item,
+                    'probability': float(probability),
+                    'information': float(information),
+                    'fisher_information': float(information),
+                    'expected_fisher_information': float(efi),
+                    'selection_method': criterion,
+                    'available_items': len(ITEM_BANK) - len(used_item_ids)
+                })
+
+        if should_stop and session_id:
+            POSTERIOR_CACHE.discard(session_id)
+
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Error in cat_step: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/session', methods=['POST'])
+def create_session():
+    """Create CAT session di server dan kembalikan item pertama"""
+    log_api_request('create_session')  # Log performance
+    try:
+        data = request.get_json(silent=True) or {}
+        criterion = data.get('criterion', 'MI')
+        if criterion not in SELECTION_CRITERIA:
+            return jsonify({'error': f"Invalid criterion '{criterion}', expected one of {list(SELECTION_CRITERIA)}"}), 400
+
+        speculate = data.get('speculate')
+        session = SESSION_STORE.create(criterion=criterion, speculate=None if speculate is None else bool(speculate))
+        with session.lock:
+            payload = session.start()
+            if payload is None:
+                SESSION_STORE.remove(session.session_id)
+                return jsonify({'error': 'No items available'}), 404
+
+            payload.update({
+                'session_id': session.session_id,
+                'test_completed': False,
+                'theta': session.theta,
+                'se': session.se,
+                'expires_in': SESSION_STORE.ttl
+            })
+        SPECULATOR.schedule(session)
+        return jsonify(payload)
+
+    except Exception as e:
+        logger.error(f"Error in create_session: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/session/<session_id>/response', methods=['POST'])
+def submit_session_response(session_id):
+    """Submit satu jawaban (item_id, answer); kembalikan item berikutnya atau skor akhir"""
+    log_api_request('submit_session_response')  # Log performance
+    try:
+        session = SESSION_STORE.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found or expired'}), 404
+
+        data = request.get_json()
+        item_id = data.get('item_id')
+        answer = data.get('answer')
+        if answer not in (0, 1):
+            return jsonify({'error': 'Invalid answer. Required: 0 or 1'}), 400
+
+        with session.lock:
+            if session.completed:
+                return jsonify({'error': 'Test already completed'}), 409
+            if session.current_item is None or str(item_id) != session.current_item['id']:
+                return jsonify({'error': 'item_id is not the item currently administered'}), 409
+
+            # Cache hit jika kedua cabang jawaban sudah di-precompute selagi item dibaca
+            payload = session.submit(answer, SPECULATOR)
+            completed = session.completed
+
+        if not completed:
+            SPECULATOR.schedule(session)
+        return jsonify(payload)
+
+    except Exception as e:
+        logger.error(f"Error in submit_session_response: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/session/<session_id>/next-item', methods=['GET'])
+def get_session_next_item(session_id):
+    """Item yang sedang diberikan untuk sesi (dipilih jika belum ada)"""
+    log_api_request('session_next_item')  # Log performance
+    try:
+        session = SESSION_STORE.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found or expired'}), 404
+
+        with session.lock:
+            if session.completed:
+                return jsonify(dict(session.result, session_id=session_id))
+
+            item = session.current_item
+            if item is None:
+                item = session.select_next()
+                if item is None:
+                    return jsonify({'error': 'No items available'}), 404
+
+            payload = session.item_payload(item)
+            payload.update({
+                'session_id': session_id,
+                'test_completed': False,
+                'theta': session.theta,
+                'se': session.se
+            })
+        SPECULATOR.schedule(session)
+        return jsonify(payload)
+
+    except Exception as e:
+        logger.error(f"Error in get_session_next_item: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/session/<session_id>/finish', methods=['POST'])
+def finish_session(session_id):
+    """Akhiri sesi dan hitung skor akhir EAP; sesi dihapus dari store"""
+    log_final_scoring()  # Log performance
+    try:
+        session = SESSION_STORE.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found or expired'}), 404
+
+        with session.lock:
+            if not session.responses:
+                return jsonify({'error': 'No responses provided'}), 400
+
+            result = session.result
+            if not session.completed:
+                data = request.get_json(silent=True) or {}
+                result = session.finish(data.get('reason', 'Finished by client'))
+            summary = session.summary()
+
+        SESSION_STORE.remove(session_id)
+        return jsonify(dict(result, session_id=session_id, theta_history=summary['theta_history']))
+
+    except Exception as e:
+        logger.error(f"Error in finish_session: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -924,18 +3301,27 @@ def internal_error(error):
 
 if __name__ == '__main__':
     log_start_cat()  # Log start CAT system
+    build_opening_tree()
     logger.info(f"Starting CAT Flask API Server v{API_VERSION}")
     logger.info(f"Server will run at: http://{HOST}:{PORT}")
     logger.info(f"Item bank loaded: {len(ITEM_BANK)} items")
     logger.info("Available endpoints:")
     logger.info("  GET  /health - Health check")
+    logger.info("  GET  /metrics - Cache hit ratios (Prometheus text format)")
     logger.info("  POST /api/estimate-theta - Estimate theta using MAP (real-time)")
-    logger.info("  POST /api/select-item - Select next item using MI")
+    logger.info("  POST /api/select-item - Select next item using MI (or EFI)")
+    logger.info("  POST /api/expected-information - EFI of every available item (diagnostics)")
     logger.info("  POST /api/calculate-score - Calculate score from theta")
     logger.info("  POST /api/final-score - Calculate final score using EAP")
+    logger.info("  POST /api/final-score/batch - Final score EAP for many examinees")
     logger.info("  POST /api/stopping-criteria - Check stopping criteria")
     logger.info("  GET  /api/item-bank - Get item bank information")
     logger.info("  POST /api/test-calculation - Test calculation endpoint")
+    logger.info("  POST /api/step - Estimate, stopping check and next item / final score in one call")
+    logger.info("  POST /api/session - Create server-side CAT session")
+    logger.info("  POST /api/session/<id>/response - Submit one answer, get next item or final score")
+    logger.info("  GET  /api/session/<id>/next-item - Current item of a session")
+    logger.info("  POST /api/session/<id>/finish - Finish session (EAP final score)")
     
     try:
         app.run(
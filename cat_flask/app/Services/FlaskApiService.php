@@ -33,10 +33,13 @@ public function __construct()
      *   - API format: [{'a': 1.5, 'b': -1.0, 'g': 0.2, 'answer': 1}, ...]
      *   - GUI format: [{'item': {'a': 1.5, 'b': -1.0, 'g': 0.2}, 'answer': 1}, ...]
      * 
+     * @param float $thetaOld Theta sebelumnya (untuk batas perubahan MAP)
+     * @param string|null $sessionId Optional: session ID agar Flask meng-update posterior sesi secara incremental
+     * 
      * @return array ['theta' => float, 'se_eap' => float, 'num_responses' => int]
      * @throws Exception
      */
-    public function estimateTheta(array $responses, float $thetaOld = 0.0): array
+    public function estimateTheta(array $responses, float $thetaOld = 0.0, ?string $sessionId = null): array
     {
         try {
             Log::info('FlaskApiService::estimateTheta POST', [
@@ -48,7 +51,8 @@ public function estimateTheta(array $responses, float $thetaOld = 0.0): array
             $response = Http::timeout($this->timeout)
                 ->post($this->baseUrl . '/api/estimate-theta', [
                     'responses' => $responses,
-                    'theta_old' => $thetaOld
+                    'theta_old' => $thetaOld,
+                    'session_id' => $sessionId
                 ]);
 
             if ($response->failed()) {
@@ -83,18 +87,20 @@ public function estimateTheta(array $responses, float $thetaOld = 0.0): array
      * @param float $theta Current theta estimate
      * @param array $usedItemIds Array of used item IDs
      * @param array $responses Optional: responses untuk better EFI calculation
+     * @param string|null $sessionId Optional: session ID untuk memakai posterior sesi di Flask
      * 
      * @return array ['item' => array, 'probability' => float, 'fisher_information' => float, 'expected_fisher_information' => float]
      * @throws Exception
      */
-    public function selectNextItem(float $theta, array $usedItemIds, array $responses = []): array
+    public function selectNextItem(float $theta, array $usedItemIds, array $responses = [], ?string $sessionId = null): array
     {
         try {
             $response = Http::timeout($this->timeout)
                 ->post($this->baseUrl . '/api/select-item', [
                     'theta' => $theta,
                     'used_item_ids' => $usedItemIds,
-                    'responses' => $responses
+                    'responses' => $responses,
+                    'session_id' => $sessionId
                 ]);
 
             if ($response->failed()) {
@@ -169,10 +175,11 @@ public function calculateScore(float $theta): array
      * Kalkulasi skor akhir menggunakan EAP dari semua responses
      * 
      * @param array $responses Array responses untuk EAP final scoring
+     * @param string|null $sessionId Optional: session ID untuk memakai (lalu membuang) posterior sesi di Flask
      * @return array ['theta' => float, 'se_eap' => float, 'final_score' => float, 'method' => string]
      * @throws Exception
      */
-    public function calculateFinalScore(array $responses): array
+    public function calculateFinalScore(array $responses, ?string $sessionId = null): array
     {
         try {
             // Validate input
@@ -187,7 +194,8 @@ public function calculateFinalScore(array $responses): array
 
             $response = Http::timeout($this->timeout)
                 ->post($this->baseUrl . '/api/final-score', [
-                    'responses' => $responses
+                    'responses' => $responses,
+                    'session_id' => $sessionId
                 ]);
 
             if ($response->failed()) {
@@ -314,11 +322,12 @@ public function healthCheck(): array
      * Konversi TestResponse ke format Flask API
      * 
      * @param \App\Models\TestResponse $response
-     * @return array Format API: ['a' => float, 'b' => float, 'g' => float, 'answer' => int]
+     * @return array Format API: ['id' => string, 'a' => float, 'b' => float, 'g' => float, 'answer' => int]
      */
     public function convertResponseToApiFormat($response): array
     {
         return [
+            'id' => (string) $response->item_id,  // Flask memakai id untuk lookup tabel precompute
             'a' => (float) $response->item->a,
             'b' => (float) $response->item->b,
             'g' => (float) $response->item->g,
@@ -355,16 +364,26 @@ public function testConnection(): bool
     }
 
     /**
-     * DEPRECATED: Single API call untuk semua perhitungan CAT
-     * Method ini tidak digunakan karena endpoint /process-response tidak ada di Flask API
+     * Satu langkah CAT dalam satu request ke /api/step:
+     * estimasi MAP, cek kriteria penghentian, lalu item berikutnya atau skor akhir EAP
+     * 
+     * @param array $responses Semua responses (format API)
+     * @param float $thetaOld Theta sebelumnya (untuk batas perubahan MAP)
+     * @param array $usedItemIds Array of used item IDs
+     * @param string|null $sessionId Optional: session ID untuk posterior incremental di Flask
+     * 
+     * @return array ['theta', 'se', 'should_stop', 'stop_reason', dan 'final' (jika berhenti)
+     *               atau 'item', 'probability', 'fisher_information', 'expected_fisher_information']
+     * @throws Exception
      */
-    /*
-    public function processResponse(array $responses, string $sessionId): array
+    public function processStep(array $responses, float $thetaOld, array $usedItemIds, ?string $sessionId = null): array
     {
         try {
             $response = Http::timeout($this->timeout)
-                ->post($this->baseUrl . '/process-response', [
+                ->post($this->baseUrl . '/api/step', [
                     'responses' => $responses,
+                    'theta_old' => $thetaOld,
+                    'used_item_ids' => $usedItemIds,
                     'session_id' => $sessionId
                 ]);
 
@@ -373,20 +392,53 @@ public function processResponse(array $responses, string $sessionId): array
             }
 
             $data = $response->json();
-            
-            Log::info('Flask API processResponse', [
+
+            // Validasi response
+            if (!isset($data['theta']) || !isset($data['se']) || !isset($data['should_stop'])) {
+                throw new Exception('Invalid response from Flask API: missing theta, se or should_stop');
+            }
+            if ($data['should_stop'] && !isset($data['final'])) {
+                throw new Exception('Invalid response from Flask API: missing final score');
+            }
+            if (!$data['should_stop'] && !isset($data['item'])) {
+                throw new Exception('Invalid response from Flask API: missing item');
+            }
+
+            Log::info('FlaskApiService::processStep', [
                 'session_id' => $sessionId,
                 'responses_count' => count($responses),
                 'theta' => $data['theta'],
-                'se_eap' => $data['se_eap'],
+                'se' => $data['se'],
                 'should_stop' => $data['should_stop'],
                 'stop_reason' => $data['stop_reason'] ?? null
             ]);
 
-            return $data;
+            $result = [
+                'theta' => (float) $data['theta'],
+                'se' => (float) $data['se'],
+                'method' => (string) ($data['method'] ?? 'MAP'),
+                'should_stop' => (bool) $data['should_stop'],
+                'stop_reason' => (string) ($data['stop_reason'] ?? '')
+            ];
+
+            if ($result['should_stop']) {
+                $result['final'] = [
+                    'theta' => (float) $data['final']['theta'],
+                    'se_eap' => (float) $data['final']['se_eap'],
+                    'final_score' => (float) $data['final']['final_score'],
+                    'method' => (string) ($data['final']['method'] ?? 'EAP')
+                ];
+            } else {
+                $result['item'] = $data['item'];
+                $result['probability'] = (float) ($data['probability'] ?? 0);
+                $result['fisher_information'] = (float) ($data['fisher_information'] ?? 0);
+                $result['expected_fisher_information'] = (float) ($data['expected_fisher_information'] ?? 0);
+            }
+
+            return $result;
             
         } catch (Exception $e) {
-            Log::error('FlaskApiService::processResponse failed', [
+            Log::error('FlaskApiService::processStep failed', [
                 'error' => $e->getMessage(),
                 'session_id' => $sessionId,
                 'responses_count' => count($responses)
@@ -394,5 +446,4 @@ public function processResponse(array $responses, string $sessionId): array
             throw $e;
         }
     }
-    */
 }
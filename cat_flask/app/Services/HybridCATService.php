@@ -157,18 +157,21 @@ public function submitResponse(string $sessionId, string $itemId, int $answer):
                 ->orderBy('item_order')
                 ->get();
 
+            // Get used items
+            $usedItems = UsedItem::where('session_id', $sessionId)->pluck('item_id')->toArray();
+
             $this->performanceMonitor->logEstimateThetaMAP();
             
-            // Estimate new theta and SE using MAP for real-time estimation via Flask API
+            // Satu request ke Flask API: MAP theta/SE, stopping criteria, lalu item berikutnya atau skor akhir EAP
             $flaskResponses = $this->flaskApi->convertResponsesToApiFormat($responses);
-            $thetaData = $this->flaskApi->estimateTheta($flaskResponses, $session->theta);
-            $newTheta = $thetaData['theta'];
-            $newSE = $thetaData['se'];
+            $stepData = $this->flaskApi->processStep($flaskResponses, $session->theta, $usedItems, $sessionId);
+            $newTheta = $stepData['theta'];
+            $newSE = $stepData['se'];
             
             Log::info('MAP estimation (real-time)', [
                 'theta_map' => $newTheta,
                 'se_map' => $newSE,
-                'method' => $thetaData['method']
+                'method' => $stepData['method']
             ]);
 
             $this->performanceMonitor->logCustomProcess('update_session_data');
@@ -187,15 +190,10 @@ public function submitResponse(string $sessionId, string $itemId, int $answer):
                 'standard_error' => $newSE
             ]);
 
-            // Get used items
-            $usedItems = UsedItem::where('session_id', $sessionId)->pluck('item_id')->toArray();
-            
             $this->performanceMonitor->logCustomProcess('check_stopping_criteria');
             
-            // Check if test should stop via Flask API
-            $stopData = $this->flaskApi->checkStoppingCriteria($flaskResponses, $newSE, $usedItems);
-            $shouldStop = $stopData['should_stop'];
-            $stopReason = $stopData['reason'];
+            $shouldStop = $stepData['should_stop'];
+            $stopReason = $stepData['stop_reason'];
             
             Log::info('Stopping criteria check', [
                 'map_se' => $newSE,
@@ -206,8 +204,8 @@ public function submitResponse(string $sessionId, string $itemId, int $answer):
             if ($shouldStop) {
                 $this->performanceMonitor->logCustomProcess('calculate_final_score');
                 
-                // Use EAP for final scoring via Flask API
-                $finalScoreData = $this->flaskApi->calculateFinalScore($flaskResponses);
+                // EAP final scoring sudah dihitung Flask API dalam langkah yang sama
+                $finalScoreData = $stepData['final'];
                 $finalTheta = $finalScoreData['theta'];
                 $finalSE = $finalScoreData['se_eap'];
                 $finalScore = $finalScoreData['final_score'];
@@ -242,17 +240,17 @@ public function submitResponse(string $sessionId, string $itemId, int $answer):
                 ];
             }
 
-            // Get next item via Flask API
+            // Next item sudah dipilih Flask API dalam langkah yang sama
             $this->performanceMonitor->logSelectNextItem();
             
-            $itemData = $this->flaskApi->selectNextItem($newTheta, $usedItems, $flaskResponses);
+            $itemData = $stepData;
             $nextItem = ItemParameter::find($itemData['item']['id']);
             
             if (!$nextItem) {
                 // No more items available - calculate final score using EAP
                 $this->performanceMonitor->logCustomProcess('no_more_items_final_score');
                 
-                $finalScoreData = $this->flaskApi->calculateFinalScore($flaskResponses);
+                $finalScoreData = $this->flaskApi->calculateFinalScore($flaskResponses, $sessionId);
                 $finalTheta = $finalScoreData['theta'];
                 $finalSE = $finalScoreData['se_eap'];
                 $finalScore = $finalScoreData['final_score'];
@@ -0,0 +1,50 @@
+"""
+Helper bersama untuk tool offline (rescore.py, simulate.py, loadgen.py, benchmarks/) dan tests/
+Import cat_api dari folder mana pun: item bank CSV dicari relatif terhadap repo, dan log performa
+serta logging INFO dialihkan sebelum import supaya cat_api.log di folder kerja tidak tersentuh
+"""
+
+import logging
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_CANDIDATES = [
+    os.path.join(ROOT_DIR, 'Parameter_Item_IST.csv'),
+    os.path.join(ROOT_DIR, 'cat_flask', 'Parameter_Item_IST.csv'),
+]
+
+
+def resolve_item_bank_csv():
+    """Set CAT_ITEM_BANK_CSV ke CSV item bank yang ada jika belum diset (folder kerja, root repo, cat_flask/)"""
+    if 'CAT_ITEM_BANK_CSV' not in os.environ:
+        for path in ['Parameter_Item_IST.csv'] + CSV_CANDIDATES:
+            if os.path.exists(path):
+                os.environ['CAT_ITEM_BANK_CSV'] = os.path.abspath(path)
+                break
+    return os.environ.get('CAT_ITEM_BANK_CSV')
+
+
+def load_cat_api(perf_log=os.devnull, log_level=logging.WARNING):
+    """Import cat_api dengan item bank yang ditemukan, log performa ke perf_log dan logger cat_api di log_level"""
+    if 'cat_api' not in sys.modules:
+        resolve_item_bank_csv()
+        os.environ.setdefault('CAT_PERF_LOG_FILE', perf_log)
+        if ROOT_DIR not in sys.path:
+            sys.path.insert(0, ROOT_DIR)
+        # Logger diatur sebelum import supaya log saat import (item bank, tabel grid) ikut tersaring
+        logging.getLogger('cat_api').setLevel(log_level)
+
+    import cat_api
+    return cat_api
+
+
+def synthetic_bank(cat_api, n, rng, source=None):
+    """Item bank sintetis 3PL berukuran n (a lognormal, b normal, g uniform, u=1)"""
+    return cat_api.ItemBank(
+        [f"S{i:07d}" for i in range(n)],
+        rng.lognormal(0.3, 0.4, n),
+        rng.normal(0.0, 1.5, n),
+        rng.uniform(0.0, 0.35, n),
+        source=source or f"synthetic-{n}",
+    )
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Load generator yang meniru pola panggilan Laravel (HybridCATService) untuk sizing worker cat_api
+
+N peserta virtual menjalankan sesi CAT lengkap secara bersamaan. Theta benar ~ N(0, 1) dan jawaban
+dibangkitkan dari model 3PL; payload sama dengan yang dikirim Laravel (semua respons format API
+id/a/b/g/answer dari convertResponseToApiFormat, used_item_ids, theta_old). Parameter item dan theta
+dibulatkan 6 desimal seperti kolom decimal(8,6) dan cast decimal:6 di Laravel, tanpa u. Pola:
+  step    startSession -> /api/select-item, lalu tiap jawaban satu /api/step dengan session_id
+          (HybridCATService::submitResponse sekarang)
+  legacy  tiap jawaban /api/estimate-theta -> /api/stopping-criteria -> /api/select-item atau
+          /api/final-score (alur submitResponse sebelum /api/step)
+  session API sesi stateful (/api/session, /response, /finish)
+
+Tanpa --url request dikirim ke app in-process lewat Flask test client (satu client per thread,
+CPU/RSS yang dilaporkan termasuk load generator) dengan konfigurasi produksi: setting CAT_* dari
+environment dan pohon awal tes dibangun sebelum tahap pertama seperti saat server start. Dengan --url
+request dikirim lewat HTTP ke cat_api.py yang sedang berjalan; --server-pid untuk mengukur CPU/RSS
+proses server.
+
+Concurrency dinaikkan bertahap (--concurrency 1 4 16); tiap tahap melaporkan latency per endpoint,
+latency dan panjang per sesi, throughput, serta CPU dan RSS server.
+
+Usage:
+    python loadgen.py --concurrency 1 4 16 --sessions 50 [--pattern step]
+    python loadgen.py --url http://127.0.0.1:5000 --server-pid 12345 --concurrency 8 32
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+import psutil
+
+from cat_loader import load_cat_api
+
+PATTERNS = ('step', 'legacy', 'session')
+LARAVEL_DECIMALS = 6  # Presisi parameter item dan theta yang disimpan Laravel
+
+
+class InProcessClient:
+    """Flask test client untuk app cat_api di proses ini"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def call(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json()
+
+
+class HttpClient:
+    """Koneksi HTTP persistent ke cat_api.py yang sedang berjalan (satu per thread)"""
+
+    def __init__(self, url):
+        parsed = urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.connection = None
+
+    def call(self, method, path, body=None):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        payload = None if body is None else json.dumps(body)
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        try:
+            self.connection.request(method, path, payload, headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            self.connection = None
+            raise
+        return response.status, json.loads(data) if data else None
+
+
+class Examinee:
+    """Satu peserta virtual: theta benar dan jawaban 3PL dengan RNG sendiri"""
+
+    def __init__(self, api, seed):
+        self.api = api
+        self.rng = np.random.default_rng(seed)
+        self.theta_true = self.rng.normal(0.0, 1.0)
+
+    def answer(self, item):
+        p = self.api.probability_3pl(self.theta_true, item['a'], item['b'], item['g'], item.get('u', 1.0))
+        return int(self.rng.random() < p)
+
+
+class Recorder:
+    """Latency per endpoint dan per sesi (thread-safe)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.sessions = []
+        self.lengths = []
+
+    def timed(self, client, name, method, path, body=None):
+        start = time.perf_counter()
+        status, data = client.call(method, path, body)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.endpoints[name].append(elapsed)
+            if status != 200:
+                self.errors[name] += 1
+        if status != 200:
+            raise RuntimeError(f"{name} returned {status}: {data}")
+        return data
+
+    def session_done(self, elapsed, n_items):
+        with self.lock:
+            self.sessions.append(elapsed)
+            self.lengths.append(n_items)
+
+
+def item_fields(item):
+    """Item dalam format convertResponseToApiFormat: id dan a/b/g 6 desimal, tanpa u"""
+    return {'id': item['id'], **{key: round(item[key], LARAVEL_DECIMALS) for key in ('a', 'b', 'g')}}
+
+
+def laravel_theta(theta):
+    """Theta seperti $session->theta (decimal:6)"""
+    return round(theta, LARAVEL_DECIMALS)
+
+
+def run_step(client, examinee, recorder, session_id, think):
+    """Pola HybridCATService sekarang: select-item untuk item pertama, lalu /api/step per jawaban"""
+    data = recorder.timed(client, 'select-item', 'POST', '/api/select-item',
+                          {'theta': 0.0, 'used_item_ids': [], 'responses': []})
+    item, theta = data['item'], 0.0
+    responses, used = [], [item['id']]
+    while True:
+        think()
+        responses.append(dict(item_fields(item), answer=examinee.answer(item)))
+        data = recorder.timed(client, 'step', 'POST', '/api/step', {
+            'responses': responses, 'theta_old': theta, 'used_item_ids': used, 'session_id': session_id
+        })
+        if data['should_stop']:
+            return len(responses)
+        theta, item = laravel_theta(data['theta']), data['item']
+        used.append(item['id'])
+
+
+def run_legacy(client, examinee, recorder, session_id, think):
+    """Alur submitResponse lama: estimate-theta, stopping-criteria, lalu select-item atau final-score"""
+    data = recorder.timed(client, 'select-item', 'POST', '/api/select-item',
+                          {'theta': 0.0, 'used_item_ids': [], 'responses': []})
+    item, theta = data['item'], 0.0
+    responses, used = [], [item['id']]
+    while True:
+        think()
+        responses.append(dict(item_fields(item), answer=examinee.answer(item)))
+        data = recorder.timed(client, 'estimate-theta', 'POST', '/api/estimate-theta',
+                              {'responses': responses, 'theta_old': theta, 'session_id': session_id})
+        theta, se = laravel_theta(data['theta']), data['se']
+        data = recorder.timed(client, 'stopping-criteria', 'POST', '/api/stopping-criteria',
+                              {'responses': responses, 'se_eap': se, 'used_item_ids': used})
+        if data['should_stop']:
+            recorder.timed(client, 'final-score', 'POST', '/api/final-score',
+                           {'responses': responses, 'session_id': session_id})
+            return len(responses)
+        data = recorder.timed(client, 'select-item', 'POST', '/api/select-item',
+                              {'theta': theta, 'used_item_ids': used, 'responses': responses,
+                               'session_id': session_id})
+        item = data['item']
+        used.append(item['id'])
+
+
+def run_session(client, examinee, recorder, session_id, think):
+    """API sesi stateful: create, response per jawaban, finish"""
+    data = recorder.timed(client, 'session create', 'POST', '/api/session', {})
+    session_id, n_items = data['session_id'], 0
+    while not data.get('test_completed'):
+        think()
+        item = data['item']
+        data = recorder.timed(client, 'session response', 'POST', f'/api/session/{session_id}/response',
+                              {'item_id': item['id'], 'answer': examinee.answer(item)})
+        n_items += 1
+    recorder.timed(client, 'session finish', 'POST', f'/api/session/{session_id}/finish', {})
+    return n_items
+
+
+RUNNERS = {'step': run_step, 'legacy': run_legacy, 'session': run_session}
+
+
+class ResourceSampler(threading.Thread):
+    """Sampling CPU% dan RSS proses server beserta child process-nya (misal worker gunicorn) selama satu tahap"""
+
+    def __init__(self, process, interval=0.2):
+        super().__init__(daemon=True)
+        self.process = process
+        self.interval = interval
+        self.cpu = []
+        self.rss = []
+        self.stopped = threading.Event()
+        self.tracked = {}
+
+    def processes(self):
+        try:
+            current = [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            return []
+        # Objek Process disimpan supaya cpu_percent dihitung relatif terhadap sampel sebelumnya
+        for process in current:
+            self.tracked.setdefault(process.pid, process)
+        return [self.tracked[process.pid] for process in current]
+
+    def run(self):
+        for process in self.processes():
+            process.cpu_percent(None)
+        while not self.stopped.wait(self.interval):
+            cpu = rss = 0.0
+            for process in self.processes():
+                try:
+                    cpu += process.cpu_percent(None)
+                    rss += process.memory_info().rss / 1024 / 1024
+                except psutil.Error:
+                    continue
+            self.cpu.append(cpu)
+            self.rss.append(rss)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def percentiles(values):
+    return np.percentile(np.asarray(values) * 1e3, [50, 95, 99]) if values else (np.nan,) * 3
+
+
+def run_stage(args, api, concurrency, seeds, process):
+    recorder = Recorder()
+    local = threading.local()
+    runner = RUNNERS[args.pattern]
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = HttpClient(args.url) if args.url else InProcessClient(api.app)
+        return local.client
+
+    def think():
+        if args.think_ms > 0:
+            time.sleep(args.think_ms / 1000)
+
+    def walk(k):
+        examinee = Examinee(api, seeds[k])
+        start = time.perf_counter()
+        try:
+            n_items = runner(client(), examinee, recorder, f'LOADGEN_{concurrency}_{k}', think)
+        except Exception as e:
+            print(f"  sesi {k} gagal: {e}", file=sys.stderr)
+            return
+        recorder.session_done(time.perf_counter() - start, n_items)
+
+    sampler = ResourceSampler(process) if process is not None else None
+    if sampler is not None:
+        sampler.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='loadgen') as pool:
+        list(pool.map(walk, range(len(seeds))))
+    elapsed = time.perf_counter() - start
+    if sampler is not None:
+        sampler.stop()
+
+    n_requests = sum(len(values) for values in recorder.endpoints.values())
+    print(f"\nConcurrency {concurrency}: {len(recorder.sessions)} sesi, {n_requests} request dalam {elapsed:.2f}s "
+          f"({len(recorder.sessions) / elapsed:.1f} sesi/s, {n_requests / elapsed:.0f} req/s)")
+    print(f"  {'endpoint':<20} {'calls':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, values in sorted(recorder.endpoints.items()):
+        p50, p95, p99 = percentiles(values)
+        print(f"  {name:<20} {len(values):>7} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {recorder.errors[name]:>7}")
+    if recorder.sessions:
+        p50, p95, p99 = percentiles(recorder.sessions)
+        print(f"  {'sesi (total)':<20} {len(recorder.sessions):>7} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}"
+              f"   items mean {np.mean(recorder.lengths):.1f}")
+    if sampler is not None and sampler.cpu:
+        print(f"  server CPU mean {np.mean(sampler.cpu):.0f}% max {np.max(sampler.cpu):.0f}%, "
+              f"RSS max {np.max(sampler.rss):.0f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='base URL cat_api.py yang berjalan (default: app in-process)')
+    parser.add_argument('--server-pid', type=int, help='PID server untuk CPU/RSS (mode --url)')
+    parser.add_argument('--pattern', choices=PATTERNS, default='step')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='tahap ramp-up')
+    parser.add_argument('--sessions', type=int, default=50, help='sesi per tahap')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='jeda antar jawaban per peserta')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    api = load_cat_api()
+    if args.url:
+        process = psutil.Process(args.server_pid) if args.server_pid else None
+    else:
+        process = psutil.Process()
+        api.build_opening_tree()
+    target = args.url or 'in-process'
+    print(f"Target: {target}, pola: {args.pattern}, {args.sessions} sesi per tahap, think {args.think_ms:g}ms")
+
+    seed_sequence = np.random.SeedSequence(args.seed)
+    for concurrency, stage_seeds in zip(args.concurrency, seed_sequence.spawn(len(args.concurrency))):
+        run_stage(args, api, concurrency, stage_seeds.spawn(args.sessions), process)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
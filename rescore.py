@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Rescoring offline EAP + final score dari export test_responses, tanpa Flask
+
+Input CSV (kolom session_id, item_id, answer; kolom lain seperti item_order diabaikan) atau JSONL
+(satu baris per respons dengan key yang sama, atau satu baris per sesi
+{"session_id": ..., "responses": [{"item_id": ..., "answer": ...}]}). Input dibaca streaming dan
+respons dikelompokkan per session_id berurutan, jadi export harus diurutkan per sesi
+(ORDER BY session_id, item_order). Sesi dikumpulkan per batch, dibagi ke process pool, diskor
+dengan estimate_theta_eap_batch, dan hasil ditulis sesuai urutan input begitu batch selesai.
+
+Output CSV atau JSONL (dari ekstensi --output, default CSV ke stdout) dengan kolom
+session_id, n_responses, theta, se_eap, final_score, error. Ringkasan throughput (sesi/detik)
+dan peak memory ditulis ke stderr.
+
+Usage:
+    python rescore.py test_responses.csv --output scores.csv [--workers 4] [--batch-size 5000]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cat_loader import load_cat_api
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+OUTPUT_FIELDS = ['session_id', 'n_responses', 'theta', 'se_eap', 'final_score', 'error']
+
+
+def read_rows(path, input_format):
+    """Stream (session_id, item_id, answer) dari CSV atau JSONL"""
+    stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+    try:
+        if input_format == 'csv':
+            reader = csv.reader(stream)
+            header = next(reader)
+            columns = [header.index(name) for name in ('session_id', 'item_id', 'answer')]
+            for row in reader:
+                yield tuple(row[column] for column in columns)
+        else:
+            for line in stream:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if 'responses' in record:
+                    for resp in record['responses']:
+                        yield record['session_id'], resp.get('item_id', resp.get('id')), resp['answer']
+                else:
+                    yield record['session_id'], record['item_id'], record['answer']
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def read_batches(rows, batch_size):
+    """Kelompokkan respons berurutan per sesi; yield (session_ids, item_ids, answers, lengths) per batch_size sesi"""
+    session_ids, item_ids, answers, lengths = [], [], [], []
+    current = None
+    for session_id, item_id, answer in rows:
+        if session_id != current:
+            if len(session_ids) == batch_size:
+                yield session_ids, item_ids, answers, lengths
+                session_ids, item_ids, answers, lengths = [], [], [], []
+            session_ids.append(session_id)
+            lengths.append(0)
+            current = session_id
+        item_ids.append(item_id)
+        answers.append(answer)
+        lengths[-1] += 1
+    if session_ids:
+        yield session_ids, item_ids, answers, lengths
+
+
+def score_batch(batch):
+    """Skor satu batch di worker; sesi dengan item di luar bank diberi error dan tidak diskor"""
+    api = load_cat_api()
+    bank = api.ITEM_BANK
+    session_ids, item_ids, answers, lengths = batch
+
+    indices = np.fromiter((bank.id_to_index.get(str(item_id), -1) for item_id in item_ids),
+                          dtype=np.intp, count=len(item_ids))
+    correct = np.fromiter((int(answer) == 1 for answer in answers), dtype=bool, count=len(answers))
+    lengths = np.array(lengths, dtype=np.intp)
+    session_of = np.repeat(np.arange(len(lengths)), lengths)
+    invalid = np.bincount(session_of[indices < 0], minlength=len(lengths)) > 0
+
+    keep = ~invalid[session_of]
+    scored_lengths = np.where(invalid, 0, lengths)
+    indices, correct = indices[keep], correct[keep]
+    params = tuple(param[indices] for param in (bank.a, bank.b, bank.g, bank.u))
+    theta, se = api.estimate_theta_eap_batch(indices, correct, params, scored_lengths)
+    scores = api.calculate_score(theta)
+
+    results = []
+    for k, session_id in enumerate(session_ids):
+        if invalid[k]:
+            results.append([session_id, int(lengths[k]), '', '', '', 'unknown item id'])
+        else:
+            results.append([session_id, int(lengths[k]), float(theta[k]), float(se[k]), float(scores[k]), ''])
+    return results, int(lengths.sum())
+
+
+class ResultWriter:
+    """Tulis hasil sebagai CSV atau JSONL"""
+
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        if output_format == 'csv':
+            self.writer = csv.writer(stream)
+            self.writer.writerow(OUTPUT_FIELDS)
+
+    def write(self, results):
+        if self.output_format == 'csv':
+            self.writer.writerows(results)
+        else:
+            for result in results:
+                record = dict(zip(OUTPUT_FIELDS, result))
+                if not record['error']:
+                    del record['error']
+                self.stream.write(json.dumps(record) + '\n')
+        self.stream.flush()
+
+
+def peak_memory_mb():
+    """Peak RSS proses utama dan worker (MB), None jika tidak tersedia"""
+    if resource is None:
+        return None
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+
+def file_format(path, default):
+    if path in (None, '-'):
+        return default
+    return 'jsonl' if path.endswith(('.jsonl', '.json', '.ndjson')) else 'csv'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="CSV/JSONL export test_responses ('-' untuk stdin)")
+    parser.add_argument('--output', '-o', default='-', help="file hasil .csv/.jsonl ('-' untuk stdout)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'], help='default dari ekstensi input')
+    parser.add_argument('--workers', type=int, default=max((os.cpu_count() or 1) - 1, 0),
+                        help='jumlah worker (default CPU - 1, satu core untuk membaca input); 0 = tanpa process pool')
+    parser.add_argument('--batch-size', type=int, default=5000, help='sesi per batch')
+    parser.add_argument('--item-bank', help='CSV parameter item (default CAT_ITEM_BANK_CSV)')
+    args = parser.parse_args()
+
+    if args.item_bank:
+        os.environ['CAT_ITEM_BANK_CSV'] = args.item_bank
+    input_format = args.input_format or file_format(args.input, 'csv')
+    output_format = file_format(args.output, 'csv')
+
+    start = time.perf_counter()
+    n_sessions = n_responses = 0
+    batches = read_batches(read_rows(args.input, input_format), args.batch_size)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        writer = ResultWriter(output, output_format)
+        if args.workers <= 0:
+            completed = map(score_batch, batches)
+            for results, rows in completed:
+                writer.write(results)
+                n_sessions += len(results)
+                n_responses += rows
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=load_cat_api) as pool:
+                # Batch yang sedang dikerjakan dibatasi supaya input tidak dibaca seluruhnya ke memori
+                pending = deque()
+                for batch in batches:
+                    pending.append(pool.submit(score_batch, batch))
+                    while len(pending) >= 2 * args.workers or (pending and pending[0].done()):
+                        results, rows = pending.popleft().result()
+                        writer.write(results)
+                        n_sessions += len(results)
+                        n_responses += rows
+                while pending:
+                    results, rows = pending.popleft().result()
+                    writer.write(results)
+                    n_sessions += len(results)
+                    n_responses += rows
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    summary = (f"Rescored {n_sessions} sessions ({n_responses} responses) in {elapsed:.2f}s, "
+               f"{n_sessions / elapsed if elapsed > 0 else 0:.0f} sessions/s")
+    memory = peak_memory_mb()
+    if memory is not None:
+        summary += f", peak memory {memory[0]:.0f}MB (main) / {memory[1]:.0f}MB (largest worker)"
+    print(summary, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Simulasi Monte Carlo CAT untuk mengevaluasi konfigurasi tes tanpa UI Laravel
+
+Untuk tiap simulee: theta benar diambil dari distribusi (normal atau uniform), jawaban dibangkitkan
+dari model 3PL, dan alur tes dijalankan persis seperti Laravel: select_next_item_mi -> jawab ->
+estimate_theta_map (batas perubahan 1.0/0.25) -> check_stopping_criteria (SE MAP, max item) ->
+item berikutnya, lalu estimate_theta_eap untuk skor akhir. Simulee dibagi ke process pool; seed
+tiap simulee diturunkan dari --seed (SeedSequence.spawn) sehingga hasil sama untuk jumlah worker berapa pun.
+
+Laporan: bias, RMSE dan korelasi theta EAP (dan MAP akhir) terhadap theta benar, bias/RMSE per rentang
+theta, distribusi panjang tes dan alasan berhenti, exposure rate item, dan waktu per tahap.
+
+Usage:
+    python simulate.py --simulees 1000 [--workers 4] [--seed 1] [--output simulees.csv]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cat_loader import load_cat_api
+
+STEPS = ('select_next_item_mi', 'estimate_theta_map', 'check_stopping_criteria', 'estimate_theta_eap')
+OUTPUT_FIELDS = ['simulee', 'theta_true', 'theta_eap', 'se_eap', 'theta_map', 'se_map', 'n_items', 'stop_reason']
+
+
+def draw_theta(rng, args):
+    if args.theta_distribution == 'uniform':
+        return rng.uniform(-args.theta_range, args.theta_range)
+    return rng.normal(args.theta_mean, args.theta_sd)
+
+
+def simulate_examinee(api, seed, args, timings):
+    """Satu tes CAT lengkap untuk satu simulee; waktu tiap tahap ditambahkan ke timings"""
+    rng = np.random.default_rng(seed)
+    bank = api.ITEM_BANK
+    theta_true = draw_theta(rng, args)
+
+    theta, se = 0.0, 1.0
+    responses, used_item_ids = [], []
+
+    start = time.perf_counter()
+    item = api.select_next_item_mi(theta, used_item_ids, bank)
+    timings['select_next_item_mi'].append(time.perf_counter() - start)
+    stop_reason = 'No more items available' if item is None else None
+
+    while item is not None:
+        used_item_ids.append(item['id'])
+        p = api.probability_3pl(theta_true, item['a'], item['b'], item['g'], item['u'])
+        responses.append(dict(item, answer=int(rng.random() < p)))
+
+        start = time.perf_counter()
+        theta, se = api.estimate_theta_map(responses, theta_old=theta)
+        timings['estimate_theta_map'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        should_stop, stop_reason = api.check_stopping_criteria(responses, se, used_item_ids,
+                                                               args.max_items, args.se_threshold)
+        timings['check_stopping_criteria'].append(time.perf_counter() - start)
+        if should_stop:
+            break
+
+        start = time.perf_counter()
+        item = api.select_next_item_mi(theta, used_item_ids, bank)
+        timings['select_next_item_mi'].append(time.perf_counter() - start)
+        if item is None:
+            stop_reason = 'No more items available'
+
+    start = time.perf_counter()
+    theta_eap, se_eap = api.estimate_theta_eap(responses)
+    timings['estimate_theta_eap'].append(time.perf_counter() - start)
+
+    return {
+        'theta_true': float(theta_true),
+        'theta_eap': float(theta_eap),
+        'se_eap': float(se_eap),
+        'theta_map': float(theta),
+        'se_map': float(se),
+        'n_items': len(responses),
+        'stop_reason': stop_reason,
+        'items': used_item_ids[:len(responses)]
+    }
+
+
+def simulate_chunk(task):
+    """Simulasi sekelompok simulee di worker; return (hasil per simulee, waktu per tahap)"""
+    first, seeds, args = task
+    api = load_cat_api()
+    timings = {step: [] for step in STEPS}
+    results = []
+    for offset, seed in enumerate(seeds):
+        result = simulate_examinee(api, seed, args, timings)
+        result['simulee'] = first + offset
+        results.append(result)
+    return results, {step: np.array(values) for step, values in timings.items()}
+
+
+def report(results, timings, item_ids, elapsed, args):
+    theta_true = np.array([r['theta_true'] for r in results])
+    theta_eap = np.array([r['theta_eap'] for r in results])
+    theta_map = np.array([r['theta_map'] for r in results])
+    lengths = np.array([r['n_items'] for r in results])
+    n = len(results)
+
+    print(f"Simulees: {n}, item bank: {len(item_ids)} items, max items: {args.max_items}, "
+          f"SE threshold: {args.se_threshold}, seed: {args.seed}, waktu: {elapsed:.1f}s ({n / elapsed:.1f} simulees/s)")
+
+    print("\nAkurasi")
+    print(f"{'estimator':<10} {'bias':>8} {'RMSE':>8} {'MAE':>8} {'corr':>7}")
+    for name, estimate in (('EAP', theta_eap), ('MAP', theta_map)):
+        error = estimate - theta_true
+        corr = np.corrcoef(estimate, theta_true)[0, 1] if n > 1 else float('nan')
+        print(f"{name:<10} {error.mean():>8.4f} {np.sqrt((error**2).mean()):>8.4f} "
+              f"{np.abs(error).mean():>8.4f} {corr:>7.4f}")
+
+    print("\nBias/RMSE EAP per theta benar")
+    print(f"{'theta':>13} {'n':>6} {'bias':>8} {'RMSE':>8} {'mean items':>11}")
+    edges = [-np.inf, -2, -1, 0, 1, 2, np.inf]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        rows = (theta_true >= lo) & (theta_true < hi)
+        if rows.any():
+            error = theta_eap[rows] - theta_true[rows]
+            print(f"{f'[{lo:g}, {hi:g})':>13} {rows.sum():>6} {error.mean():>8.4f} "
+                  f"{np.sqrt((error**2).mean()):>8.4f} {lengths[rows].mean():>11.1f}")
+
+    print("\nPanjang tes")
+    print(f"mean {lengths.mean():.2f}, median {np.median(lengths):.0f}, min {lengths.min()}, max {lengths.max()}")
+    for length, count in sorted(Counter(lengths.tolist()).items()):
+        print(f"{length:>4} items: {count:>6} ({count / n:6.1%})")
+    print("Alasan berhenti:")
+    for reason, count in Counter(r['stop_reason'] for r in results).most_common():
+        print(f"  {count:>6} ({count / n:6.1%})  {reason}")
+
+    exposure = Counter(item_id for r in results for item_id in r['items'])
+    rates = np.array([exposure.get(item_id, 0) / n for item_id in item_ids])
+    print("\nExposure rate item")
+    print(f"max {rates.max():.3f}, mean {rates.mean():.3f}, item tidak pernah dipakai {int((rates == 0).sum())}, "
+          f"item dengan exposure > {args.exposure_limit:g}: {int((rates > args.exposure_limit).sum())}")
+    for item_id, count in exposure.most_common(10):
+        print(f"  {item_id:<10} {count / n:.3f}")
+
+    print("\nWaktu per tahap (ms)")
+    print(f"{'tahap':<24} {'calls':>8} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}")
+    for step in STEPS:
+        values = timings[step] * 1e3
+        if len(values) > 0:
+            print(f"{step:<24} {len(values):>8} {values.mean():>8.3f} {np.percentile(values, 50):>8.3f} "
+                  f"{np.percentile(values, 95):>8.3f} {values.max():>8.3f}")
+
+    if args.exposure_output:
+        with open(args.exposure_output, 'w', newline='', encoding='utf-8') as stream:
+            writer = csv.writer(stream)
+            writer.writerow(['item_id', 'exposure_rate'])
+            writer.writerows(zip(item_ids, rates.tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--simulees', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='0 = tanpa process pool')
+    parser.add_argument('--chunk-size', type=int, default=100, help='simulee per tugas worker')
+    parser.add_argument('--theta-distribution', choices=['normal', 'uniform'], default='normal')
+    parser.add_argument('--theta-mean', type=float, default=0.0)
+    parser.add_argument('--theta-sd', type=float, default=1.0)
+    parser.add_argument('--theta-range', type=float, default=3.0, help='uniform di [-range, range]')
+    parser.add_argument('--max-items', type=int, default=30)
+    parser.add_argument('--se-threshold', type=float, default=0.25)
+    parser.add_argument('--exposure-limit', type=float, default=0.2, help='batas exposure rate yang dilaporkan')
+    parser.add_argument('--output', help='CSV hasil per simulee')
+    parser.add_argument('--exposure-output', help='CSV exposure rate per item')
+    parser.add_argument('--item-bank', help='CSV parameter item (default CAT_ITEM_BANK_CSV)')
+    args = parser.parse_args()
+
+    if args.item_bank:
+        os.environ['CAT_ITEM_BANK_CSV'] = args.item_bank
+
+    seeds = np.random.SeedSequence(args.seed).spawn(args.simulees)
+    tasks = [(first, seeds[first:first + args.chunk_size], args)
+             for first in range(0, args.simulees, args.chunk_size)]
+
+    start = time.perf_counter()
+    if args.workers <= 0:
+        chunks = list(map(simulate_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=load_cat_api) as pool:
+            chunks = list(pool.map(simulate_chunk, tasks))
+    elapsed = time.perf_counter() - start
+
+    results = [result for chunk_results, _ in chunks for result in chunk_results]
+    timings = {step: np.concatenate([chunk_timings[step] for _, chunk_timings in chunks]) for step in STEPS}
+    item_ids = list(load_cat_api().ITEM_BANK.ids)
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as stream:
+            writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(results)
+
+    report(results, timings, item_ids, elapsed, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
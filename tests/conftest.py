@@ -0,0 +1,47 @@
+"""
+Fixture bersama test cat_api: modul di-import lewat cat_loader (item bank CSV dari repo,
+log performa tidak ditulis ke cat_api.log)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cat_loader import load_cat_api, synthetic_bank  # noqa: E402,F401  (re-export untuk test)
+
+
+@pytest.fixture(scope='session')
+def cat_api():
+    return load_cat_api()
+
+
+@pytest.fixture
+def client(cat_api):
+    return cat_api.app.test_client()
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(12345)
+
+
+def simulated_responses(cat_api, n, rng, item_bank=None, theta=None):
+    """n respons 3PL (format API) dari item acak tanpa pengulangan"""
+    bank = cat_api.ITEM_BANK if item_bank is None else item_bank
+    theta = rng.normal() if theta is None else theta
+    indices = rng.choice(len(bank), size=min(n, len(bank)), replace=False)
+    p = cat_api.probability_3pl(theta, bank.a[indices], bank.b[indices], bank.g[indices], bank.u[indices])
+    answers = rng.random(len(indices)) < p
+    return [dict(bank.item(int(idx)), answer=int(answer)) for idx, answer in zip(indices, answers)]
+
+
+def exhaustive_argmax(cat_api, theta, available_mask, a, b, g, u):
+    """(posisi, information) item tersedia dengan information terbesar di theta, seri ke posisi terkecil"""
+    info = cat_api.information_3pl_array(theta, a, b, g, u)
+    info = np.where(available_mask, info, -np.inf)
+    best_idx = int(np.argmax(info))
+    return best_idx, info[best_idx]
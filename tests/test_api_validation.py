@@ -0,0 +1,54 @@
+"""Input yang tidak valid di /api/select-item dan /api/step harus 400, bukan 500"""
+
+import pytest
+
+MALFORMED_RESPONSES = [
+    5,
+    'abc',
+    [5],
+    [None],
+    [{'item': 5, 'answer': 1}],
+    [{'item': {'a': 1.0}, 'answer': 1}],
+    [{'a': 1.0, 'b': 0.0, 'answer': 1}],
+]
+
+
+@pytest.mark.parametrize('responses', MALFORMED_RESPONSES)
+@pytest.mark.parametrize('criterion', ['MI', 'EFI'])
+def test_select_item_rejects_malformed_responses(client, responses, criterion):
+    response = client.post('/api/select-item', json={'theta': 0.0, 'used_item_ids': [], 'responses': responses,
+                                                     'criterion': criterion, 'session_id': 'VALIDATION'})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('responses', MALFORMED_RESPONSES)
+def test_step_rejects_malformed_responses(client, responses):
+    response = client.post('/api/step', json={'responses': responses, 'theta_old': 0.0, 'used_item_ids': []})
+    assert response.status_code == 400
+
+
+def test_step_rejects_unknown_criterion(client, cat_api):
+    item = cat_api.ITEM_BANK.item(0)
+    response = client.post('/api/step', json={'responses': [dict(item, answer=1)], 'used_item_ids': [item['id']],
+                                              'criterion': 'XYZ'})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('criterion', ['MI', 'EFI'])
+@pytest.mark.parametrize('session_id', [None, 'GUI_FORMAT'])
+def test_select_item_accepts_gui_format(client, cat_api, criterion, session_id):
+    bank = cat_api.ITEM_BANK
+    api_format = [dict(bank.item(k), answer=k % 2) for k in range(5)]
+    gui_format = [{'item': bank.item(k), 'answer': k % 2} for k in range(5)]
+    used = [resp['id'] for resp in api_format]
+    results = []
+    for responses in (gui_format, api_format):
+        body = {'theta': 0.3, 'used_item_ids': used, 'responses': responses, 'criterion': criterion}
+        if session_id:
+            body['session_id'] = f'{session_id}_{criterion}'
+        response = client.post('/api/select-item', json=body)
+        assert response.status_code == 200
+        results.append(response.get_json())
+    assert results[0]['item'] == results[1]['item']
+    assert results[0]['expected_fisher_information'] == pytest.approx(results[1]['expected_fisher_information'])
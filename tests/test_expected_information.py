@@ -0,0 +1,40 @@
+"""EFI batch atas pool item: sama dengan EFI per item, dan parameter top divalidasi"""
+
+import numpy as np
+import pytest
+
+from conftest import simulated_responses
+
+
+def test_batch_matches_single_item_efi(cat_api, rng):
+    bank = cat_api.ITEM_BANK
+    responses = simulated_responses(cat_api, 12, rng)
+    state = cat_api.PosteriorState()
+    state.add_responses(responses)
+    mask = bank.available_mask([resp['id'] for resp in responses])
+
+    indices, efi = state.expected_fisher_information_batch(mask)
+    np.testing.assert_array_equal(indices, np.flatnonzero(mask))
+    expected = [state.expected_fisher_information(bank.a[k], bank.b[k], bank.g[k], bank.u[k]) for k in indices]
+    np.testing.assert_allclose(efi, expected, rtol=1e-12)
+
+    all_indices, all_efi = state.expected_fisher_information_batch()
+    np.testing.assert_array_equal(all_efi[indices], efi)
+    assert len(all_indices) == len(bank)
+
+
+@pytest.mark.parametrize('top', [0, 3, 10**6])
+def test_top_returns_first_items_of_full_ranking(client, cat_api, rng, top):
+    responses = simulated_responses(cat_api, 5, rng)
+    body = {'responses': responses, 'used_item_ids': [resp['id'] for resp in responses]}
+    full = client.post('/api/expected-information', json=body).get_json()['items']
+    result = client.post('/api/expected-information', json=dict(body, top=top))
+    assert result.status_code == 200
+    assert result.get_json()['items'] == full[:top]
+
+
+@pytest.mark.parametrize('top', [-1, 2.5, '3', True, [3]])
+def test_top_rejects_invalid_values(client, top):
+    response = client.post('/api/expected-information', json={'responses': [], 'used_item_ids': [], 'top': top})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
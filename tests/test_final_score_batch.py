@@ -0,0 +1,94 @@
+"""Batch final score harus sama dengan /api/final-score per peserta, dan input rusak harus 400"""
+
+import numpy as np
+import pytest
+
+from conftest import simulated_responses
+
+
+def single_scores(client, histories):
+    return [client.post('/api/final-score', json={'responses': responses}).get_json() for responses in histories]
+
+
+def assert_matches_single(results, singles):
+    for result, single in zip(results, singles):
+        assert result['theta'] == pytest.approx(single['theta'], abs=1e-12)
+        assert result['se_eap'] == pytest.approx(single['se_eap'], abs=1e-12)
+        assert result['final_score'] == pytest.approx(single['final_score'], abs=1e-10)
+        assert result['n_responses'] == single['n_responses']
+
+
+def test_examinees_format_matches_single(client, cat_api, rng):
+    histories = [simulated_responses(cat_api, int(n), rng) for n in rng.integers(1, 31, 40)]
+    # Satu peserta dengan item di luar bank (parameter dari respons)
+    histories[0].append({'id': 'X1', 'a': 1.1, 'b': -0.3, 'g': 0.15, 'u': 1.0, 'answer': 0})
+    examinees = [{'id': f'P{k}', 'responses': responses} for k, responses in enumerate(histories)]
+    response = client.post('/api/final-score/batch', json={'examinees': examinees})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['id'] for result in results] == [f'P{k}' for k in range(len(histories))]
+    assert_matches_single(results, single_scores(client, histories))
+
+
+def test_compact_format_matches_single(client, cat_api, rng):
+    histories = [simulated_responses(cat_api, int(n), rng) for n in rng.integers(1, 31, 25)]
+    body = {
+        'item_ids': [resp['id'] for responses in histories for resp in responses],
+        'answers': [resp['answer'] for responses in histories for resp in responses],
+        'lengths': [len(responses) for responses in histories],
+    }
+    results = client.post('/api/final-score/batch', json=body).get_json()['results']
+    assert [result['index'] for result in results] == list(range(len(histories)))
+    assert_matches_single(results, single_scores(client, histories))
+
+
+def test_chunking_does_not_change_scores(cat_api, rng):
+    histories = [simulated_responses(cat_api, int(n), rng) for n in rng.integers(0, 31, 60)]
+    lengths = [len(responses) for responses in histories]
+    indices, answers, params = cat_api.response_matrix([resp for responses in histories for resp in responses])
+    reference = cat_api.estimate_theta_eap_batch(indices, answers, params, lengths)
+    for chunk_rows in (1, 17, 100):
+        theta, se = cat_api.estimate_theta_eap_batch(indices, answers, params, lengths, chunk_rows=chunk_rows)
+        np.testing.assert_allclose(theta, reference[0], atol=1e-12)
+        np.testing.assert_allclose(se, reference[1], atol=1e-12)
+    # Peserta tanpa respons mendapat prior
+    empty = np.flatnonzero(np.array(lengths) == 0)
+    assert np.all(reference[0][empty] == 0.0) and np.all(reference[1][empty] == 2.0)
+
+
+def test_empty_examinee_gets_error_entry(client, cat_api, rng):
+    examinees = [simulated_responses(cat_api, 5, rng), []]
+    results = client.post('/api/final-score/batch', json={'examinees': examinees}).get_json()['results']
+    assert 'theta' in results[0]
+    assert results[1]['error'] == 'No responses provided'
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    {},
+    {'examinees': []},
+    {'examinees': 5},
+    {'examinees': [5]},
+    {'examinees': ['abc']},
+    {'examinees': [{'responses': 5}]},
+    {'examinees': [[5]]},
+    {'examinees': [[{'a': 1.0, 'answer': 1}]]},
+    {'item_ids': 5, 'answers': [1], 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': 'x', 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': [1], 'lengths': ['x']},
+    {'item_ids': ['A107'], 'answers': [1], 'lengths': [-1, 2]},
+    {'item_ids': ['A107'], 'answers': [1], 'lengths': [True]},
+    {'item_ids': ['A107'], 'answers': [1], 'lengths': [2]},
+    {'item_ids': ['A107'], 'answers': [1], 'lengths': [1], 'ids': 3},
+    {'item_ids': ['A107'], 'answers': ['1'], 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': [True], 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': [2], 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': [-1], 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': [0.5], 'lengths': [1]},
+    {'item_ids': ['A107'], 'answers': [None], 'lengths': [1]},
+    {'item_ids': ['NOT_AN_ITEM'], 'answers': [1], 'lengths': [1]},
+])
+def test_malformed_batch_returns_400(client, body):
+    response = client.post('/api/final-score/batch', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,44 @@
+"""Item bank tidak berubah per proses: tabel precompute dibangun sekali per objek bank dan grid"""
+
+import numpy as np
+import pytest
+
+from conftest import synthetic_bank
+
+
+def test_tables_match_direct_computation_and_are_cached(cat_api, rng):
+    bank = synthetic_bank(cat_api, 50, rng)
+    grid = np.linspace(-4, 4, 81)
+    tables = bank.tables(grid)
+    assert bank.tables(grid) is tables
+    assert bank.tables() is not tables
+
+    theta = grid[None, :]
+    a, b, g, u = (param[:, None] for param in (bank.a, bank.b, bank.g, bank.u))
+    np.testing.assert_allclose(tables.p, cat_api.probability_3pl(theta, a, b, g, u), rtol=1e-12)
+    np.testing.assert_allclose(tables.info, cat_api.information_3pl_array(theta, a, b, g, u), rtol=1e-12)
+
+
+def test_bank_arrays_and_tables_are_read_only(cat_api, rng):
+    bank = synthetic_bank(cat_api, 20, rng)
+    tables = bank.tables()
+    for array in (bank.a, bank.b, bank.g, bank.u, tables.p, tables.log_p, tables.log_q, tables.info):
+        with pytest.raises(ValueError):
+            array[0] = 0.0
+    assert not hasattr(bank, 'replace_items')
+
+
+def test_new_bank_object_gets_its_own_state(cat_api, rng):
+    first = synthetic_bank(cat_api, 40, rng, source='first')
+    second = synthetic_bank(cat_api, 40, rng, source='second')
+    assert first.ids == second.ids
+    assert first.tables() is not second.tables()
+    assert first.selection_index() is not second.selection_index()
+
+    # State posterior sesi terikat ke objek bank-nya; bank lain membangun ulang state
+    cache = cat_api.PosteriorCache()
+    responses = [dict(first.item(k), answer=k % 2) for k in range(5)]
+    state = cache.sync('BANK', responses, item_bank=first)
+    other = cache.sync('BANK', [dict(second.item(k), answer=k % 2) for k in range(5)], item_bank=second)
+    assert other is not state and other.item_bank is second
+    assert cache.rebuilds == 1
@@ -0,0 +1,67 @@
+"""MAP Newton-Raphson: konvergen ke mode posterior, dan kembali ke grid jika tidak konvergen"""
+
+import numpy as np
+import pytest
+
+from conftest import simulated_responses
+
+FINE_GRID = np.linspace(-6, 6, 120001)
+
+
+def fine_grid_mode(cat_api, answers, params, prior_mean=0.0, prior_sd=2.0):
+    """Mode log-posterior pada grid sangat halus (step 1e-4) sebagai referensi"""
+    log_posterior = cat_api.log_likelihood_grid(np.full(len(answers), -1, dtype=np.intp), answers, params, FINE_GRID)
+    log_posterior += cat_api.prior_log_weights(FINE_GRID, prior_mean, prior_sd)
+    return FINE_GRID[np.argmax(log_posterior)]
+
+
+@pytest.mark.parametrize('n', [1, 5, 15, 30])
+@pytest.mark.parametrize('prior_mean, prior_sd', [(0.0, 2.0), (0.5, 1.0)])
+def test_newton_converges_to_posterior_mode(cat_api, rng, n, prior_mean, prior_sd):
+    for _ in range(10):
+        responses = simulated_responses(cat_api, n, rng)
+        indices, answers, params = cat_api.response_matrix(responses)
+        result = cat_api.map_newton(answers, params, prior_mean=prior_mean, prior_sd=prior_sd)
+        assert result is not None
+        theta, iterations = result
+        assert 1 <= iterations <= cat_api.MAP_NEWTON_MAX_ITER
+        assert theta == pytest.approx(fine_grid_mode(cat_api, answers, params, prior_mean, prior_sd), abs=2e-4)
+
+
+def test_newton_matches_grid_map_within_grid_step(cat_api, rng):
+    step = cat_api.THETA_GRID[1] - cat_api.THETA_GRID[0]
+    for _ in range(20):
+        responses = simulated_responses(cat_api, 20, rng)
+        # theta_old = mode posterior supaya batas perubahan theta tidak aktif
+        indices, answers, params = cat_api.response_matrix(responses)
+        mode = fine_grid_mode(cat_api, answers, params)
+        grid_theta = cat_api.estimate_theta_map(responses, theta_old=mode)[0]
+        newton_theta = cat_api.estimate_theta_map(responses, theta_old=mode, method='newton')[0]
+        assert newton_theta == pytest.approx(grid_theta, abs=step)
+
+
+def test_fallback_to_grid_when_newton_does_not_converge(client, cat_api, monkeypatch, rng):
+    responses = simulated_responses(cat_api, 12, rng)
+    indices, answers, params = cat_api.response_matrix(responses)
+    monkeypatch.setattr(cat_api, 'MAP_NEWTON_MAX_ITER', 0)
+    assert cat_api.map_newton(answers, params) is None
+
+    grid = cat_api.estimate_theta_map(responses, theta_old=0.3)
+    assert cat_api.estimate_theta_map(responses, theta_old=0.3, method='newton') == grid
+    state = cat_api.PosteriorState()
+    state.add_responses(responses)
+    assert state.map_estimate(0.3, method='newton') == grid
+
+    for session_id in (None, 'NEWTON_FALLBACK'):
+        body = {'responses': responses, 'theta_old': 0.3, 'method': 'newton'}
+        if session_id:
+            body['session_id'] = session_id
+        data = client.post('/api/estimate-theta', json=body).get_json()
+        assert (data['theta'], data['se']) == pytest.approx(grid, abs=1e-12)
+        assert data['map_method'] == 'newton'
+
+
+def test_estimate_theta_rejects_unknown_method(client, cat_api):
+    item = cat_api.ITEM_BANK.item(0)
+    response = client.post('/api/estimate-theta', json={'responses': [dict(item, answer=1)], 'method': 'bisect'})
+    assert response.status_code == 400
@@ -0,0 +1,109 @@
+"""/metrics: format teks Prometheus yang valid dan histogram kumulatif"""
+
+import math
+import re
+
+import pytest
+
+SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+
+def parse_metrics(text):
+    """{nama metric: tipe} dan list sampel (nama, labels, nilai); gagal jika ada baris yang tidak valid"""
+    types, samples = {}, []
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            continue
+        if line.startswith('# TYPE '):
+            name, metric_type = line[len('# TYPE '):].split(' ')
+            assert metric_type in ('counter', 'gauge', 'histogram')
+            assert name not in types, f'duplicate TYPE for {name}'
+            types[name] = metric_type
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f'invalid sample line: {line!r}'
+        name, label_text, value = match.groups()
+        labels = dict(LABEL.findall(label_text)) if label_text else {}
+        if label_text:
+            assert ''.join(f'{k}="{v}",' for k, v in LABEL.findall(label_text))[:-1] == label_text
+        base = re.sub(r'_(bucket|sum|count)$', '', name) if name not in types else name
+        assert base in types, f'sample {name} without TYPE'
+        samples.append((name, labels, float(value)))
+    return types, samples
+
+
+def histogram_series(samples, name):
+    """labels (tanpa le) -> ([(le, hitungan kumulatif)], sum, count)"""
+    series = {}
+    for sample_name, labels, value in samples:
+        if not sample_name.startswith(name + '_'):
+            continue
+        key = tuple(sorted((k, v) for k, v in labels.items() if k != 'le'))
+        entry = series.setdefault(key, [[], None, None])
+        if sample_name == name + '_bucket':
+            entry[0].append((float(labels['le']), value))
+        elif sample_name == name + '_sum':
+            entry[1] = value
+        elif sample_name == name + '_count':
+            entry[2] = value
+    return series
+
+
+def test_metrics_text_format_and_cumulative_buckets(client):
+    for _ in range(3):
+        client.get('/health')
+    client.post('/api/select-item', json={'theta': 0.0, 'used_item_ids': [], 'responses': []})
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    types, samples = parse_metrics(response.get_data(as_text=True))
+
+    assert types['cat_http_request_duration_seconds'] == 'histogram'
+    assert types['cat_kernel_duration_seconds'] == 'histogram'
+    assert types['cat_http_requests_total'] == 'counter'
+    for name, metric_type in types.items():
+        if metric_type != 'histogram':
+            continue
+        series = histogram_series(samples, name)
+        assert series, f'{name} without series'
+        for labels, (buckets, total, count) in series.items():
+            bounds = [le for le, _ in buckets]
+            counts = [value for _, value in buckets]
+            assert bounds == sorted(bounds) and math.isinf(bounds[-1])
+            assert counts == sorted(counts), f'{name}{labels} buckets not cumulative'
+            assert counts[-1] == count
+            assert total >= 0
+
+
+def test_request_counter_and_route_labels(client):
+    def health_count():
+        _, samples = parse_metrics(client.get('/metrics').get_data(as_text=True))
+        return sum(value for name, labels, value in samples if name == 'cat_http_requests_total'
+                   and labels == {'route': '/health', 'method': 'GET', 'status': '200'})
+
+    before = health_count()
+    client.get('/health')
+    client.get('/health')
+    assert health_count() == before + 2
+
+    # Label route memakai rule, bukan path dengan session_id
+    client.get('/api/session/UNKNOWN_METRICS_SESSION/next-item')
+    _, samples = parse_metrics(client.get('/metrics').get_data(as_text=True))
+    routes = {labels.get('route') for name, labels, _ in samples if name == 'cat_http_requests_total'}
+    assert '/api/session/<session_id>/next-item' in routes
+    assert not any('UNKNOWN_METRICS_SESSION' in route for route in routes)
+
+
+def test_histogram_bucket_bounds_are_inclusive(cat_api):
+    histogram = cat_api.MetricHistogram('test_seconds', 'Test histogram', ('kind',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 1.0, 5.0):
+        histogram.observe(value, 'a"b\\c')
+    lines = []
+    histogram.render(lines)
+    _, samples = parse_metrics('\n'.join(lines))
+    buckets = {labels['le']: value for name, labels, value in samples if name == 'test_seconds_bucket'}
+    assert buckets == {'0.1': 2, '1.0': 4, '+Inf': 5}
+    labels = {labels['kind'] for name, labels, _ in samples}
+    assert labels == {'a\\"b\\\\c'}
+    assert [value for name, _, value in samples if name == 'test_seconds_sum'] == [pytest.approx(6.65)]
@@ -0,0 +1,109 @@
+"""Pohon awal tes: lookup harus identik dengan komputasi langsung, dan tidak dibangun tanpa diminta"""
+
+import numpy as np
+import pytest
+
+from conftest import synthetic_bank
+
+
+def laravel_item(item):
+    """Item seperti yang dikirim Laravel: a/b/g decimal(8,6), tanpa u (convertResponseToApiFormat)"""
+    return {'id': item['id'], 'a': round(item['a'], 6), 'b': round(item['b'], 6), 'g': round(item['g'], 6)}
+
+
+def step_chain(client, answers, laravel=False):
+    """Rangkaian /api/step untuk jawaban tetap mulai dari item pertama pada theta 0
+
+    laravel=True: parameter item dan theta_old dibulatkan 6 desimal seperti payload Laravel
+    """
+    item = client.post('/api/select-item', json={'theta': 0.0, 'used_item_ids': [], 'responses': []}).get_json()['item']
+    responses, used, theta, results = [], [item['id']], 0.0, []
+    for answer in answers:
+        responses.append(dict(laravel_item(item) if laravel else item, answer=answer))
+        result = client.post('/api/step', json={'responses': responses, 'theta_old': theta,
+                                                'used_item_ids': used}).get_json()
+        results.append(result)
+        if result['should_stop']:
+            break
+        theta, item = result['theta'], result['item']
+        if laravel:
+            theta = round(theta, 6)
+        used.append(item['id'])
+    return results
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_tree_steps_match_direct_computation(client, cat_api, monkeypatch, seed):
+    answers = np.random.default_rng(seed).integers(0, 2, 12).tolist()
+    depth = cat_api.OPENING_TREE_DEPTH
+
+    lookups = []
+    step_result = cat_api.OpeningTree.step_result
+    monkeypatch.setattr(cat_api.OpeningTree, 'step_result',
+                        lambda self, *args: lookups.append(args) or step_result(self, *args))
+    from_tree = step_chain(client, answers)
+    # Langkah dengan jawaban ke-1 .. depth-1 dilayani dari pohon
+    assert len(lookups) == min(len(from_tree), depth - 1)
+
+    monkeypatch.setattr(cat_api, 'OPENING_TREE_DEPTH', 0)
+    direct = step_chain(client, answers)
+    assert len(lookups) == min(len(from_tree), depth - 1)
+    assert len(from_tree) == len(direct)
+    for tree_result, direct_result in zip(from_tree, direct):
+        assert tree_result.keys() == direct_result.keys()
+        for key, value in direct_result.items():
+            if isinstance(value, float) or key == 'final':
+                assert tree_result[key] == pytest.approx(value, abs=1e-12)
+            else:
+                assert tree_result[key] == value
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_tree_matches_laravel_precision_payloads(client, cat_api, monkeypatch, seed):
+    answers = np.random.default_rng(seed).integers(0, 2, 12).tolist()
+    depth = cat_api.OPENING_TREE_DEPTH
+
+    lookups = []
+    step_result = cat_api.OpeningTree.step_result
+    monkeypatch.setattr(cat_api.OpeningTree, 'step_result',
+                        lambda self, *args: lookups.append(args) or step_result(self, *args))
+    from_tree = step_chain(client, answers, laravel=True)
+    assert len(lookups) == min(len(from_tree), depth - 1)
+
+    # Hasil pohon hanya boleh berbeda sebatas pembulatan input dari komputasi langsung
+    monkeypatch.setattr(cat_api, 'OPENING_TREE_DEPTH', 0)
+    direct = step_chain(client, answers, laravel=True)
+    assert len(from_tree) == len(direct)
+    for tree_result, direct_result in zip(from_tree, direct):
+        assert tree_result.keys() == direct_result.keys()
+        for key, value in direct_result.items():
+            if key == 'item':
+                assert tree_result[key]['id'] == value['id']
+            elif isinstance(value, float) or key == 'final':
+                assert tree_result[key] == pytest.approx(value, abs=1e-5)
+            else:
+                assert tree_result[key] == value
+
+
+def test_tree_rejects_diverging_theta_and_parameters(client, cat_api):
+    tree = cat_api.ITEM_BANK.opening_tree()
+    root, payload = tree.lookup(())
+    item = dict(laravel_item(payload['item']), answer=1)
+    assert tree.lookup_step([item], 5e-7, [item['id']]) is tree.lookup((1,))
+    assert tree.lookup_step([item], 1e-4, [item['id']]) is None
+    assert tree.lookup_step([dict(item, b=item['b'] + 1e-4)], 0.0, [item['id']]) is None
+    assert tree.lookup_step([dict(item, u=0.9)], 0.0, [item['id']]) is None
+
+
+def test_tree_not_built_until_requested(cat_api, rng):
+    bank = synthetic_bank(cat_api, 300, rng)
+    assert bank.opening_tree(build=False) is None
+    tree = bank.opening_tree()
+    assert len(tree) > 0
+    assert bank.opening_tree(build=False) is tree
+
+
+def test_health_does_not_build_tree(client, cat_api, monkeypatch):
+    monkeypatch.setattr(cat_api.ItemBank, 'opening_tree',
+                        lambda self, criterion='MI', build=True: pytest.fail('tree built') if build else None)
+    assert client.get('/health').get_json()['opening_tree'] is None
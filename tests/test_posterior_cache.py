@@ -0,0 +1,77 @@
+"""PosteriorCache (sync, extend, rebuild) harus sama dengan posterior yang dihitung dari awal"""
+
+import numpy as np
+import pytest
+
+from conftest import simulated_responses
+
+
+def fresh_posterior(cat_api, responses):
+    indices, answers, params = cat_api.response_matrix(responses)
+    return cat_api.posterior_grid(indices, answers, params)
+
+
+def test_sync_extends_incrementally(cat_api, rng):
+    cache = cat_api.PosteriorCache()
+    responses = simulated_responses(cat_api, 20, rng)
+    for n in range(1, len(responses) + 1):
+        state = cache.sync('S1', responses[:n])
+        assert len(state) == n
+        np.testing.assert_allclose(state.posterior, fresh_posterior(cat_api, responses[:n]), rtol=1e-10, atol=1e-300)
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == len(responses) - 1
+    assert cache.stats()['rebuilds'] == 0
+
+
+def test_sync_rebuilds_on_mismatched_history(cat_api, rng):
+    cache = cat_api.PosteriorCache()
+    responses = simulated_responses(cat_api, 10, rng)
+    cache.sync('S1', responses)
+
+    # Jawaban lama diubah: state tidak boleh dipakai ulang
+    changed = [dict(resp) for resp in responses]
+    changed[3]['answer'] = 1 - changed[3]['answer']
+    state = cache.sync('S1', changed)
+    np.testing.assert_allclose(state.posterior, fresh_posterior(cat_api, changed), rtol=1e-10, atol=1e-300)
+
+    # Riwayat lebih pendek dari state juga dibangun ulang
+    state = cache.sync('S1', changed[:5])
+    np.testing.assert_allclose(state.posterior, fresh_posterior(cat_api, changed[:5]), rtol=1e-10, atol=1e-300)
+    assert cache.stats()['rebuilds'] == 2
+
+
+def test_state_estimates_match_stateless_functions(cat_api, rng):
+    cache = cat_api.PosteriorCache()
+    responses = simulated_responses(cat_api, 12, rng)
+    state = cache.sync('S1', responses)
+    assert state.map_estimate(theta_old=0.0) == pytest.approx(cat_api.estimate_theta_map(responses, theta_old=0.0))
+    assert state.eap_estimate() == pytest.approx(cat_api.estimate_theta_eap(responses), abs=1e-12)
+    item = cat_api.ITEM_BANK.item(0)
+    efi = cat_api.expected_fisher_information(item['a'], item['b'], item['g'], item['u'], responses)
+    assert state.expected_fisher_information(item['a'], item['b'], item['g'], item['u']) == pytest.approx(efi)
+
+    # Newton memakai prior pemanggil, sama dengan jalur stateless
+    for prior_mean, prior_sd in ((0.0, 2.0), (1.0, 1.0)):
+        assert state.map_estimate(0.0, prior_mean, prior_sd, 'newton') == pytest.approx(
+            cat_api.estimate_theta_map(responses, prior_mean, prior_sd, 0.0, method='newton'))
+
+
+def test_items_outside_bank_use_their_parameters(cat_api, rng):
+    cache = cat_api.PosteriorCache()
+    responses = simulated_responses(cat_api, 5, rng)
+    responses.append({'id': 'X1', 'a': 1.3, 'b': 0.4, 'g': 0.2, 'u': 1.0, 'answer': 1})
+    state = cache.sync('S1', responses)
+    np.testing.assert_allclose(state.posterior, fresh_posterior(cat_api, responses), rtol=1e-10, atol=1e-300)
+
+
+def test_lru_eviction(cat_api, rng):
+    cache = cat_api.PosteriorCache(max_sessions=2)
+    responses = simulated_responses(cat_api, 3, rng)
+    cache.sync('S1', responses)
+    cache.sync('S2', responses)
+    cache.sync('S1', responses)  # S1 terakhir dipakai, S2 yang dikeluarkan
+    cache.sync('S3', responses)
+    assert cache.stats()['sessions'] == 2
+    assert cache.stats()['evictions'] == 1
+    cache.sync('S2', responses)
+    assert cache.stats()['misses'] == 4
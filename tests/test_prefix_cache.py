@@ -0,0 +1,113 @@
+"""Prefix cache posterior: dilanjutkan dari prefix harus identik dengan posterior baru, eviction dan key bank"""
+
+import numpy as np
+import pytest
+
+from conftest import simulated_responses, synthetic_bank
+
+
+def matrix(cat_api, responses, item_bank=None):
+    return cat_api.response_matrix(responses, item_bank)
+
+
+def fresh_posterior(cat_api, responses, item_bank=None):
+    indices, answers, params = matrix(cat_api, responses, item_bank)
+    return cat_api.REFERENCE_QUADRATURE.posterior(indices, answers, params, item_bank)
+
+
+def test_partial_hit_matches_fresh_posterior(cat_api, rng):
+    cache = cat_api.PrefixCache()
+    responses = simulated_responses(cat_api, 20, rng)
+    for n in (5, 12, 20):
+        entry = cache.entry(*matrix(cat_api, responses[:n]))
+        np.testing.assert_allclose(entry.posterior, fresh_posterior(cat_api, responses[:n]), rtol=1e-10, atol=1e-300)
+    stats = cache.stats()
+    assert (stats['misses'], stats['partial_hits'], stats['hits']) == (1, 2, 0)
+    assert stats['rows_saved'] == 5 + 12
+
+    # Seluruh pola sudah ada: entry yang sama dikembalikan
+    assert cache.entry(*matrix(cat_api, responses[:12])) is cache.entry(*matrix(cat_api, responses[:12]))
+    assert cache.stats()['hits'] == 2
+
+    # Cabang jawaban berbeda setelah prefix bersama dilanjutkan dari prefix, bukan dari entry cabang lain
+    branch = responses[:12] + [dict(resp, answer=1 - resp['answer']) for resp in responses[12:]]
+    np.testing.assert_allclose(cache.entry(*matrix(cat_api, branch)).posterior, fresh_posterior(cat_api, branch),
+                               rtol=1e-10, atol=1e-300)
+
+
+def test_entry_eap_matches_reference(cat_api, rng):
+    cache = cat_api.PrefixCache()
+    responses = simulated_responses(cat_api, 15, rng)
+    reference = cat_api.REFERENCE_QUADRATURE
+    assert cache.entry(*matrix(cat_api, responses)).eap() == pytest.approx(
+        reference.eap(fresh_posterior(cat_api, responses)), abs=1e-12)
+
+
+def test_entry_cap_eviction(cat_api, rng):
+    cache = cat_api.PrefixCache(max_entries=3)
+    histories = [simulated_responses(cat_api, 4, rng) for _ in range(5)]
+    entries = [cache.entry(*matrix(cat_api, history)) for history in histories]
+    stats = cache.stats()
+    assert stats['entries'] == 3 and stats['evictions'] == 2
+    assert cache.nbytes == sum(entry.nbytes for entry in entries[2:])
+
+    # Entry terlama sudah dibuang (miss lagi), entry terbaru masih ada
+    cache.entry(*matrix(cat_api, histories[-1]))
+    assert cache.stats()['hits'] == 1
+    cache.entry(*matrix(cat_api, histories[0]))
+    assert cache.stats()['misses'] == 6
+
+
+def test_memory_cap_eviction_and_nbytes_accounting(cat_api, rng):
+    entry_bytes = 2 * cat_api.THETA_GRID.nbytes
+    cache = cat_api.PrefixCache(max_mb=2.5 * entry_bytes / 1024 / 1024)
+    for _ in range(6):
+        cache.entry(*matrix(cat_api, simulated_responses(cat_api, 3, rng)))
+        assert cache.nbytes <= cache.max_bytes
+    assert cache.stats()['entries'] == 2
+    assert cache.nbytes == 2 * entry_bytes
+    assert cache.stats()['evictions'] == 4
+    cache.clear()
+    assert cache.nbytes == 0 and cache.stats()['entries'] == 0
+
+
+def test_entries_are_keyed_by_bank_identity(cat_api, rng):
+    first = synthetic_bank(cat_api, 60, rng, source='first')
+    second = synthetic_bank(cat_api, 60, rng, source='second')
+    cache = cat_api.PrefixCache()
+    # Id item dan jawaban sama di dua bank berbeda: key respons sama, parameter berbeda
+    responses = [(k, k % 2) for k in range(8)]
+    for bank in (first, second, first):
+        history = [dict(bank.item(k), answer=answer) for k, answer in responses]
+        entry = cache.entry(*matrix(cat_api, history, bank), item_bank=bank)
+        assert entry.item_bank is bank
+        np.testing.assert_allclose(entry.posterior, fresh_posterior(cat_api, history, bank), rtol=1e-10, atol=1e-300)
+    stats = cache.stats()
+    assert (stats['misses'], stats['hits'], stats['entries']) == (2, 1, 2)
+
+
+@pytest.mark.parametrize('kwargs', [{'prior_mean': 0.5}, {'prior_sd': 1.0}, {'quadrature': 'adaptive'}])
+def test_non_default_prior_and_quadrature_bypass_cache(cat_api, monkeypatch, rng, kwargs):
+    cache = cat_api.PrefixCache()
+    monkeypatch.setattr(cat_api, 'PREFIX_CACHE', cache)
+    responses = simulated_responses(cat_api, 10, rng)
+    item = cat_api.ITEM_BANK.item(0)
+
+    cat_api.estimate_theta_eap(responses, **kwargs)
+    cat_api.expected_fisher_information(item['a'], item['b'], item['g'], item['u'], responses, **kwargs)
+    if 'quadrature' not in kwargs:
+        cat_api.estimate_theta_map(responses, **kwargs)
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['misses'] == 0
+
+    # Prior dan quadrature default memakai cache
+    cat_api.estimate_theta_eap(responses)
+    cat_api.estimate_theta_map(responses)
+    assert cache.stats()['entries'] == 1 and cache.stats()['hits'] == 1
+
+
+def test_prior_changes_stateless_estimates(cat_api, rng):
+    # Bypass tidak boleh mengembalikan hasil prior default dari cache
+    responses = simulated_responses(cat_api, 3, rng)
+    default = cat_api.estimate_theta_eap(responses)
+    assert cat_api.estimate_theta_eap(responses, prior_mean=1.0)[0] > default[0]
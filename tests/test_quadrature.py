@@ -0,0 +1,76 @@
+"""Konfigurasi quadrature: hanya metode yang sama dengan grid referensi yang boleh lewat CAT_QUADRATURE"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import simulated_responses
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_with_quadrature(method):
+    env = dict(os.environ, CAT_QUADRATURE=method)
+    return subprocess.run([sys.executable, '-c', 'from cat_loader import load_cat_api; load_cat_api()'],
+                          cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=120)
+
+
+@pytest.mark.parametrize('method', ['gauss-hermite', 'simpson'])
+def test_unsupported_quadrature_rejected_at_startup(method):
+    result = import_with_quadrature(method)
+    assert result.returncode != 0
+    assert 'CAT_QUADRATURE' in result.stderr
+
+
+def test_adaptive_quadrature_accepted_at_startup():
+    assert import_with_quadrature('adaptive').returncode == 0
+
+
+def test_gauss_hermite_nodes_follow_posterior(cat_api, rng):
+    responses = simulated_responses(cat_api, 30, rng, theta=1.5)
+    indices, answers, params = cat_api.response_matrix(responses)
+    quad = cat_api.quadrature_for(answers, params, 'gauss-hermite', 41)
+    reference = cat_api.REFERENCE_QUADRATURE
+    theta_ref, se_ref = reference.eap(reference.posterior(indices, answers, params))
+    # Node berpusat di mode posterior dengan skala ~SE, bukan di prior N(0, 2)
+    assert abs(np.median(quad.nodes) - theta_ref) < se_ref
+    assert np.ptp(quad.nodes) < 8 * 2.0
+    theta, se = quad.eap(quad.posterior(indices, answers, params))
+    assert theta == pytest.approx(theta_ref, abs=1e-2)
+    assert se == pytest.approx(se_ref, abs=1e-2)
+
+
+@pytest.mark.parametrize('method', ['uniform', 'adaptive'])
+def test_configured_quadrature_used_on_every_scoring_path(client, cat_api, monkeypatch, rng, method):
+    monkeypatch.setattr(cat_api, 'QUADRATURE', method)
+    responses = simulated_responses(cat_api, 30, rng)
+    used = [resp['id'] for resp in responses]
+    theta, se = cat_api.estimate_theta_eap(responses, quadrature=method)
+    reference = cat_api.REFERENCE_QUADRATURE
+    indices, answers, params = cat_api.response_matrix(responses)
+    if method != 'uniform':
+        assert theta != reference.eap(reference.posterior(indices, answers, params))[0]
+
+    scores = [client.post('/api/final-score', json=body).get_json() for body in (
+        {'responses': responses}, {'responses': responses, 'session_id': f'QUAD_{method}'})]
+    step = client.post('/api/step', json={'responses': responses, 'theta_old': 0.0, 'used_item_ids': used,
+                                          'session_id': f'QUAD_STEP_{method}'}).get_json()
+    assert step['should_stop']
+    batch = client.post('/api/final-score/batch', json={'examinees': [responses]}).get_json()
+    assert batch['quadrature'] == method
+
+    session = cat_api.CATSession('QUAD', speculate=False)
+    for resp in responses:
+        session.administer(cat_api.ITEM_BANK.item(cat_api.ITEM_BANK.index_of(resp['id'])))
+        session.record_response(resp['answer'])
+    result = session.finish('Maximum items reached')
+
+    for theta_path, se_path in [(score['theta'], score['se_eap']) for score in scores] + [
+            (step['final']['theta'], step['final']['se_eap']), (batch['results'][0]['theta'],
+                                                                 batch['results'][0]['se_eap']),
+            (result['theta'], result['se_eap'])]:
+        assert theta_path == pytest.approx(theta, abs=1e-12)
+        assert se_path == pytest.approx(se, abs=1e-12)
@@ -0,0 +1,60 @@
+"""Mode pemilihan 'ranked': re-rank top-k harus sama dengan MI exact, dan kembali ke exact jika ranking habis"""
+
+import numpy as np
+import pytest
+
+from conftest import exhaustive_argmax, synthetic_bank
+
+
+def random_mask(rng, n, used_max):
+    mask = np.ones(n, dtype=bool)
+    mask[rng.choice(n, size=int(rng.integers(0, used_max)), replace=False)] = False
+    return mask
+
+
+@pytest.mark.parametrize('top_k', [0, 1, 5])
+def test_lookup_at_bin_centres_matches_exact(cat_api, rng, top_k):
+    bank = synthetic_bank(cat_api, 400, rng)
+    table = cat_api.ItemRankingTable(bank.a, bank.b, bank.g, bank.u)
+    for theta in table.bins[rng.choice(len(table), 40, replace=False)]:
+        mask = random_mask(rng, len(bank), 200)
+        expected = exhaustive_argmax(cat_api, theta, mask, bank.a, bank.b, bank.g, bank.u)
+        best_idx, best_info = table.lookup(theta, mask, top_k=top_k)
+        assert best_idx == expected[0]
+        assert best_info == pytest.approx(expected[1], rel=1e-12)
+
+
+def test_full_rerank_matches_exact_between_bins(cat_api, rng):
+    bank = synthetic_bank(cat_api, 300, rng)
+    table = cat_api.ItemRankingTable(bank.a, bank.b, bank.g, bank.u)
+    for theta in rng.uniform(-4, 4, 40):
+        mask = random_mask(rng, len(bank), 150)
+        expected = exhaustive_argmax(cat_api, theta, mask, bank.a, bank.b, bank.g, bank.u)
+        assert table.lookup(theta, mask, top_k=len(bank))[0] == expected[0]
+
+
+def test_default_top_k_matches_exact_mi(cat_api, rng):
+    bank = cat_api.ITEM_BANK
+    for theta in rng.uniform(-2, 2, 50):
+        used = [bank.ids[k] for k in rng.choice(len(bank), 20, replace=False)]
+        ranked = cat_api.select_next_item_mi(theta, used, bank, selection_mode='ranked')
+        exact = cat_api.select_next_item_mi(theta, used, bank, selection_mode='exact')
+        assert ranked['id'] == exact['id']
+
+
+def test_exhausted_ranking_falls_back_to_exact(cat_api, monkeypatch, rng):
+    monkeypatch.setattr(cat_api, 'RANKING_MEMORY_BUDGET_MB', 5 * 1201 * 2 / 1024 / 1024)
+    bank = synthetic_bank(cat_api, 200, rng)
+    table = bank.ranking_table()
+    assert table.depth == 5
+
+    theta = 0.0
+    ranked_items = table.ranked[table.bin_of(theta)]
+    mask = np.ones(len(bank), dtype=bool)
+    mask[ranked_items] = False
+    assert table.lookup(theta, mask) == (-1, -np.inf)
+
+    used = [bank.ids[k] for k in ranked_items]
+    expected = exhaustive_argmax(cat_api, theta, mask, bank.a, bank.b, bank.g, bank.u)[0]
+    assert cat_api.forced_item(theta, mask, bank) is None
+    assert cat_api.select_next_item_mi(theta, used, bank, selection_mode='ranked')['id'] == bank.ids[expected]
@@ -0,0 +1,55 @@
+"""Index branch-and-bound MI harus memilih item yang sama dengan argmax penuh yang di-mask"""
+
+import numpy as np
+import pytest
+
+from conftest import exhaustive_argmax, synthetic_bank
+
+
+@pytest.mark.parametrize('n_items, bucket_size', [(160, 8), (1000, 32), (5000, 256), (20000, 256)])
+def test_index_matches_exhaustive_argmax(cat_api, rng, n_items, bucket_size):
+    bank = synthetic_bank(cat_api, n_items, rng)
+    index = cat_api.ItemSelectionIndex(bank.a, bank.b, bank.g, bank.u, bucket_size=bucket_size)
+    for theta in np.concatenate([rng.uniform(-4, 4, 40), [-6.0, 0.0, 6.0]]):
+        mask = np.ones(n_items, dtype=bool)
+        mask[rng.choice(n_items, size=int(rng.integers(0, n_items // 2)), replace=False)] = False
+        expected = exhaustive_argmax(cat_api, theta, mask, bank.a, bank.b, bank.g, bank.u)
+        actual = index.argmax_information(theta, mask)
+        assert actual[0] == expected[0]
+        assert actual[1] == pytest.approx(expected[1], rel=1e-12)
+
+
+def test_index_breaks_ties_to_lowest_bank_position(cat_api, rng):
+    # Item duplikat di bucket berbeda: pilihan harus posisi bank terkecil seperti np.argmax
+    base = synthetic_bank(cat_api, 50, rng)
+    a, b, g = (np.tile(param, 4) for param in (base.a, base.b, base.g))
+    u = np.ones(len(a))
+    index = cat_api.ItemSelectionIndex(a, b, g, u, bucket_size=4)
+    for theta in rng.uniform(-3, 3, 30):
+        mask = rng.random(len(a)) < 0.7
+        mask[int(rng.integers(len(a)))] = True
+        assert index.argmax_information(theta, mask)[0] == exhaustive_argmax(cat_api, theta, mask, a, b, g, u)[0]
+
+
+def test_index_handles_fully_used_buckets_and_upper_asymptote(cat_api, rng):
+    n = 2000
+    bank = synthetic_bank(cat_api, n, rng)
+    u = rng.uniform(0.85, 1.0, n)
+    index = cat_api.ItemSelectionIndex(bank.a, bank.b, bank.g, u, bucket_size=64)
+    # Semua item di bucket b tertinggi dan terendah sudah terpakai
+    mask = np.ones(n, dtype=bool)
+    mask[index.order[:256]] = False
+    mask[index.order[-256:]] = False
+    for theta in (-5.0, -2.5, 0.0, 2.5, 5.0):
+        expected = exhaustive_argmax(cat_api, theta, mask, bank.a, bank.b, bank.g, u)
+        assert index.argmax_information(theta, mask)[0] == expected[0]
+
+
+def test_select_next_item_mi_uses_index_on_large_banks(cat_api, rng):
+    bank = synthetic_bank(cat_api, cat_api.SELECTION_INDEX_MIN_ITEMS + 500, rng)
+    used = [bank.ids[idx] for idx in rng.choice(len(bank), size=30, replace=False)]
+    mask = bank.available_mask(used)
+    theta = 0.7  # Jauh dari b_max/b_min sehingga forcing tidak berlaku
+    item = cat_api.select_next_item_mi(theta, used, bank)
+    expected_idx, _ = exhaustive_argmax(cat_api, theta, mask, bank.a, bank.b, bank.g, bank.u)
+    assert item['id'] == bank.ids[expected_idx]
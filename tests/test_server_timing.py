@@ -0,0 +1,89 @@
+"""Server-Timing: header fase per request, dan blok 'timings' di body hanya jika diminta"""
+
+import re
+
+import pytest
+
+from conftest import simulated_responses
+
+ENTRY = re.compile(r'^([a-z_]+);dur=(\d+\.\d{3})(?:;desc="(\d+) calls")?$')
+
+
+def parse_header(header):
+    """Server-Timing -> {fase: (ms, calls)}; gagal jika ada entry yang tidak valid"""
+    phases = {}
+    for entry in header.split(', '):
+        match = ENTRY.match(entry)
+        assert match, f'invalid Server-Timing entry: {entry!r}'
+        name, duration, calls = match.groups()
+        assert name not in phases
+        phases[name] = (float(duration), int(calls or 1))
+    return phases
+
+
+def step_body(cat_api, rng):
+    responses = simulated_responses(cat_api, 12, rng)
+    return {'responses': responses, 'theta_old': 0.0, 'used_item_ids': [resp['id'] for resp in responses]}
+
+
+def test_step_reports_phases_in_header(client, cat_api, rng):
+    response = client.post('/api/step', json=step_body(cat_api, rng))
+    assert response.status_code == 200
+    phases = parse_header(response.headers['Server-Timing'])
+    assert list(phases)[-1] == 'total'
+    assert {'json', 'parse', 'posterior', 'map', 'select_mi'} <= set(phases)
+    assert all(duration <= phases['total'][0] for duration, _ in phases.values())
+    assert 'timings' not in response.get_json()
+    assert cat_api.REQUEST_TIMINGS.get() is None
+
+
+@pytest.mark.parametrize('opt_in', [{'query_string': {'timings': '1'}}, {'headers': {'X-CAT-Timings': '1'}}])
+def test_timings_block_only_when_requested(client, cat_api, rng, opt_in):
+    body = step_body(cat_api, rng)
+    plain = client.post('/api/step', json=body)
+    detailed = client.post('/api/step', json=body, **opt_in)
+    data = detailed.get_json()
+    timings = data.pop('timings')
+    assert data == plain.get_json()
+
+    header = parse_header(detailed.headers['Server-Timing'])
+    assert set(timings['phases']) == set(header) - {'total'}
+    for name, phase in timings['phases'].items():
+        assert phase['calls'] == header[name][1]
+        assert phase['ms'] == pytest.approx(header[name][0], abs=1e-3)
+    assert timings['total_ms'] >= max(phase['ms'] for phase in timings['phases'].values())
+
+
+def test_repeated_phases_counted_and_nested_phases_not_double_counted(cat_api):
+    timings = cat_api.RequestTimings()
+    token = cat_api.REQUEST_TIMINGS.set(timings)
+    try:
+        for _ in range(2):
+            with cat_api.request_phase('posterior'):
+                with cat_api.request_phase('posterior'):
+                    pass
+        cat_api.timed_kernel('eap')(lambda: None)()
+    finally:
+        cat_api.REQUEST_TIMINGS.reset(token)
+    assert timings.phases['posterior'][1] == 2
+    assert timings.phases['eap'][1] == 1
+    phases = parse_header(timings.header())
+    assert phases['posterior'][1] == 2
+    assert 'desc="2 calls"' in timings.header()
+
+
+def test_error_responses_and_non_json_routes_have_header(client):
+    response = client.post('/api/step', json={'responses': [5]}, query_string={'timings': '1'})
+    assert response.status_code == 400
+    assert 'parse' in parse_header(response.headers['Server-Timing'])
+    assert 'timings' in response.get_json()
+
+    metrics = client.get('/metrics', query_string={'timings': '1'})
+    assert 'total' in parse_header(metrics.headers['Server-Timing'])
+    assert not metrics.is_json
+
+
+def test_phases_outside_requests_are_ignored(cat_api):
+    with cat_api.request_phase('posterior'):
+        pass
+    assert cat_api.REQUEST_TIMINGS.get() is None
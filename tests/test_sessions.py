@@ -0,0 +1,90 @@
+"""Sesi server (/api/session) harus menghasilkan jalur tes yang sama dengan rangkaian /api/step Laravel"""
+
+import numpy as np
+import pytest
+
+
+def answer_for(cat_api, item, theta_true, rng):
+    p = cat_api.probability_3pl(theta_true, item['a'], item['b'], item['g'], item['u'])
+    return int(rng.random() < p)
+
+
+def walk(client, cat_api, theta_true, seed, speculate):
+    """Jalankan sesi dan rangkaian /api/step dengan jawaban yang sama; return daftar langkah keduanya"""
+    rng = np.random.default_rng(seed)
+    session = client.post('/api/session', json={'speculate': speculate}).get_json()
+    first = client.post('/api/select-item', json={'theta': 0.0, 'used_item_ids': [], 'responses': []}).get_json()
+    assert session['item'] == first['item']
+
+    session_id, item = session['session_id'], session['item']
+    responses, used, theta = [], [item['id']], 0.0
+    session_steps, chain_steps = [], []
+    while True:
+        answer = answer_for(cat_api, item, theta_true, rng)
+        responses.append(dict(item, answer=answer))
+        step = client.post('/api/step', json={'responses': responses, 'theta_old': theta,
+                                              'used_item_ids': used}).get_json()
+        payload = client.post(f'/api/session/{session_id}/response',
+                              json={'item_id': item['id'], 'answer': answer}).get_json()
+        chain_steps.append(step)
+        session_steps.append(payload)
+        if step['should_stop'] or payload['test_completed']:
+            return session_steps, chain_steps
+        theta, item = step['theta'], step['item']
+        used.append(item['id'])
+
+
+@pytest.mark.parametrize('tree_depth', [0, 8])
+@pytest.mark.parametrize('speculate', [False, True])
+@pytest.mark.parametrize('theta_true, seed', [(-2.0, 1), (-0.5, 2), (0.3, 3), (1.8, 4)])
+def test_session_walk_matches_step_chain(client, cat_api, monkeypatch, tree_depth, speculate, theta_true, seed):
+    monkeypatch.setattr(cat_api, 'OPENING_TREE_DEPTH', tree_depth)
+    session_steps, chain_steps = walk(client, cat_api, theta_true, seed, speculate)
+    assert len(session_steps) == len(chain_steps)
+    for payload, step in zip(session_steps, chain_steps):
+        assert payload['test_completed'] == step['should_stop']
+        if step['should_stop']:
+            assert payload['stop_reason'] == step['stop_reason']
+            assert payload['theta'] == pytest.approx(step['final']['theta'], abs=1e-12)
+            assert payload['se_eap'] == pytest.approx(step['final']['se_eap'], abs=1e-12)
+            assert payload['final_score'] == pytest.approx(step['final']['final_score'], abs=1e-10)
+        else:
+            assert payload['item'] == step['item']
+            assert payload['theta'] == pytest.approx(step['theta'], abs=1e-12)
+            assert payload['se'] == pytest.approx(step['se'], abs=1e-12)
+            assert payload['expected_fisher_information'] == pytest.approx(step['expected_fisher_information'])
+
+
+def test_session_rejects_wrong_item_and_answer(client):
+    session = client.post('/api/session', json={}).get_json()
+    url = f"/api/session/{session['session_id']}/response"
+    assert client.post(url, json={'item_id': session['item']['id'], 'answer': 2}).status_code == 400
+    assert client.post(url, json={'item_id': 'NOT_CURRENT', 'answer': 1}).status_code == 409
+    assert client.post('/api/session/UNKNOWN/response', json={'item_id': 'x', 'answer': 1}).status_code == 404
+
+
+def test_store_expires_sessions_after_ttl(cat_api):
+    store = cat_api.CATSessionStore(ttl=60, max_sessions=10)
+    old = store.create(speculate=False)
+    fresh = store.create(speculate=False)
+    old.last_access -= 61
+    assert store.get(old.session_id) is None
+    assert store.get(fresh.session_id) is fresh
+    assert store.stats()['expired'] == 1
+
+    # Sesi kedaluwarsa di depan urutan akses dibersihkan saat sesi baru dibuat
+    fresh.last_access -= 61
+    store.create(speculate=False)
+    assert store.stats()['active'] == 1
+    assert store.stats()['expired'] == 2
+
+
+def test_store_evicts_least_recently_used(cat_api):
+    store = cat_api.CATSessionStore(ttl=60, max_sessions=2)
+    first = store.create(speculate=False)
+    second = store.create(speculate=False)
+    store.get(first.session_id)  # first sekarang paling baru diakses
+    store.create(speculate=False)
+    assert store.get(second.session_id) is None
+    assert store.get(first.session_id) is first
+    assert store.stats()['evicted'] == 1